@@ -14,6 +14,7 @@ class AuthRepository {
   final AuthSecureStore _secureStore;
 
   TokenPair? _tokens;
+  Future<void>? _refreshing;
 
   bool get isAuthenticated => _tokens != null;
 
@@ -34,12 +35,17 @@ class AuthRepository {
     await login(email: email, password: password);
   }
 
-  Future<void> refreshAccessToken() async {
+  Future<void> refreshAccessToken() {
+    // Concurrent callers share one refresh: presenting the same refresh token
+    // twice looks like token theft to the server and ends every session.
+    return _refreshing ??= _refresh().whenComplete(() => _refreshing = null);
+  }
+
+  Future<void> _refresh() async {
     final current = _tokens;
     if (current == null) return;
 
-    final freshAccessToken = await _api.refreshAccessToken(refreshToken: current.refreshToken);
-    _tokens = TokenPair(accessToken: freshAccessToken, refreshToken: current.refreshToken);
+    _tokens = await _api.refreshAccessToken(refreshToken: current.refreshToken);
     await _secureStore.writeTokens(_tokens!);
   }
 
@@ -42,7 +42,7 @@ class AuthApiService {
     );
   }
 
-  Future<String> refreshAccessToken({required String refreshToken}) async {
+  Future<TokenPair> refreshAccessToken({required String refreshToken}) async {
     final uri = Uri.parse('$_baseUrl/api/v1/auth/refresh');
     final response = await _client.post(
       uri,
@@ -52,8 +52,13 @@ class AuthApiService {
 
     _throwOnFailure(response, fallback: 'Token refresh failed');
 
+    // Refresh tokens rotate: the one sent is spent, so keep the one returned.
     final data = jsonDecode(response.body) as Map<String, dynamic>;
-    return (data['access_token'] ?? '').toString();
+    final rotatedRefreshToken = (data['refresh_token'] ?? '').toString();
+    return TokenPair(
+      accessToken: (data['access_token'] ?? '').toString(),
+      refreshToken: rotatedRefreshToken.isEmpty ? refreshToken : rotatedRefreshToken,
+    );
   }
 
   void _throwOnFailure(http.Response response, {required String fallback}) {
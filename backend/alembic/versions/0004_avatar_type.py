@@ -0,0 +1,29 @@
+"""add avatar type to avatar states
+
+Revision ID: 0004_avatar_type
+Revises: 0003_audit_user_nullable
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004_avatar_type"
+down_revision: Union[str, None] = "0003_audit_user_nullable"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("avatar_states") as batch_op:
+        batch_op.add_column(
+            sa.Column("avatar_type", sa.String(length=32), nullable=False, server_default="neutral"),
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("avatar_states") as batch_op:
+        batch_op.drop_column("avatar_type")
@@ -0,0 +1,45 @@
+"""denormalize last completion state onto habits
+
+Revision ID: 0005_habit_completion_state
+Revises: 0004_avatar_type
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005_habit_completion_state"
+down_revision: Union[str, None] = "0004_avatar_type"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("habits") as batch_op:
+        batch_op.add_column(sa.Column("last_completed_at", sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column("ever_completed", sa.Boolean(), nullable=False, server_default=sa.false()))
+
+    op.execute(
+        """
+        UPDATE habits
+        SET last_completed_at = (
+                SELECT MAX(completions.created_at)
+                FROM completions
+                WHERE completions.habit_id = habits.id AND completions.completed = true
+            ),
+            ever_completed = EXISTS (
+                SELECT 1
+                FROM completions
+                WHERE completions.habit_id = habits.id AND completions.completed = true
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("habits") as batch_op:
+        batch_op.drop_column("ever_completed")
+        batch_op.drop_column("last_completed_at")
@@ -0,0 +1,43 @@
+"""add habit and user streak tables
+
+Revision ID: 0006_streaks
+Revises: 0005_habit_completion_state
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0006_streaks"
+down_revision: Union[str, None] = "0005_habit_completion_state"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "habit_streaks",
+        sa.Column("habit_id", sa.String(length=36), sa.ForeignKey("habits.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("user_id", sa.String(length=36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("current_streak", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("best_streak", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_completed_day", sa.Date(), nullable=True),
+    )
+    op.create_index("ix_habit_streaks_user_id", "habit_streaks", ["user_id"])
+
+    op.create_table(
+        "user_streaks",
+        sa.Column("user_id", sa.String(length=36), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("current_streak", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("best_streak", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_completed_day", sa.Date(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_streaks")
+    op.drop_index("ix_habit_streaks_user_id", table_name="habit_streaks")
+    op.drop_table("habit_streaks")
@@ -0,0 +1,24 @@
+"""index habits by schedule and completion flag for bulk resets
+
+Revision ID: 0007_habit_reset_index
+Revises: 0006_streaks
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0007_habit_reset_index"
+down_revision: Union[str, None] = "0006_streaks"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_habit_schedule_completed", "habits", ["schedule", "completed", "last_completed_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_habit_schedule_completed", table_name="habits")
@@ -0,0 +1,54 @@
+"""add per-day completion rollups
+
+Revision ID: 0008_completion_daily_rollups
+Revises: 0007_habit_reset_index
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0008_completion_daily_rollups"
+down_revision: Union[str, None] = "0007_habit_reset_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Reuse the enum created in 0001_init instead of emitting CREATE TYPE again on PostgreSQL.
+    habit_type = sa.Enum("CHAKRA", "VITALITY", "FOCUS", name="habit_type").with_variant(
+        postgresql.ENUM("CHAKRA", "VITALITY", "FOCUS", name="habit_type", create_type=False),
+        "postgresql",
+    )
+    op.create_table(
+        "completion_daily_rollups",
+        sa.Column("user_id", sa.String(length=36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("habit_type", habit_type, nullable=False),
+        sa.Column("completed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("user_id", "day", "habit_type", name="pk_completion_daily_rollups"),
+    )
+    # Bucket by UTC date like the live increment path; on PostgreSQL a bare DATE() of a
+    # timestamptz would use the session TimeZone.
+    if op.get_bind().dialect.name == "postgresql":
+        day_expr = "DATE(completions.created_at AT TIME ZONE 'UTC')"
+    else:
+        day_expr = "DATE(completions.created_at)"
+    op.execute(
+        f"""
+        INSERT INTO completion_daily_rollups (user_id, day, habit_type, completed_count)
+        SELECT completions.user_id, {day_expr}, habits.type, COUNT(*)
+        FROM completions
+        JOIN habits ON habits.id = completions.habit_id
+        WHERE completions.completed = true
+        GROUP BY completions.user_id, {day_expr}, habits.type
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("completion_daily_rollups")
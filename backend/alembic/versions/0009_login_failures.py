@@ -0,0 +1,32 @@
+"""add login failure throttle table
+
+Revision ID: 0009_login_failures
+Revises: 0008_completion_daily_rollups
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0009_login_failures"
+down_revision: Union[str, None] = "0008_completion_daily_rollups"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "login_failures",
+        sa.Column("key", sa.String(length=400), primary_key=True),
+        sa.Column("score", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_login_failures_updated_at", "login_failures", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_login_failures_updated_at", table_name="login_failures")
+    op.drop_table("login_failures")
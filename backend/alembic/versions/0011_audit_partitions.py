@@ -0,0 +1,114 @@
+"""partition audit_logs by month on PostgreSQL
+
+Revision ID: 0011_audit_partitions
+Revises: 0010_refresh_tokens
+Create Date: 2026-10-18
+
+SQLite keeps a plain `audit_logs` table; monthly rotation into `audit_logs_pYYYYMM`
+tables is done at runtime by AuditPartitionService.
+"""
+
+from datetime import UTC, date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0011_audit_partitions"
+down_revision: Union[str, None] = "0010_refresh_tokens"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = ("ix_audit_logs_user_id", "ix_audit_logs_event_type", "ix_audit_logs_created_at", "ix_audit_user_time")
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_legacy")
+    op.execute("ALTER SEQUENCE IF EXISTS audit_logs_id_seq RENAME TO audit_logs_legacy_id_seq")
+    for index_name in _INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {index_name} RENAME TO {index_name}_legacy")
+    op.execute("ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey")
+
+    # The partition key has to be part of the primary key.
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id SERIAL NOT NULL,
+            user_id VARCHAR(36) REFERENCES users (id) ON DELETE CASCADE,
+            event_type VARCHAR(64) NOT NULL,
+            entity_type VARCHAR(64) NOT NULL,
+            entity_id VARCHAR(64) NOT NULL,
+            details TEXT NOT NULL DEFAULT '',
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+    op.create_index("ix_audit_logs_user_id", "audit_logs", ["user_id"])
+    op.create_index("ix_audit_logs_event_type", "audit_logs", ["event_type"])
+    op.create_index("ix_audit_logs_created_at", "audit_logs", ["created_at"])
+    op.create_index("ix_audit_user_time", "audit_logs", ["user_id", "created_at"])
+
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM audit_logs_legacy")).scalar()
+    now = datetime.now(UTC)
+    month = date((oldest or now).year, (oldest or now).month, 1)
+    last = _add_months(date(now.year, now.month, 1), 2)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE audit_logs_p{month.year:04d}{month.month:02d} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+
+    op.execute(
+        "INSERT INTO audit_logs (id, user_id, event_type, entity_type, entity_id, details, created_at) "
+        "SELECT id, user_id, event_type, entity_type, entity_id, details, created_at FROM audit_logs_legacy"
+    )
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('audit_logs', 'id'), COALESCE(max(id), 0) + 1, false) FROM audit_logs"
+    )
+    op.execute("DROP TABLE audit_logs_legacy")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER SEQUENCE IF EXISTS audit_logs_id_seq RENAME TO audit_logs_partitioned_id_seq")
+    for index_name in _INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {index_name} RENAME TO {index_name}_partitioned")
+    op.create_table(
+        "audit_logs",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("user_id", sa.String(length=36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("event_type", sa.String(length=64), nullable=False),
+        sa.Column("entity_type", sa.String(length=64), nullable=False),
+        sa.Column("entity_id", sa.String(length=64), nullable=False),
+        sa.Column("details", sa.Text(), nullable=False, server_default=""),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.execute(
+        "INSERT INTO audit_logs (id, user_id, event_type, entity_type, entity_id, details, created_at) "
+        "SELECT id, user_id, event_type, entity_type, entity_id, details, created_at FROM audit_logs_partitioned"
+    )
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('audit_logs', 'id'), COALESCE(max(id), 0) + 1, false) FROM audit_logs"
+    )
+    op.execute("DROP TABLE audit_logs_partitioned CASCADE")
+    op.create_index("ix_audit_logs_user_id", "audit_logs", ["user_id"])
+    op.create_index("ix_audit_logs_event_type", "audit_logs", ["event_type"])
+    op.create_index("ix_audit_logs_created_at", "audit_logs", ["created_at"])
+    op.create_index("ix_audit_user_time", "audit_logs", ["user_id", "created_at"])
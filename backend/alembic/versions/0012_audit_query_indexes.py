@@ -0,0 +1,31 @@
+"""composite (created_at, id) indexes for audit log keyset queries
+
+Revision ID: 0012_audit_query_indexes
+Revises: 0011_audit_partitions
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0012_audit_query_indexes"
+down_revision: Union[str, None] = "0011_audit_partitions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Extend with `id` so ties on created_at are resolved inside the index.
+    op.drop_index("ix_audit_user_time", table_name="audit_logs")
+    op.create_index("ix_audit_user_time", "audit_logs", ["user_id", "created_at", "id"])
+    op.create_index("ix_audit_event_time", "audit_logs", ["event_type", "created_at", "id"])
+    op.create_index("ix_audit_entity_time", "audit_logs", ["entity_type", "entity_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_entity_time", table_name="audit_logs")
+    op.drop_index("ix_audit_event_time", table_name="audit_logs")
+    op.drop_index("ix_audit_user_time", table_name="audit_logs")
+    op.create_index("ix_audit_user_time", "audit_logs", ["user_id", "created_at"])
@@ -0,0 +1,41 @@
+"""store audit_logs.details as JSONB on PostgreSQL
+
+Revision ID: 0013_audit_details_jsonb
+Revises: 0012_audit_query_indexes
+Create Date: 2026-10-18
+
+Other databases keep the Text column; the JSONDetails type reads both the old
+plain JSON and the new compressed encoding there.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0013_audit_details_jsonb"
+down_revision: Union[str, None] = "0012_audit_query_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN details DROP DEFAULT")
+    op.execute(
+        "ALTER TABLE audit_logs ALTER COLUMN details TYPE JSONB "
+        "USING CASE WHEN details = '' THEN '{}'::jsonb ELSE details::jsonb END"
+    )
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN details SET DEFAULT '{}'::jsonb")
+    # Containment lookups such as details @> '{"reason": "invalid_password"}' can use this index.
+    op.execute("CREATE INDEX ix_audit_details_gin ON audit_logs USING GIN (details jsonb_path_ops)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX IF EXISTS ix_audit_details_gin")
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN details DROP DEFAULT")
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN details TYPE TEXT USING details::text")
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN details SET DEFAULT ''")
@@ -0,0 +1,29 @@
+"""add users.updated_at for cross-worker principal cache invalidation
+
+Revision ID: 0014_users_updated_at
+Revises: 0013_audit_details_jsonb
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0014_users_updated_at"
+down_revision: Union[str, None] = "0013_audit_details_jsonb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_users_updated_at", "users", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_updated_at", table_name="users")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("updated_at")
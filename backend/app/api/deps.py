@@ -6,6 +6,7 @@ from app.core.security import decode_token
 from app.db.session import get_db
 from app.models.entities import User
 from app.services.auth_service import AuthService
+from app.services.principal_cache import get_principal_cache
 
 bearer_scheme = HTTPBearer(auto_error=True)
 
@@ -31,8 +32,24 @@ def get_current_user(
     if not isinstance(subject, str):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject")
 
+    cache = get_principal_cache()
+    jti = payload.get("jti")
+    if isinstance(jti, str) and cache.enabled:
+        cached = cache.get(db=db, jti=jti, subject=subject)
+        if cached is not None:
+            return cached
+
     user = auth_service.get_by_id(db=db, user_id=subject)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
+    if isinstance(jti, str):
+        exp = payload.get("exp")
+        cache.put(jti=jti, user=user, token_expires_at=float(exp) if isinstance(exp, int | float) else None)
     return user
+
+
+def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
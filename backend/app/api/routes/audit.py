@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_admin
+from app.db.session import get_db
+from app.models.audit import AuditLogPage
+from app.models.entities import User
+from app.services.audit_query_service import AuditQueryFilter, AuditQueryService
+
+router = APIRouter(prefix="/audit", tags=["audit"])
+
+
+@router.get("/logs", response_model=AuditLogPage)
+def list_audit_logs(
+    user_id: str | None = None,
+    event_type: str | None = None,
+    entity_type: str | None = None,
+    entity_id: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    format: Literal["json", "ndjson"] = "json",
+    db: Session = Depends(get_db),
+    _: User = Depends(get_current_admin),
+) -> AuditLogPage | StreamingResponse:
+    service = AuditQueryService()
+    filters = AuditQueryFilter(
+        user_id=user_id,
+        event_type=event_type,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        since=since,
+        until=until,
+    )
+    if format == "ndjson":
+        return StreamingResponse(service.stream_ndjson(filters), media_type="application/x-ndjson")
+
+    items, next_cursor = service.page(db=db, filters=filters, cursor=cursor, limit=limit)
+    return AuditLogPage(items=items, next_cursor=next_cursor)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_auth_service, get_current_user
 from app.db.session import get_db
 from app.models.auth import (
+    LogoutRequest,
     TokenPair,
     TokenRefreshRequest,
     TokenRefreshResponse,
@@ -18,22 +19,30 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=UserPublic, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     payload: UserCreate,
     db: Session = Depends(get_db),
     auth_service: AuthService = Depends(get_auth_service),
 ) -> UserPublic:
-    user = auth_service.register(db=db, payload=payload)
+    user = await auth_service.register(db=db, payload=payload)
     return UserPublic.model_validate(user)
 
 
 @router.post("/login", response_model=TokenPair)
-def login(
+async def login(
     payload: UserLogin,
+    request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     auth_service: AuthService = Depends(get_auth_service),
 ) -> TokenPair:
-    return auth_service.login(db=db, email=payload.email, password=payload.password)
+    return await auth_service.login(
+        db=db,
+        email=payload.email,
+        password=payload.password,
+        background_tasks=background_tasks,
+        client_ip=request.client.host if request.client else "unknown",
+    )
 
 
 @router.post("/refresh", response_model=TokenRefreshResponse)
@@ -42,8 +51,17 @@ def refresh_token(
     db: Session = Depends(get_db),
     auth_service: AuthService = Depends(get_auth_service),
 ) -> TokenRefreshResponse:
-    access_token = auth_service.refresh_access_token(db=db, refresh_token=payload.refresh_token)
-    return TokenRefreshResponse(access_token=access_token)
+    tokens = auth_service.refresh_access_token(db=db, refresh_token=payload.refresh_token)
+    return TokenRefreshResponse(access_token=tokens.access_token, refresh_token=tokens.refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    payload: LogoutRequest,
+    db: Session = Depends(get_db),
+    auth_service: AuthService = Depends(get_auth_service),
+) -> None:
+    auth_service.logout(db=db, refresh_token=payload.refresh_token, all_sessions=payload.all_sessions)
 
 
 @router.get("/me", response_model=UserPublic)
@@ -1,11 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
 from app.db.session import get_db
-from app.models.entities import Completion, Habit, HabitSchedule, HabitType, User
-from app.models.habit import HabitCompletionUpdate, HabitCreate, HabitPublic, HabitUpdate
-from app.services.completion_policy_service import CompletionPolicyService
+from app.models.entities import Habit, HabitSchedule, HabitType, User
+from app.models.habit import (
+    CompletionPage,
+    HabitCompletionBatchRequest,
+    HabitCompletionBatchResponse,
+    HabitCompletionUpdate,
+    HabitCreate,
+    HabitPublic,
+    HabitUpdate,
+)
+from app.services.completion_history_service import CompletionHistoryFilter, CompletionHistoryService
+from app.services.completion_service import CompletionService
 from app.services.progression_service import ProgressionService
 
 router = APIRouter(prefix="/habits", tags=["habits"])
@@ -24,6 +37,33 @@ def list_habits(
     )
 
 
+@router.get("/completions", response_model=CompletionPage)
+def list_completions(
+    habit_id: str | None = None,
+    type: HabitType | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=100, ge=1, le=500),
+    format: Literal["json", "ndjson"] = "json",
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> CompletionPage | StreamingResponse:
+    service = CompletionHistoryService()
+    filters = CompletionHistoryFilter(
+        user_id=current_user.id,
+        habit_id=habit_id,
+        habit_type=type,
+        since=since,
+        until=until,
+    )
+    if format == "ndjson":
+        return StreamingResponse(service.stream_ndjson(filters), media_type="application/x-ndjson")
+
+    items, next_cursor = service.page(db=db, filters=filters, cursor=cursor, limit=limit)
+    return CompletionPage(items=items, next_cursor=next_cursor)
+
+
 @router.post("", response_model=HabitPublic, status_code=status.HTTP_201_CREATED)
 def create_habit(
     payload: HabitCreate,
@@ -44,6 +84,17 @@ def create_habit(
     return habit
 
 
+@router.post("/completions:batch", response_model=HabitCompletionBatchResponse)
+def batch_update_completions(
+    payload: HabitCompletionBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> HabitCompletionBatchResponse:
+    results = CompletionService().apply_batch(db=db, user_id=current_user.id, items=payload.items)
+    db.commit()
+    return HabitCompletionBatchResponse(results=results)
+
+
 @router.patch("/{habit_id}", response_model=HabitPublic)
 def update_habit(
     habit_id: str,
@@ -59,12 +110,17 @@ def update_habit(
         habit.title = payload.title.strip()
     if payload.description is not None:
         habit.description = payload.description.strip()
+    type_changed = payload.type is not None and HabitType(payload.type) != habit.type
     if payload.type is not None:
         habit.type = HabitType(payload.type)
     if payload.schedule is not None:
         habit.schedule = HabitSchedule(payload.schedule)
 
     db.add(habit)
+    if type_changed:
+        # Past completions now count toward a different XP type; reconcile from history.
+        db.flush()
+        ProgressionService().recompute_user_progression(db=db, user_id=current_user.id)
     db.commit()
     db.refresh(habit)
     return habit
@@ -84,17 +140,7 @@ def update_completion(
     if habit.completed == payload.completed:
         return habit
 
-    if payload.completed:
-        policy = CompletionPolicyService()
-        policy.ensure_can_mark_completed(db=db, habit=habit, user_id=current_user.id)
-
-    habit.completed = payload.completed
-    completion = Completion(habit_id=habit.id, user_id=current_user.id, completed=payload.completed)
-    progression_service = ProgressionService()
-
-    db.add(habit)
-    db.add(completion)
-    progression_service.recompute_user_progression(db=db, user_id=current_user.id)
+    CompletionService().toggle(db=db, habit=habit, user_id=current_user.id, completed=payload.completed)
     db.commit()
     db.refresh(habit)
 
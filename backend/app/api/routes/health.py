@@ -1,6 +1,17 @@
 from datetime import UTC, datetime
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_current_admin
+
+from app.core.hash_pool import get_hash_executor
+from app.core.rate_limit import get_policy_rate_limiter
+from app.models.entities import User
+from app.services.audit_writer import get_audit_writer
+from app.services.login_throttle_service import get_login_throttle
+from app.services.principal_cache import get_principal_cache
+from app.services.rate_limit_audit import get_blocked_request_audit
+from app.services.refresh_token_service import get_revocation_index
 
 router = APIRouter(tags=["health"])
 
@@ -11,3 +22,17 @@ def health_check() -> dict[str, str]:
         "status": "ok",
         "time_utc": datetime.now(UTC).isoformat(),
     }
+
+
+@router.get("/health/metrics")
+def health_metrics(_: User = Depends(get_current_admin)) -> dict[str, dict]:
+    """Internal counters; admins only, unlike the public liveness check above."""
+    return {
+        "hash_pool": get_hash_executor().snapshot(),
+        "principal_cache": get_principal_cache().snapshot(),
+        "login_throttle": get_login_throttle().snapshot(),
+        "refresh_tokens": get_revocation_index().snapshot(),
+        "audit_writer": get_audit_writer().snapshot(),
+        "rate_limit": get_policy_rate_limiter().snapshot(),
+        "rate_limit_audit": get_blocked_request_audit().snapshot(),
+    }
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import get_current_user
+from app.models.entities import User
+from app.models.leaderboard import (
+    LeaderboardDimension,
+    LeaderboardEntry,
+    LeaderboardPublic,
+    LeaderboardRankPublic,
+)
+from app.services.leaderboard_service import get_leaderboard
+
+router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
+
+
+@router.get("", response_model=LeaderboardPublic)
+def get_top(
+    dimension: LeaderboardDimension = "total",
+    limit: int = Query(default=10, ge=1, le=100),
+    _: User = Depends(get_current_user),
+) -> LeaderboardPublic:
+    leaderboard = get_leaderboard()
+    return LeaderboardPublic(
+        dimension=dimension,
+        size=leaderboard.size(dimension),
+        entries=[LeaderboardEntry(rank=item.rank, user_id=item.user_id, xp=item.xp) for item in leaderboard.top(dimension, limit)],
+    )
+
+
+@router.get("/me", response_model=LeaderboardRankPublic)
+def get_my_rank(
+    dimension: LeaderboardDimension = "total",
+    current_user: User = Depends(get_current_user),
+) -> LeaderboardRankPublic:
+    leaderboard = get_leaderboard()
+    entry = leaderboard.rank_of(dimension, current_user.id)
+    return LeaderboardRankPublic(
+        dimension=dimension,
+        size=leaderboard.size(dimension),
+        rank=entry.rank if entry else None,
+        xp=entry.xp if entry else 0,
+    )
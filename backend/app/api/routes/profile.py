@@ -1,11 +1,15 @@
+from datetime import UTC, datetime
+
 from fastapi import APIRouter, Depends
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
 from app.db.session import get_db
-from app.models.entities import AvatarState, Habit, Stats, User
+from app.models.entities import AvatarState, Habit, User
 from app.models.profile import ProfilePublic
 from app.services.progression_service import ProgressionService
+from app.services.streak_service import StreakService
 
 router = APIRouter(prefix="/profile", tags=["profile"])
 
@@ -15,15 +19,18 @@ def get_profile_me(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> ProfilePublic:
-    progression = ProgressionService()
-    stats, avatar = progression.recompute_user_progression(db=db, user_id=current_user.id)
-    db.commit()
-
-    stats_row = db.query(Stats).filter(Stats.user_id == current_user.id).first() or stats
-    avatar_row = db.query(AvatarState).filter(AvatarState.user_id == current_user.id).first() or avatar
+    stats_row, avatar_row = ProgressionService().get_user_progression(db=db, user_id=current_user.id)
+    current_streak, best_streak = StreakService().get_user_streak(
+        db=db,
+        user_id=current_user.id,
+        today=datetime.now(UTC).date(),
+    )
 
-    total_habits = db.query(Habit).filter(Habit.user_id == current_user.id).count()
-    completed_habits = db.query(Habit).filter(Habit.user_id == current_user.id, Habit.completed.is_(True)).count()
+    total_habits, completed_habits = (
+        db.query(func.count(Habit.id), func.coalesce(func.sum(case((Habit.completed.is_(True), 1), else_=0)), 0))
+        .filter(Habit.user_id == current_user.id)
+        .one()
+    )
 
     return ProfilePublic(
         user_id=current_user.id,
@@ -36,6 +43,8 @@ def get_profile_me(
         aura_level=avatar_row.aura_level,
         aura_label=avatar_row.aura_label,
         avatar_type=avatar_row.avatar_type,
+        current_streak=current_streak,
+        best_streak=best_streak,
     )
 
 
@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends
+from datetime import UTC, date, datetime, timedelta
+
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
 from app.db.session import get_db
-from app.models.entities import User
-from app.models.progression import ProgressionPublic
+from app.models.entities import HabitType, User
+from app.models.progression import (
+    CompletionHistoryPublic,
+    DailyCompletionPublic,
+    HabitStreakPublic,
+    ProgressionPublic,
+    StreakPublic,
+)
+from app.services.completion_rollup_service import CompletionRollupService
 from app.services.progression_service import ProgressionService
+from app.services.streak_service import StreakService
 
 router = APIRouter(prefix="/progression", tags=["progression"])
 
@@ -15,9 +25,53 @@ def get_my_progression(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> ProgressionPublic:
-    service = ProgressionService()
-    stats, avatar = service.recompute_user_progression(db=db, user_id=current_user.id)
-    db.commit()
-    db.refresh(stats)
-    db.refresh(avatar)
-    return ProgressionPublic(stats=stats, avatar=avatar)
+    stats, avatar = ProgressionService().get_user_progression(db=db, user_id=current_user.id)
+    streaks = StreakService()
+    today = datetime.now(UTC).date()
+    current_streak, best_streak = streaks.get_user_streak(db=db, user_id=current_user.id, today=today)
+    return ProgressionPublic(
+        stats=stats,
+        avatar=avatar,
+        streak=StreakPublic(current_streak=current_streak, best_streak=best_streak),
+        habit_streaks=[
+            HabitStreakPublic(habit_id=habit_id, current_streak=current, best_streak=best)
+            for habit_id, current, best in streaks.list_habit_streaks(db=db, user_id=current_user.id, today=today)
+        ],
+    )
+
+
+@router.get("/weekly", response_model=CompletionHistoryPublic)
+def get_weekly_log(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> CompletionHistoryPublic:
+    return _completion_history(db=db, user_id=current_user.id, days=7)
+
+
+@router.get("/heatmap", response_model=CompletionHistoryPublic)
+def get_heatmap(
+    days: int = Query(default=365, ge=1, le=366),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> CompletionHistoryPublic:
+    return _completion_history(db=db, user_id=current_user.id, days=days)
+
+
+def _completion_history(db: Session, user_id: str, days: int) -> CompletionHistoryPublic:
+    end: date = datetime.now(UTC).date()
+    start = end - timedelta(days=days - 1)
+    rows = CompletionRollupService().daily_counts(db=db, user_id=user_id, start=start, end=end)
+    return CompletionHistoryPublic(
+        start=start,
+        end=end,
+        days=[
+            DailyCompletionPublic(
+                day=day,
+                chakra=counts.get(HabitType.chakra, 0),
+                vitality=counts.get(HabitType.vitality, 0),
+                focus=counts.get(HabitType.focus, 0),
+                total=sum(counts.values()),
+            )
+            for day, counts in rows
+        ],
+    )
@@ -5,7 +5,7 @@ from app.api.deps import get_current_user
 from app.db.session import get_db
 from app.models.entities import Quest, User
 from app.models.quest import QuestCreate, QuestPublic, QuestUpdate
-from app.services.audit_service import AuditService
+from app.services.audit_service import AuditService, field_diff
 
 router = APIRouter(prefix="/quests", tags=["quests"])
 
@@ -31,8 +31,7 @@ def create_quest(
         notes=payload.notes.strip(),
     )
     db.add(quest)
-    db.commit()
-    db.refresh(quest)
+    db.flush()
     AuditService().log_event(
         db,
         user_id=current_user.id,
@@ -65,20 +64,13 @@ def update_quest(
         quest.notes = payload.notes.strip()
 
     db.add(quest)
-    db.commit()
-    db.refresh(quest)
     AuditService().log_event(
         db,
         user_id=current_user.id,
         event_type="quest_updated",
         entity_type="quest",
         entity_id=str(quest.id),
-        details={
-            "title": quest.title,
-            "status": quest.status,
-            "notes": quest.notes,
-            "previous": before,
-        },
+        details={"changes": field_diff(before, {"title": quest.title, "status": quest.status, "notes": quest.notes})},
     )
     db.commit()
     return quest
@@ -22,6 +22,54 @@ class Settings(BaseSettings):
     cors_origins: str = Field(default="http://localhost:3000", alias="CORS_ORIGINS")
     rate_limit_requests: int = Field(default=120, alias="RATE_LIMIT_REQUESTS")
     rate_limit_window_seconds: int = Field(default=60, alias="RATE_LIMIT_WINDOW_SECONDS")
+    rate_limit_policies_path: str = Field(default="", alias="RATE_LIMIT_POLICIES_PATH")
+    rate_limit_backend: str = Field(default="memory", alias="RATE_LIMIT_BACKEND")
+    rate_limit_shared_path: str = Field(default="/dev/shm/secure-vibe-rate-limit", alias="RATE_LIMIT_SHARED_PATH")
+    rate_limit_redis_url: str = Field(default="redis://localhost:6379/0", alias="RATE_LIMIT_REDIS_URL")
+    rate_limit_redis_breaker_seconds: float = Field(default=5.0, alias="RATE_LIMIT_REDIS_BREAKER_SECONDS")
+    rate_limit_audit_interval_seconds: float = Field(default=30.0, alias="RATE_LIMIT_AUDIT_INTERVAL_SECONDS")
+    rate_limit_audit_sample_rate: float = Field(default=0.01, alias="RATE_LIMIT_AUDIT_SAMPLE_RATE")
+    rate_limit_audit_max_keys: int = Field(default=10000, alias="RATE_LIMIT_AUDIT_MAX_KEYS")
+    rate_limit_max_keys: int = Field(default=100000, alias="RATE_LIMIT_MAX_KEYS")
+    rate_limit_sweep_seconds: float = Field(default=60.0, alias="RATE_LIMIT_SWEEP_SECONDS")
+
+    hash_pool_backend: str = Field(default="thread", alias="HASH_POOL_BACKEND")
+    hash_pool_workers: int = Field(default=2, alias="HASH_POOL_WORKERS")
+    hash_pool_max_queue: int = Field(default=16, alias="HASH_POOL_MAX_QUEUE")
+
+    audit_write_mode: str = Field(default="buffered", alias="AUDIT_WRITE_MODE")
+    audit_buffer_capacity: int = Field(default=10000, alias="AUDIT_BUFFER_CAPACITY")
+    audit_flush_batch_size: int = Field(default=500, alias="AUDIT_FLUSH_BATCH_SIZE")
+    audit_flush_interval_seconds: float = Field(default=0.5, alias="AUDIT_FLUSH_INTERVAL_SECONDS")
+    audit_backpressure_timeout_seconds: float = Field(default=0.05, alias="AUDIT_BACKPRESSURE_TIMEOUT_SECONDS")
+
+    audit_retention_months: int = Field(default=12, alias="AUDIT_RETENTION_MONTHS")
+    audit_archive_dir: str = Field(default="./audit_archive", alias="AUDIT_ARCHIVE_DIR")
+    audit_partition_premake_months: int = Field(default=2, alias="AUDIT_PARTITION_PREMAKE_MONTHS")
+    audit_partition_interval_seconds: float = Field(default=3600.0, alias="AUDIT_PARTITION_INTERVAL_SECONDS")
+
+    password_scrypt_n: int = Field(default=2**14, alias="PASSWORD_SCRYPT_N")
+    password_scrypt_r: int = Field(default=8, alias="PASSWORD_SCRYPT_R")
+    password_scrypt_p: int = Field(default=1, alias="PASSWORD_SCRYPT_P")
+
+    refresh_token_sync_seconds: float = Field(default=5.0, alias="REFRESH_TOKEN_SYNC_SECONDS")
+    refresh_token_purge_interval_seconds: float = Field(default=3600.0, alias="REFRESH_TOKEN_PURGE_INTERVAL_SECONDS")
+
+    login_throttle_account_max_failures: int = Field(default=5, alias="LOGIN_THROTTLE_ACCOUNT_MAX_FAILURES")
+    login_throttle_ip_max_failures: int = Field(default=20, alias="LOGIN_THROTTLE_IP_MAX_FAILURES")
+    login_throttle_half_life_seconds: float = Field(default=300.0, alias="LOGIN_THROTTLE_HALF_LIFE_SECONDS")
+    login_throttle_sync_seconds: float = Field(default=5.0, alias="LOGIN_THROTTLE_SYNC_SECONDS")
+    login_throttle_purge_interval_seconds: float = Field(default=900.0, alias="LOGIN_THROTTLE_PURGE_INTERVAL_SECONDS")
+
+    principal_cache_ttl_seconds: float = Field(default=60.0, alias="PRINCIPAL_CACHE_TTL_SECONDS")
+    principal_cache_max_entries: int = Field(default=10000, alias="PRINCIPAL_CACHE_MAX_ENTRIES")
+    principal_cache_sync_seconds: float = Field(default=5.0, alias="PRINCIPAL_CACHE_SYNC_SECONDS")
+
+    progression_curve_path: str = Field(default="", alias="PROGRESSION_CURVE_PATH")
+    progression_curve_reload_seconds: float = Field(default=5.0, alias="PROGRESSION_CURVE_RELOAD_SECONDS")
+
+    habit_reset_interval_seconds: float = Field(default=300.0, alias="HABIT_RESET_INTERVAL_SECONDS")
+    habit_reset_batch_size: int = Field(default=500, alias="HABIT_RESET_BATCH_SIZE")
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=False)
 
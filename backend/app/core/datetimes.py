@@ -0,0 +1,9 @@
+from datetime import UTC, datetime
+
+
+def as_utc(value: datetime) -> datetime:
+    """`value` as an aware UTC datetime; naive values are taken to be UTC already.
+
+    SQLite hands back naive datetimes even for timezone-aware columns.
+    """
+    return value.astimezone(UTC) if value.tzinfo is not None else value.replace(tzinfo=UTC)
@@ -4,6 +4,8 @@ from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
+from app.core.hash_pool import HashPoolSaturatedError
+
 
 def _http_code_name(status_code: int) -> str:
     mapping = {
@@ -15,6 +17,7 @@ def _http_code_name(status_code: int) -> str:
         status.HTTP_422_UNPROCESSABLE_ENTITY: "validation_error",
         status.HTTP_429_TOO_MANY_REQUESTS: "rate_limited",
         status.HTTP_500_INTERNAL_SERVER_ERROR: "internal_error",
+        status.HTTP_503_SERVICE_UNAVAILABLE: "service_unavailable",
     }
     return mapping.get(status_code, f"http_{status_code}")
 
@@ -26,6 +29,7 @@ def register_exception_handlers(app: FastAPI) -> None:
         return JSONResponse(
             status_code=exc.status_code,
             content={"code": _http_code_name(exc.status_code), "message": message},
+            headers=exc.headers,
         )
 
     @app.exception_handler(RequestValidationError)
@@ -35,6 +39,14 @@ def register_exception_handlers(app: FastAPI) -> None:
             content={"code": "validation_error", "message": "Invalid request payload."},
         )
 
+    @app.exception_handler(HashPoolSaturatedError)
+    async def handle_hash_pool_saturated(_: Request, __: HashPoolSaturatedError) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"code": "service_unavailable", "message": "Server busy. Please retry shortly."},
+            headers={"Retry-After": "1"},
+        )
+
     @app.exception_handler(Exception)
     async def handle_unexpected_exception(_: Request, __: Exception) -> JSONResponse:
         return JSONResponse(
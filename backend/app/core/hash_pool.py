@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from .config import get_settings
+
+T = TypeVar("T")
+
+
+class HashPoolSaturatedError(RuntimeError):
+    """Raised instead of queueing when the hashing pool is at its outstanding-work limit."""
+
+
+def _timed_call(fn: Callable[..., T], *args: Any) -> tuple[float, float, T]:
+    # time.monotonic is system-wide on Linux, so worker processes report comparable timestamps.
+    started = time.monotonic()
+    result = fn(*args)
+    return started, time.monotonic(), result
+
+
+class HashingExecutor:
+    """Dedicated, bounded pool for password hashing so scrypt bursts cannot starve request threads."""
+
+    def __init__(self, backend: str, workers: int, max_queue: int) -> None:
+        if backend not in {"thread", "process"}:
+            raise ValueError("HASH_POOL_BACKEND must be 'thread' or 'process'.")
+        self.backend = backend
+        self.workers = workers
+        self.max_outstanding = workers + max_queue
+        self._executor: Executor = (
+            ProcessPoolExecutor(max_workers=workers)
+            if backend == "process"
+            else ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash")
+        )
+        self._slots = threading.BoundedSemaphore(self.max_outstanding)
+        self._lock = threading.Lock()
+        self._completed = 0
+        self._rejected = 0
+        self._in_flight = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._hash_time_total = 0.0
+        self._hash_time_max = 0.0
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Hash on the pool, blocking the calling thread until the result is ready."""
+        return self._submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., T], *args: Any) -> T:
+        """Hash on the pool without holding a request thread while the work is queued or running."""
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def _submit(self, fn: Callable[..., T], *args: Any) -> Future[T]:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HashPoolSaturatedError("Password hashing pool is saturated.")
+        with self._lock:
+            self._in_flight += 1
+        submitted = time.monotonic()
+        try:
+            work = self._executor.submit(_timed_call, fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Callers wait on `result`, which resolves only after the slot is back, so a
+        # follow-up call never sees it still taken. A cancelled awaiter does not free
+        # the slot early either: it is held until the work itself finishes.
+        result: Future[T] = Future()
+        result.set_running_or_notify_cancel()
+        work.add_done_callback(lambda done: self._finish(done, submitted, result))
+        return result
+
+    def _finish(self, work: Future[tuple[float, float, T]], submitted: float, result: Future[T]) -> None:
+        try:
+            started, finished, value = work.result()
+        except BaseException as exc:
+            self._release()
+            result.set_exception(exc)
+            return
+        self._record(queue_wait=max(0.0, started - submitted), hash_time=finished - started)
+        self._release()
+        result.set_result(value)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def snapshot(self) -> dict[str, float | int | str]:
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                "backend": self.backend,
+                "workers": self.workers,
+                "max_outstanding": self.max_outstanding,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "queue_wait_ms_avg": round(self._queue_wait_total / completed * 1000, 3),
+                "queue_wait_ms_max": round(self._queue_wait_max * 1000, 3),
+                "hash_ms_avg": round(self._hash_time_total / completed * 1000, 3),
+                "hash_ms_max": round(self._hash_time_max * 1000, 3),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _record(self, queue_wait: float, hash_time: float) -> None:
+        with self._lock:
+            self._completed += 1
+            self._queue_wait_total += queue_wait
+            self._queue_wait_max = max(self._queue_wait_max, queue_wait)
+            self._hash_time_total += hash_time
+            self._hash_time_max = max(self._hash_time_max, hash_time)
+
+
+_executor: HashingExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_hash_executor() -> HashingExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                settings = get_settings()
+                _executor = HashingExecutor(
+                    backend=settings.hash_pool_backend,
+                    workers=settings.hash_pool_workers,
+                    max_queue=settings.hash_pool_max_queue,
+                )
+    return _executor
+
+
+def shutdown_hash_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
@@ -1,50 +1,222 @@
+from __future__ import annotations
+
+import math
+import threading
 import time
-from collections import defaultdict, deque
-from typing import Callable
+from functools import lru_cache
 
-from fastapi import HTTPException, Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.db.session import SessionLocal
-from app.services.audit_service import AuditService
+from app.services.rate_limit_audit import get_blocked_request_audit
 
 from .config import get_settings
+from .rate_limit_backends import MemoryBackend, RateLimitBackend, RedisBackend, SharedMemoryBackend
+from .rate_limit_policies import DEFAULT_POLICIES, PolicyMatcher, RateLimitPolicy, load_policies
+from .security import decode_token
+
+
+class SlidingWindowLimiter:
+    """Sliding-window counter with constant memory per client key.
+
+    The request rate is estimated as `previous * (1 - elapsed / window) + current`
+    from the counts of the previous and current fixed windows, which tracks a
+    true sliding log closely without keeping one timestamp per request. Where
+    the counts live (this process, a host-wide mmap table, or Redis) is up to
+    the backend.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        window_seconds: float,
+        max_keys: int = 100_000,
+        sweep_interval_seconds: float = 60.0,
+        backend: RateLimitBackend | None = None,
+    ) -> None:
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.backend = backend or MemoryBackend(max_keys=max_keys, sweep_interval_seconds=sweep_interval_seconds)
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.blocked = 0
+
+    def hit(self, key: str, now: float | None = None) -> int | None:
+        """Count one request for `key`; returns None if allowed, else seconds to wait."""
+        now = time.time() if now is None else now
+        index = int(now // self.window_seconds)
+        elapsed = now / self.window_seconds - index
+        previous, current, allowed = self.backend.hit(key, now, index, elapsed, self.limit)
+        with self._lock:
+            if allowed:
+                self.allowed += 1
+                return None
+            self.blocked += 1
+        return self._retry_after(previous, current, elapsed)
+
+    def snapshot(self) -> dict[str, int | str]:
+        with self._lock:
+            counters = {"allowed": self.allowed, "blocked": self.blocked}
+        return {**self.backend.snapshot(), **counters}
+
+    def _retry_after(self, previous: int, current: int, elapsed: float) -> int:
+        """Whole seconds until the weighted count drops below the limit."""
+        if self.limit <= 0:
+            return math.ceil(self.window_seconds)
+        if current < self.limit:
+            # Still inside this window: wait for enough of `previous` to slide out.
+            fraction = 1.0 - (self.limit - current) / previous - elapsed
+        else:
+            # Only the next window helps, once enough of this one has slid out.
+            fraction = 1.0 - elapsed + 1.0 - self.limit / current
+        return max(1, math.ceil(fraction * self.window_seconds))
+
+
+def build_rate_limit_backend(backend: str, name: str, window_seconds: float) -> RateLimitBackend:
+    """A backend for one policy; policies never share counters, so window sizes cannot mix."""
+    settings = get_settings()
+    if backend == "memory":
+        return MemoryBackend(
+            max_keys=settings.rate_limit_max_keys,
+            sweep_interval_seconds=settings.rate_limit_sweep_seconds,
+        )
+    if backend == "shared":
+        return SharedMemoryBackend(
+            path=f"{settings.rate_limit_shared_path}-{name}",
+            max_keys=settings.rate_limit_max_keys,
+        )
+    if backend == "redis":
+        return RedisBackend(
+            url=settings.rate_limit_redis_url,
+            window_seconds=window_seconds,
+            prefix=f"rl:{name}",
+            breaker_seconds=settings.rate_limit_redis_breaker_seconds,
+        )
+    raise ValueError("RATE_LIMIT_BACKEND must be 'memory', 'shared' or 'redis'.")
+
+
+class PolicyRateLimiter:
+    """Picks the policy for a request and counts it against that policy's budget.
+
+    Requests matching no policy fall back to `default` (the global per-address
+    limit). Exempt policies cost one matcher lookup; per-user policies verify
+    the bearer token only when they are the ones matched.
+    """
+
+    def __init__(
+        self,
+        policies: tuple[RateLimitPolicy, ...],
+        default: RateLimitPolicy,
+        prefix: str = "",
+        backend: str = "memory",
+    ) -> None:
+        self.default = default
+        self.matcher = PolicyMatcher(policies, prefix=prefix)
+        self.limiters = {
+            policy.name: SlidingWindowLimiter(
+                limit=policy.limit,
+                window_seconds=policy.window_seconds,
+                backend=build_rate_limit_backend(backend, policy.name, policy.window_seconds),
+            )
+            for policy in (*policies, default)
+            if policy.limit is not None
+        }
+        self.blocking = any(limiter.backend.blocking for limiter in self.limiters.values())
+
+    def check(
+        self,
+        method: str,
+        path: str,
+        client_host: str,
+        authorization: str | None = None,
+        now: float | None = None,
+    ) -> tuple[RateLimitPolicy, int | None]:
+        """The matched policy and, if the request is over budget, seconds to wait."""
+        policy = self.matcher.match(method, path) or self.default
+        limiter = self.limiters.get(policy.name)
+        if limiter is None:
+            return policy, None
+        principal = None
+        if policy.key == "user":
+            principal = self._user_id(authorization)
+        key = f"user:{principal}" if principal else f"ip:{client_host}"
+        return policy, limiter.hit(key, now=now)
+
+    def snapshot(self) -> dict[str, dict[str, int | str]]:
+        return {name: limiter.snapshot() for name, limiter in self.limiters.items()}
+
+    @staticmethod
+    def _user_id(authorization: str | None) -> str | None:
+        if not authorization or not authorization.lower().startswith("bearer "):
+            return None
+        try:
+            payload = decode_token(authorization[7:].strip())
+        except ValueError:
+            return None
+        subject = payload.get("sub")
+        return subject if payload.get("type") == "access" and isinstance(subject, str) else None
+
+
+@lru_cache
+def get_policy_rate_limiter() -> PolicyRateLimiter:
+    settings = get_settings()
+    policies = DEFAULT_POLICIES
+    if settings.rate_limit_policies_path:
+        policies = load_policies(settings.rate_limit_policies_path)
+    return PolicyRateLimiter(
+        policies=policies,
+        default=RateLimitPolicy(
+            name="default",
+            path="*",
+            limit=settings.rate_limit_requests,
+            window_seconds=settings.rate_limit_window_seconds,
+        ),
+        prefix=settings.api_v1_prefix,
+        backend=settings.rate_limit_backend,
+    )
+
+
+class RateLimitMiddleware:
+    """Plain ASGI: a rejected request never reaches the app, others pass through untouched."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        # Built (and any policy file parsed) once, when the middleware stack is assembled.
+        self._limiter = get_policy_rate_limiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        client_host = client[0] if client else "unknown"
+        method, path = scope["method"], scope["path"]
+        authorization = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value.decode("latin-1")
+                break
+        if self._limiter.blocking:
+            # Network-backed counters wait on a worker thread, never on the event loop.
+            _, retry_after = await run_in_threadpool(
+                self._limiter.check, method, path, client_host, authorization=authorization
+            )
+        else:
+            _, retry_after = self._limiter.check(method, path, client_host, authorization=authorization)
 
+        if retry_after is not None:
+            # Tallied in memory and written as summaries off the request path.
+            get_blocked_request_audit().record(client_host, method, path)
+            # Answered here: this layer sits outside the app's exception handlers.
+            response = JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"code": "rate_limited", "message": "Too many requests"},
+                headers={"Retry-After": str(retry_after)},
+            )
+            await response(scope, receive, send)
+            return
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
-        self._bucket: dict[str, deque[float]] = defaultdict(deque)
-        self._settings = get_settings()
-
-    async def dispatch(self, request: Request, call_next: Callable):
-        client_host = request.client.host if request.client else "unknown"
-        now = time.time()
-        window = self._settings.rate_limit_window_seconds
-        allowed = self._settings.rate_limit_requests
-
-        bucket = self._bucket[client_host]
-        while bucket and now - bucket[0] > window:
-            bucket.popleft()
-
-        if len(bucket) >= allowed:
-            # Best-effort audit capture for abuse visibility.
-            db = SessionLocal()
-            try:
-                AuditService().log_event(
-                    db,
-                    user_id=None,
-                    event_type="rate_limit_blocked",
-                    entity_type="request",
-                    entity_id=client_host,
-                    details={"path": request.url.path, "method": request.method},
-                )
-                db.commit()
-            except Exception:
-                db.rollback()
-            finally:
-                db.close()
-            raise HTTPException(status_code=429, detail="Too many requests")
-
-        bucket.append(now)
-        return await call_next(request)
+        await self.app(scope, receive, send)
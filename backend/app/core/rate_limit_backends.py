@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import math
+import mmap
+import os
+import socket
+import struct
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+
+def _over_limit(previous: int, current: int, elapsed: float, limit: int) -> bool:
+    return previous * (1.0 - elapsed) + current >= limit
+
+
+class RateLimitBackend:
+    """Counter storage for the sliding-window limiter.
+
+    `hit` must roll the key into window `index`, decide against `limit` and
+    count the request only if allowed, atomically with respect to every other
+    caller sharing the backend. It returns `(previous, current, allowed)` where
+    `current` excludes a rejected request.
+    """
+
+    name = "base"
+    # True when `hit` waits on the network and must not run on the event loop.
+    blocking = False
+
+    def hit(self, key: str, now: float, index: int, elapsed: float, limit: int) -> tuple[int, int, bool]:
+        raise NotImplementedError
+
+    def snapshot(self) -> dict[str, int | str]:
+        return {"backend": self.name}
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryBackend(RateLimitBackend):
+    """Per-process counters: `[window_index, previous, current]` per key.
+
+    Keys idle for two full windows carry no information and are swept every
+    `sweep_interval_seconds`; beyond `max_keys` the least recently rolled key is
+    evicted, so memory is bounded no matter how many addresses show up. Keys are
+    kept in the order their windows rolled, so idle ones sit at the front and a
+    sweep stops at the first live key: it costs O(idle), not O(tracked).
+    """
+
+    name = "memory"
+
+    def __init__(self, max_keys: int = 100_000, sweep_interval_seconds: float = 60.0) -> None:
+        self.max_keys = max_keys
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._lock = threading.Lock()
+        # Order doubles as recency: a key moves to the end when its window rolls.
+        self._windows: OrderedDict[str, list[int]] = OrderedDict()
+        self._next_sweep = 0.0
+        self.swept = 0
+        self.evicted = 0
+
+    def hit(self, key: str, now: float, index: int, elapsed: float, limit: int) -> tuple[int, int, bool]:
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(index)
+                self._next_sweep = now + self.sweep_interval_seconds
+            state = self._windows.get(key)
+            if state is None:
+                while len(self._windows) >= self.max_keys:
+                    self._windows.popitem(last=False)
+                    self.evicted += 1
+                state = self._windows[key] = [index, 0, 0]
+            elif state[0] != index:
+                state[1] = state[2] if state[0] == index - 1 else 0
+                state[2] = 0
+                state[0] = index
+                self._windows.move_to_end(key)
+            previous, current = state[1], state[2]
+            if _over_limit(previous, current, elapsed, limit):
+                return previous, current, False
+            state[2] = current + 1
+            return previous, current + 1, True
+
+    def sweep(self, index: int) -> int:
+        with self._lock:
+            return self._sweep(index)
+
+    def snapshot(self) -> dict[str, int | str]:
+        with self._lock:
+            return {
+                "backend": self.name,
+                "tracked_keys": len(self._windows),
+                "max_keys": self.max_keys,
+                "swept": self.swept,
+                "evicted": self.evicted,
+            }
+
+    def _sweep(self, index: int) -> int:
+        swept = 0
+        while self._windows:
+            _, state = next(iter(self._windows.items()))
+            if state[0] >= index - 1:
+                break
+            self._windows.popitem(last=False)
+            swept += 1
+        self.swept += swept
+        return swept
+
+
+# fingerprint, window_index, previous, current
+_SLOT = struct.Struct("<QqII")
+_WAYS = 4
+
+
+class SharedMemoryBackend(RateLimitBackend):
+    """Counters in an mmap-ed file shared by every worker on the host.
+
+    The table is 4-way set associative: a key's 64-bit fingerprint picks a
+    bucket of four 24-byte slots. A bucket is updated under an `fcntl.lockf`
+    byte-range lock (other processes) plus a thread lock (this process), so a
+    hit costs one hash, two syscalls and a few struct reads. A full bucket
+    reuses a slot idle for two windows, else the one that rolled least recently.
+    """
+
+    name = "shared"
+
+    def __init__(self, path: str, max_keys: int = 100_000) -> None:
+        self.path = path
+        self.buckets = max(math.ceil(max_keys / _WAYS), 1)
+        self._bucket_size = _SLOT.size * _WAYS
+        size = self.buckets * self._bucket_size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def hit(self, key: str, now: float, index: int, elapsed: float, limit: int) -> tuple[int, int, bool]:
+        fingerprint = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little") | 1
+        start = (fingerprint % self.buckets) * self._bucket_size
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, self._bucket_size, start)
+            try:
+                offset, previous, current = self._slot(start, fingerprint, index)
+                allowed = not _over_limit(previous, current, elapsed, limit)
+                if allowed:
+                    current += 1
+                _SLOT.pack_into(self._map, offset, fingerprint, index, previous, current)
+                return previous, current, allowed
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, self._bucket_size, start)
+
+    def snapshot(self) -> dict[str, int | str]:
+        return {"backend": self.name, "slots": self.buckets * _WAYS, "evicted": self.evicted}
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+    def _slot(self, start: int, fingerprint: int, index: int) -> tuple[int, int, int]:
+        """Offset and rolled `(previous, current)` counts for `fingerprint` in its bucket."""
+        victim, victim_index = start, None
+        for offset in range(start, start + self._bucket_size, _SLOT.size):
+            slot_fingerprint, slot_index, previous, current = _SLOT.unpack_from(self._map, offset)
+            if slot_fingerprint == fingerprint:
+                if slot_index == index:
+                    return offset, previous, current
+                return offset, current if slot_index == index - 1 else 0, 0
+            if slot_fingerprint == 0 or slot_index < index - 1:
+                victim, victim_index = offset, -1
+            elif victim_index is None or (victim_index >= 0 and slot_index < victim_index):
+                victim, victim_index = offset, slot_index
+        if victim_index is not None and victim_index >= 0:
+            self.evicted += 1
+        return victim, 0, 0
+
+
+class RespError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+
+class RespConnection:
+    """Minimal RESP2 client: pipelined commands over one socket."""
+
+    def __init__(self, host: str, port: int, db: int = 0, timeout: float = 0.5) -> None:
+        self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._socket.makefile("rb")
+        if db:
+            self.pipeline([("SELECT", db)])
+
+    def pipeline(self, commands: list[tuple]) -> list:
+        payload = bytearray()
+        for command in commands:
+            payload += b"*%d\r\n" % len(command)
+            for part in command:
+                data = part if isinstance(part, bytes) else str(part).encode("utf-8")
+                payload += b"$%d\r\n%s\r\n" % (len(data), data)
+        self._socket.sendall(payload)
+        return [self._read_reply() for _ in commands]
+
+    def close(self) -> None:
+        try:
+            self._reader.close()
+            self._socket.close()
+        except OSError:
+            pass
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode("utf-8")
+        if kind == b"-":
+            raise RespError(body.decode("utf-8"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            return self._reader.read(length + 2)[:-2]
+        if kind == b"*":
+            length = int(body)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise RespError(f"Unexpected reply type {kind!r}")
+
+
+# Roll, decide and count in one step on the server: KEYS = current and previous
+# window, ARGV = limit, elapsed fraction of the window, TTL. Returns
+# {previous, current, allowed} with `current` excluding a rejected request.
+_REDIS_HIT_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+if previous * (1 - tonumber(ARGV[2])) + current >= tonumber(ARGV[1]) then
+  return {previous, current, 0}
+end
+current = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return {previous, current, 1}
+"""
+_REDIS_HIT_SHA = hashlib.sha1(_REDIS_HIT_SCRIPT.encode("utf-8")).hexdigest()
+
+
+class RedisBackend(RateLimitBackend):
+    """Counters in Redis (or anything speaking RESP), shared across hosts.
+
+    One round trip per request: a Lua script (EVALSHA, loaded with EVAL on
+    first use) reads both windows, decides and counts atomically on the
+    server. Calls block on the network, so `blocking` tells the middleware to
+    run them off the event loop; connections come from a small pool so
+    concurrent requests do not queue behind one socket.
+
+    Errors fail open and are counted, and open a circuit breaker: for
+    `breaker_seconds` requests are let through without touching the network,
+    so an unreachable Redis costs neither a connect timeout per request nor a
+    reconnect storm.
+    """
+
+    name = "redis"
+    blocking = True
+
+    def __init__(
+        self,
+        url: str,
+        window_seconds: float,
+        prefix: str = "rl",
+        breaker_seconds: float = 5.0,
+        max_idle_connections: int = 8,
+    ) -> None:
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.ttl_seconds = math.ceil(window_seconds * 2) + 1
+        self.breaker_seconds = breaker_seconds
+        self.max_idle_connections = max_idle_connections
+        self._lock = threading.Lock()
+        self._idle: list[RespConnection] = []
+        self._open_until = 0.0
+        self.errors = 0
+        self.short_circuited = 0
+
+    def hit(self, key: str, now: float, index: int, elapsed: float, limit: int) -> tuple[int, int, bool]:
+        with self._lock:
+            if time.monotonic() < self._open_until:
+                self.short_circuited += 1
+                return 0, 0, True
+            connection = self._idle.pop() if self._idle else None
+        keys = (f"{self.prefix}:{key}:{index}", f"{self.prefix}:{key}:{index - 1}")
+        args = (limit, repr(elapsed), self.ttl_seconds)
+        try:
+            if connection is None:
+                connection = RespConnection(self.host, self.port, self.db)
+            try:
+                (reply,) = connection.pipeline([("EVALSHA", _REDIS_HIT_SHA, 2, *keys, *args)])
+            except RespError as exc:
+                if not str(exc).startswith("NOSCRIPT"):
+                    raise
+                (reply,) = connection.pipeline([("EVAL", _REDIS_HIT_SCRIPT, 2, *keys, *args)])
+            previous, current, allowed = (int(value) for value in reply)
+        except (OSError, RespError, ValueError, TypeError):
+            if connection is not None:
+                connection.close()
+            with self._lock:
+                self.errors += 1
+                self._open_until = time.monotonic() + self.breaker_seconds
+            return 0, 0, True
+        with self._lock:
+            if len(self._idle) < self.max_idle_connections:
+                self._idle.append(connection)
+                connection = None
+        if connection is not None:
+            connection.close()
+        return previous, current, bool(allowed)
+
+    def snapshot(self) -> dict[str, int | str]:
+        with self._lock:
+            return {
+                "backend": self.name,
+                "errors": self.errors,
+                "short_circuited": self.short_circuited,
+                "breaker_open": int(time.monotonic() < self._open_until),
+                "idle_connections": len(self._idle),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
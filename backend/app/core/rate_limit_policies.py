@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+_KEYS = {"ip", "user"}
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """Budget for requests whose method and path match `path`.
+
+    `path` is relative to the API prefix; `{name}` matches one segment and a
+    trailing `*` matches the rest of the path. `limit=None` exempts the route.
+    `key="user"` counts per authenticated user (JWT `sub`) and falls back to
+    the client address for anonymous requests.
+    """
+
+    name: str
+    path: str
+    methods: tuple[str, ...] = ("*",)
+    limit: int | None = None
+    window_seconds: float = 60.0
+    key: str = "ip"
+
+    def __post_init__(self) -> None:
+        if self.key not in _KEYS:
+            raise ValueError(f"Rate-limit policy {self.name!r}: key must be 'ip' or 'user'.")
+        if not self.path.startswith("/") and self.path != "*":
+            raise ValueError(f"Rate-limit policy {self.name!r}: path must start with '/'.")
+        if self.window_seconds <= 0:
+            raise ValueError(f"Rate-limit policy {self.name!r}: window_seconds must be positive.")
+        object.__setattr__(self, "methods", tuple(method.upper() for method in self.methods))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> RateLimitPolicy:
+        limit = data.get("limit")
+        return cls(
+            name=str(data["name"]),
+            path=str(data["path"]),
+            methods=tuple(data.get("methods", ("*",))),
+            limit=None if limit is None else int(limit),
+            window_seconds=float(data.get("window_seconds", 60.0)),
+            key=str(data.get("key", "ip")),
+        )
+
+
+DEFAULT_POLICIES = (
+    # Both run scrypt; budgets sit well above a person retrying a typo.
+    RateLimitPolicy(name="auth_login", path="/auth/login", methods=("POST",), limit=10, window_seconds=60),
+    RateLimitPolicy(name="auth_register", path="/auth/register", methods=("POST",), limit=5, window_seconds=600),
+    RateLimitPolicy(name="auth_refresh", path="/auth/refresh", methods=("POST",), limit=30, window_seconds=60),
+    # Polled by the app's connectivity check.
+    RateLimitPolicy(name="health", path="/health", methods=("GET",), limit=None),
+    RateLimitPolicy(name="audit_logs", path="/audit/*", methods=("GET",), limit=30, window_seconds=60, key="user"),
+)
+
+
+def load_policies(path: str) -> tuple[RateLimitPolicy, ...]:
+    """Policies from a JSON list; the file replaces the defaults entirely."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    policies = tuple(RateLimitPolicy.from_dict(item) for item in data)
+    names = [policy.name for policy in policies]
+    if len(set(names)) != len(names):
+        raise ValueError("Rate-limit policy names must be unique.")
+    return policies
+
+
+@dataclass
+class _Node:
+    literal: dict[str, _Node] = field(default_factory=dict)
+    param: _Node | None = None
+    # method ("*" for any) -> policy, for paths ending here / continuing past a trailing `*`
+    policies: dict[str, RateLimitPolicy] = field(default_factory=dict)
+    rest: dict[str, RateLimitPolicy] = field(default_factory=dict)
+
+
+def _by_method(table: Mapping[str, RateLimitPolicy], method: str) -> RateLimitPolicy | None:
+    return table.get(method) or table.get("*")
+
+
+class PolicyMatcher:
+    """Route patterns compiled once into an exact-path table plus a segment trie.
+
+    Literal paths resolve with one dict lookup. Templated paths walk the trie
+    one segment at a time, preferring a literal segment over `{param}` over a
+    trailing `*`, so the most specific pattern wins regardless of file order.
+    """
+
+    def __init__(self, policies: Iterable[RateLimitPolicy], prefix: str = "") -> None:
+        self._exact: dict[str, dict[str, RateLimitPolicy]] = {}
+        self._root = _Node()
+        for policy in policies:
+            full_path = prefix.rstrip("/") + policy.path if policy.path != "*" else prefix.rstrip("/") + "/*"
+            segments = full_path.strip("/").split("/")
+            if not any(segment == "*" or segment.startswith("{") for segment in segments):
+                table = self._exact.setdefault("/" + "/".join(segments), {})
+            else:
+                table = self._insert(segments)
+            for method in policy.methods:
+                table.setdefault(method, policy)
+
+    def match(self, method: str, path: str) -> RateLimitPolicy | None:
+        table = self._exact.get(path.rstrip("/") or "/")
+        if table is not None:
+            policy = _by_method(table, method)
+            if policy is not None:
+                return policy
+        return self._walk(self._root, path.strip("/").split("/"), 0, method)
+
+    def _insert(self, segments: list[str]) -> dict[str, RateLimitPolicy]:
+        node = self._root
+        for position, segment in enumerate(segments):
+            if segment == "*":
+                if position != len(segments) - 1:
+                    raise ValueError("'*' is only allowed as the last path segment.")
+                return node.rest
+            if segment.startswith("{") and segment.endswith("}"):
+                node.param = node.param or _Node()
+                node = node.param
+            else:
+                node = node.literal.setdefault(segment, _Node())
+        return node.policies
+
+    def _walk(self, node: _Node, segments: list[str], position: int, method: str) -> RateLimitPolicy | None:
+        if position == len(segments):
+            return _by_method(node.policies, method) or _by_method(node.rest, method)
+        child = node.literal.get(segments[position])
+        if child is not None:
+            policy = self._walk(child, segments, position + 1, method)
+            if policy is not None:
+                return policy
+        if node.param is not None:
+            policy = self._walk(node.param, segments, position + 1, method)
+            if policy is not None:
+                return policy
+        return _by_method(node.rest, method)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PeriodicJob:
+    name: str
+    interval_seconds: float
+    run: Callable[[], object]
+
+
+class PeriodicScheduler:
+    """Runs blocking maintenance jobs on worker threads at fixed intervals inside the app lifespan."""
+
+    def __init__(self, jobs: list[PeriodicJob]) -> None:
+        self._jobs = [job for job in jobs if job.interval_seconds > 0]
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._loop(job), name=f"periodic:{job.name}") for job in self._jobs]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @staticmethod
+    async def _loop(job: PeriodicJob) -> None:
+        while True:
+            await asyncio.sleep(job.interval_seconds)
+            try:
+                await asyncio.to_thread(job.run)
+            except Exception:
+                logger.exception("Periodic job %s failed", job.name)
@@ -11,6 +11,7 @@ from uuid import uuid4
 from jose import JWTError, jwt
 
 from .config import get_settings
+from .hash_pool import get_hash_executor
 
 
 def _b64_encode(raw: bytes) -> str:
@@ -21,33 +22,87 @@ def _b64_decode(raw: str) -> bytes:
     return base64.urlsafe_b64decode(raw.encode("ascii"))
 
 
+def scrypt_memory_bytes(n: int, r: int, p: int) -> int:
+    """Working-set size of one scrypt call (the V array plus the per-lane B blocks)."""
+    return 128 * r * (n + p)
+
+
+def _scrypt(password: bytes, salt: bytes, n: int, r: int, p: int, dklen: int) -> bytes:
+    # Module-level so the process-pool backend can pickle it. OpenSSL's default
+    # 32 MiB cap would reject calibrated parameters, so size maxmem from n/r/p.
+    maxmem = scrypt_memory_bytes(n, r, p) + 1024 * 1024
+    return hashlib.scrypt(password, salt=salt, n=n, r=r, p=p, dklen=dklen, maxmem=maxmem)
+
+
+def scrypt_parameters() -> tuple[int, int, int]:
+    settings = get_settings()
+    return settings.password_scrypt_n, settings.password_scrypt_r, settings.password_scrypt_p
+
+
 def hash_password(password: str) -> str:
+    n, r, p = scrypt_parameters()
     salt = secrets.token_bytes(16)
-    derived = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=2**14, r=8, p=1, dklen=32)
-    return f"scrypt$16384$8$1${_b64_encode(salt)}${_b64_encode(derived)}"
+    derived = get_hash_executor().run(_scrypt, password.encode("utf-8"), salt, n, r, p, 32)
+    return f"scrypt${n}${r}${p}${_b64_encode(salt)}${_b64_encode(derived)}"
 
 
-def verify_password(plain_password: str, stored_hash: str) -> bool:
+async def hash_password_async(password: str) -> str:
+    """`hash_password` for async handlers: the event loop waits on the pool, no thread does."""
+    n, r, p = scrypt_parameters()
+    salt = secrets.token_bytes(16)
+    derived = await get_hash_executor().run_async(_scrypt, password.encode("utf-8"), salt, n, r, p, 32)
+    return f"scrypt${n}${r}${p}${_b64_encode(salt)}${_b64_encode(derived)}"
+
+
+def needs_rehash(stored_hash: str) -> bool:
+    """True when a stored hash was produced with parameters other than the configured ones."""
+    try:
+        algo, n, r, p, _ = stored_hash.split("$", 4)
+        return algo != "scrypt" or (int(n), int(r), int(p)) != scrypt_parameters()
+    except ValueError:
+        return True
+
+
+def _parse_hash(stored_hash: str) -> tuple[bytes, bytes, tuple[int, int, int]] | None:
     try:
         algo, n, r, p, salt_b64, hash_b64 = stored_hash.split("$", 5)
         if algo != "scrypt":
-            return False
-        salt = _b64_decode(salt_b64)
-        expected = _b64_decode(hash_b64)
-        check = hashlib.scrypt(
-            plain_password.encode("utf-8"),
-            salt=salt,
-            n=int(n),
-            r=int(r),
-            p=int(p),
-            dklen=len(expected),
-        )
-        return hmac.compare_digest(check, expected)
+            return None
+        return _b64_decode(salt_b64), _b64_decode(hash_b64), (int(n), int(r), int(p))
     except Exception:
+        return None
+
+
+def verify_password(plain_password: str, stored_hash: str) -> bool:
+    parsed = _parse_hash(stored_hash)
+    if parsed is None:
+        return False
+    salt, expected, params = parsed
+
+    # Saturation propagates so the caller gets a 503 rather than a misleading 401.
+    try:
+        check = get_hash_executor().run(_scrypt, plain_password.encode("utf-8"), salt, *params, len(expected))
+    except ValueError:
+        return False
+    return hmac.compare_digest(check, expected)
+
+
+async def verify_password_async(plain_password: str, stored_hash: str) -> bool:
+    parsed = _parse_hash(stored_hash)
+    if parsed is None:
+        return False
+    salt, expected, params = parsed
+
+    try:
+        check = await get_hash_executor().run_async(
+            _scrypt, plain_password.encode("utf-8"), salt, *params, len(expected)
+        )
+    except ValueError:
         return False
+    return hmac.compare_digest(check, expected)
 
 
-def _build_token(subject: str, expires_delta: timedelta, token_type: str) -> str:
+def _build_token(subject: str, expires_delta: timedelta, token_type: str, jti: str | None = None) -> str:
     settings = get_settings()
     now = datetime.now(UTC)
     payload: dict[str, Any] = {
@@ -55,7 +110,7 @@ def _build_token(subject: str, expires_delta: timedelta, token_type: str) -> str
         "type": token_type,
         "iat": int(now.timestamp()),
         "exp": int((now + expires_delta).timestamp()),
-        "jti": str(uuid4()),
+        "jti": jti or str(uuid4()),
     }
     return jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
 
@@ -66,10 +121,10 @@ def create_access_token(subject: str) -> str:
     return _build_token(subject=subject, expires_delta=expiry, token_type="access")
 
 
-def create_refresh_token(subject: str) -> str:
+def create_refresh_token(subject: str, jti: str | None = None) -> str:
     settings = get_settings()
     expiry = timedelta(minutes=settings.jwt_refresh_token_expire_minutes)
-    return _build_token(subject=subject, expires_delta=expiry, token_type="refresh")
+    return _build_token(subject=subject, expires_delta=expiry, token_type="refresh", jti=jti)
 
 
 def decode_token(token: str) -> dict[str, Any]:
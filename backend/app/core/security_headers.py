@@ -1,15 +1,37 @@
-from typing import Callable
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+# Encoded once; appended to every `http.response.start` as-is.
+_SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"referrer-policy", b"no-referrer"),
+    (b"permissions-policy", b"camera=(), microphone=(), geolocation=()"),
+    (b"cross-origin-resource-policy", b"cross-origin"),
+]
+_SECURITY_HEADER_NAMES = frozenset(name for name, _ in _SECURITY_HEADERS)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable):
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Referrer-Policy"] = "no-referrer"
-        response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
-        response.headers["Cross-Origin-Resource-Policy"] = "cross-origin"
-        return response
+class SecurityHeadersMiddleware:
+    """Adds the security headers by rewriting the response start message.
+
+    Plain ASGI: the body is never touched, so streaming responses pass
+    through chunk by chunk. Values set by a route are replaced.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = message.get("headers") or []
+                message["headers"] = [
+                    header for header in headers if header[0].lower() not in _SECURITY_HEADER_NAMES
+                ] + _SECURITY_HEADERS
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
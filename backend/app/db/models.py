@@ -1,5 +1,18 @@
 from app.db.base import Base
-from app.models.entities import AuditLog, AvatarState, Completion, Habit, Quest, Stats, User
+from app.models.entities import (
+    AuditLog,
+    AvatarState,
+    Completion,
+    CompletionDailyRollup,
+    Habit,
+    HabitStreak,
+    LoginFailure,
+    Quest,
+    RefreshToken,
+    Stats,
+    User,
+    UserStreak,
+)
 
 __all__ = [
     "Base",
@@ -10,4 +23,9 @@ __all__ = [
     "Quest",
     "AvatarState",
     "AuditLog",
+    "HabitStreak",
+    "UserStreak",
+    "CompletionDailyRollup",
+    "LoginFailure",
+    "RefreshToken",
 ]
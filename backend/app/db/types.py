@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import base64
+import json
+import zlib
+from typing import Any
+
+from sqlalchemy import Text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator
+
+_COMPRESSED_PREFIX = "z:"
+DEFAULT_COMPRESS_THRESHOLD = 512
+
+
+def encode_json_details(details: dict[str, Any], compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD) -> str:
+    """Compact JSON; payloads above `compress_threshold` bytes become `z:<base64 zlib>`."""
+    encoded = json.dumps(details, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+    if compress_threshold > 0 and len(encoded.encode("utf-8")) > compress_threshold:
+        packed = base64.b64encode(zlib.compress(encoded.encode("utf-8"), 9)).decode("ascii")
+        if len(packed) + len(_COMPRESSED_PREFIX) < len(encoded):
+            return _COMPRESSED_PREFIX + packed
+    return encoded
+
+
+def decode_json_details(raw: str | dict[str, Any] | None) -> dict[str, Any]:
+    if raw is None or raw == "":
+        return {}
+    if isinstance(raw, dict):
+        return raw
+    if raw.startswith(_COMPRESSED_PREFIX):
+        raw = zlib.decompress(base64.b64decode(raw[len(_COMPRESSED_PREFIX) :])).decode("utf-8")
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        return {"raw": raw}
+    return value if isinstance(value, dict) else {"value": value}
+
+
+class JSONDetails(TypeDecorator):
+    """Dict column: JSONB on PostgreSQL (indexable), compact/compressed text elsewhere.
+
+    Already-encoded strings are written as-is, and reads accept both the plain
+    JSON written before this type existed and the compressed form.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def __init__(self, compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD) -> None:
+        super().__init__()
+        self.compress_threshold = compress_threshold
+
+    def load_dialect_impl(self, dialect: Dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.JSONB())
+        return dialect.type_descriptor(Text())
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> Any:
+        if value is None:
+            value = {}
+        if dialect.name == "postgresql":
+            return decode_json_details(value)
+        if isinstance(value, str):
+            return value
+        return encode_json_details(value, self.compress_threshold)
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> dict[str, Any]:
+        return decode_json_details(value)
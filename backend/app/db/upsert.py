@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def insert_for(db: Session, model):
+    """Dialect `INSERT` for `model` that supports `on_conflict_do_*` (PostgreSQL or SQLite)."""
+    dialect = db.get_bind().dialect.name
+    return (postgresql.insert if dialect == "postgresql" else sqlite.insert)(model)
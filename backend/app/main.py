@@ -1,22 +1,85 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.routes.audit import router as audit_router
 from app.api.routes.auth import router as auth_router
 from app.api.routes.habits import router as habits_router
 from app.api.routes.health import router as health_router
+from app.api.routes.leaderboard import router as leaderboard_router
 from app.api.routes.profile import router as profile_router
 from app.api.routes.progression import router as progression_router
 from app.api.routes.quests import router as quests_router
 from app.core.config import get_settings
 from app.core.errors import register_exception_handlers
+from app.core.hash_pool import shutdown_hash_executor
 from app.core.rate_limit import RateLimitMiddleware
+from app.core.scheduler import PeriodicJob, PeriodicScheduler
 from app.core.security_headers import SecurityHeadersMiddleware
+from app.db.session import SessionLocal
+from app.services.audit_partition_service import run_audit_partition_job
+from app.services.audit_writer import get_audit_writer
+from app.services.habit_reset_service import run_habit_reset_job
+from app.services.leaderboard_service import get_leaderboard
+from app.services.login_throttle_service import (
+    get_login_throttle,
+    run_login_failure_purge_job,
+    run_login_failure_sync_job,
+)
+from app.services.principal_cache import run_principal_cache_sync_job
+from app.services.rate_limit_audit import get_blocked_request_audit, run_rate_limit_audit_job
+from app.services.refresh_token_service import (
+    get_revocation_index,
+    run_refresh_token_purge_job,
+    run_refresh_token_sync_job,
+)
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    db = SessionLocal()
+    try:
+        get_leaderboard().rebuild(db)
+        get_revocation_index().rebuild(db)
+        get_login_throttle().sync(db)
+    finally:
+        db.close()
+
+    scheduler = PeriodicScheduler(
+        [
+            PeriodicJob("habit_reset", settings.habit_reset_interval_seconds, run_habit_reset_job),
+            PeriodicJob("login_failure_sync", settings.login_throttle_sync_seconds, run_login_failure_sync_job),
+            PeriodicJob(
+                "login_failure_purge", settings.login_throttle_purge_interval_seconds, run_login_failure_purge_job
+            ),
+            PeriodicJob("refresh_token_sync", settings.refresh_token_sync_seconds, run_refresh_token_sync_job),
+            PeriodicJob("refresh_token_purge", settings.refresh_token_purge_interval_seconds, run_refresh_token_purge_job),
+            PeriodicJob("principal_cache_sync", settings.principal_cache_sync_seconds, run_principal_cache_sync_job),
+            PeriodicJob("audit_partitions", settings.audit_partition_interval_seconds, run_audit_partition_job),
+            PeriodicJob("rate_limit_audit", settings.rate_limit_audit_interval_seconds, run_rate_limit_audit_job),
+        ]
+    )
+    audit_writer = get_audit_writer()
+    audit_writer.start()
+    await scheduler.start()
+    try:
+        yield
+    finally:
+        await scheduler.stop()
+        get_blocked_request_audit().flush()
+        # Drain after the scheduler so events from in-flight jobs are written too.
+        audit_writer.stop()
+        shutdown_hash_executor()
+
+
 app = FastAPI(
     title=settings.app_name,
     debug=settings.debug,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -37,4 +100,6 @@ app.include_router(habits_router, prefix=settings.api_v1_prefix)
 app.include_router(progression_router, prefix=settings.api_v1_prefix)
 app.include_router(quests_router, prefix=settings.api_v1_prefix)
 app.include_router(profile_router, prefix=settings.api_v1_prefix)
+app.include_router(leaderboard_router, prefix=settings.api_v1_prefix)
+app.include_router(audit_router, prefix=settings.api_v1_prefix)
 register_exception_handlers(app)
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class AuditLogPublic(BaseModel):
+    id: int
+    user_id: str | None
+    event_type: str
+    entity_type: str
+    entity_id: str
+    details: dict[str, Any]
+    created_at: datetime
+
+
+class AuditLogPage(BaseModel):
+    items: list[AuditLogPublic]
+    next_cursor: str | None = None
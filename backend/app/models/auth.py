@@ -27,9 +27,15 @@ class TokenRefreshRequest(BaseModel):
 
 class TokenRefreshResponse(BaseModel):
     access_token: str
+    refresh_token: str | None = None
     token_type: str = "bearer"
 
 
+class LogoutRequest(BaseModel):
+    refresh_token: str
+    all_sessions: bool = False
+
+
 class UserPublic(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
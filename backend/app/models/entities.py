@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 import enum
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import Boolean, Date, DateTime, Enum, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.db.types import JSONDetails
 
 
 class HabitType(str, enum.Enum):
@@ -28,7 +29,13 @@ class User(Base):
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
     email: Mapped[str] = mapped_column(String(320), unique=True, index=True)
     hashed_password: Mapped[str] = mapped_column(String(512))
+    # Granted only with tools/admin_users.py; nothing a user submits can set it.
+    is_admin: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+    # Bumped by every UPDATE, bulk statements included; workers poll it to drop cached principals.
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True, onupdate=lambda: datetime.now(UTC)
+    )
 
     habits: Mapped[list[Habit]] = relationship(back_populates="user", cascade="all, delete-orphan")
 
@@ -43,6 +50,9 @@ class Habit(Base):
     type: Mapped[HabitType] = mapped_column(Enum(HabitType, name="habit_type"), index=True)
     schedule: Mapped[HabitSchedule] = mapped_column(Enum(HabitSchedule, name="habit_schedule"), default=HabitSchedule.daily)
     completed: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Denormalized from completions so policy checks never scan completion history.
+    last_completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    ever_completed: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
 
     user: Mapped[User] = relationship(back_populates="habits")
@@ -91,18 +101,72 @@ class AvatarState(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
 
 
+class HabitStreak(Base):
+    __tablename__ = "habit_streaks"
+
+    habit_id: Mapped[str] = mapped_column(ForeignKey("habits.id", ondelete="CASCADE"), primary_key=True)
+    user_id: Mapped[str] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    current_streak: Mapped[int] = mapped_column(Integer, default=0)
+    best_streak: Mapped[int] = mapped_column(Integer, default=0)
+    last_completed_day: Mapped[date | None] = mapped_column(Date, nullable=True)
+
+
+class UserStreak(Base):
+    __tablename__ = "user_streaks"
+
+    user_id: Mapped[str] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    current_streak: Mapped[int] = mapped_column(Integer, default=0)
+    best_streak: Mapped[int] = mapped_column(Integer, default=0)
+    last_completed_day: Mapped[date | None] = mapped_column(Date, nullable=True)
+
+
+class CompletionDailyRollup(Base):
+    __tablename__ = "completion_daily_rollups"
+
+    user_id: Mapped[str] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    habit_type: Mapped[HabitType] = mapped_column(Enum(HabitType, name="habit_type"), primary_key=True)
+    completed_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class LoginFailure(Base):
+    """Decaying failed-login score per throttle key (`account:<email>` or `ip:<address>`)."""
+
+    __tablename__ = "login_failures"
+
+    key: Mapped[str] = mapped_column(String(400), primary_key=True)
+    score: Mapped[float] = mapped_column(Float, default=0.0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC), index=True)
+
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    jti: Mapped[str] = mapped_column(String(36), primary_key=True)
+    user_id: Mapped[str] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    issued_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    replaced_by: Mapped[str | None] = mapped_column(String(36), nullable=True)
+
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    # SQLite rotation recreates this table; AUTOINCREMENT lets ids carry on across partitions.
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=True)
     event_type: Mapped[str] = mapped_column(String(64), index=True)
     entity_type: Mapped[str] = mapped_column(String(64))
     entity_id: Mapped[str] = mapped_column(String(64))
-    details: Mapped[str] = mapped_column(Text, default="")
+    details: Mapped[dict] = mapped_column(JSONDetails(), default=dict)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC), index=True)
 
 
 Index("ix_habit_user_schedule", Habit.user_id, Habit.schedule)
+Index("ix_habit_schedule_completed", Habit.schedule, Habit.completed, Habit.last_completed_at)
 Index("ix_completion_user_time", Completion.user_id, Completion.created_at)
-Index("ix_audit_user_time", AuditLog.user_id, AuditLog.created_at)
+Index("ix_audit_user_time", AuditLog.user_id, AuditLog.created_at, AuditLog.id)
+Index("ix_audit_event_time", AuditLog.event_type, AuditLog.created_at, AuditLog.id)
+Index("ix_audit_entity_time", AuditLog.entity_type, AuditLog.entity_id, AuditLog.created_at, AuditLog.id)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -25,6 +26,15 @@ class HabitCompletionUpdate(BaseModel):
     completed: bool
 
 
+class HabitCompletionBatchItem(BaseModel):
+    habit_id: str
+    completed: bool
+
+
+class HabitCompletionBatchRequest(BaseModel):
+    items: list[HabitCompletionBatchItem] = Field(min_length=1, max_length=100)
+
+
 class HabitPublic(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -37,9 +47,28 @@ class HabitPublic(BaseModel):
     created_at: datetime
 
 
+class HabitCompletionBatchResult(BaseModel):
+    habit_id: str
+    status: Literal["applied", "unchanged", "rejected", "not_found"]
+    message: str | None = None
+    habit: HabitPublic | None = None
+
+
+class HabitCompletionBatchResponse(BaseModel):
+    results: list[HabitCompletionBatchResult]
+
+
 class CompletionPublic(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     habit_id: str
     user_id: str
     completed: bool
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    habit_type: HabitType | None = None
+
+
+class CompletionPage(BaseModel):
+    items: list[CompletionPublic]
+    next_cursor: str | None = None
@@ -0,0 +1,24 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+LeaderboardDimension = Literal["total", "chakra", "vitality", "focus"]
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: str
+    xp: int
+
+
+class LeaderboardPublic(BaseModel):
+    dimension: LeaderboardDimension
+    size: int
+    entries: list[LeaderboardEntry]
+
+
+class LeaderboardRankPublic(BaseModel):
+    dimension: LeaderboardDimension
+    size: int
+    rank: int | None
+    xp: int
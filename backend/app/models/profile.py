@@ -12,3 +12,5 @@ class ProfilePublic(BaseModel):
     aura_level: int
     aura_label: str
     avatar_type: str
+    current_streak: int = 0
+    best_streak: int = 0
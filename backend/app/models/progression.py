@@ -1,4 +1,4 @@
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -23,6 +23,31 @@ class AvatarStatePublic(BaseModel):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
 
+class StreakPublic(BaseModel):
+    current_streak: int = 0
+    best_streak: int = 0
+
+
+class HabitStreakPublic(StreakPublic):
+    habit_id: str
+
+
 class ProgressionPublic(BaseModel):
     stats: StatsPublic
     avatar: AvatarStatePublic
+    streak: StreakPublic = Field(default_factory=StreakPublic)
+    habit_streaks: list[HabitStreakPublic] = Field(default_factory=list)
+
+
+class DailyCompletionPublic(BaseModel):
+    day: date
+    chakra: int
+    vitality: int
+    focus: int
+    total: int
+
+
+class CompletionHistoryPublic(BaseModel):
+    start: date
+    end: date
+    days: list[DailyCompletionPublic]
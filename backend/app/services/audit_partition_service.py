@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from pathlib import Path
+
+import sqlalchemy as sa
+from sqlalchemy import Engine, inspect
+
+from app.core.config import get_settings
+from app.db.session import engine as default_engine
+from app.models.entities import AuditLog
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_RE = re.compile(r"^audit_logs_p(\d{4})(\d{2})$")
+_ARCHIVE_COLUMNS = ("id", "user_id", "event_type", "entity_type", "entity_id", "details", "created_at")
+_DETAILS_TYPE = AuditLog.__table__.c.details.type
+
+
+def partition_name(month: date) -> str:
+    return f"audit_logs_p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    """The month a `audit_logs_pYYYYMM` table is named for, or None for any other table."""
+    match = _PARTITION_RE.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def month_start(value: datetime | date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+@dataclass
+class AuditMaintenanceRun:
+    created: list[str] = field(default_factory=list)
+    rotated: list[str] = field(default_factory=list)
+    archived: list[str] = field(default_factory=list)
+    rows_archived: int = 0
+    elapsed_seconds: float = 0.0
+
+
+class AuditPartitionService:
+    """Monthly partitions for `audit_logs` with archive-then-drop retention.
+
+    PostgreSQL: `audit_logs` is a native RANGE partitioned table (migration 0011);
+    partitions `audit_logs_pYYYYMM` are created ahead of time and expired ones are
+    detached, archived and dropped.
+
+    SQLite: `audit_logs` is the active month. Once it holds rows from before the
+    current month it is renamed to `audit_logs_pYYYYMM` (the month just closed)
+    and an empty table takes its place, so inserts and index maintenance only
+    ever touch one month of data. Rows written between the month boundary and
+    the next maintenance run travel with the closed month.
+    """
+
+    def __init__(
+        self,
+        engine: Engine | None = None,
+        archive_dir: str | Path | None = None,
+        retention_months: int | None = None,
+        premake_months: int | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.engine = engine or default_engine
+        self.archive_dir = Path(archive_dir if archive_dir is not None else settings.audit_archive_dir)
+        self.retention_months = settings.audit_retention_months if retention_months is None else retention_months
+        self.premake_months = settings.audit_partition_premake_months if premake_months is None else premake_months
+
+    @property
+    def native(self) -> bool:
+        return self.engine.dialect.name == "postgresql"
+
+    def run_maintenance(self, now: datetime | None = None) -> AuditMaintenanceRun:
+        now = now or datetime.now(UTC)
+        started = time.perf_counter()
+        run = AuditMaintenanceRun()
+        if self.native:
+            run.created = self._ensure_future_partitions(now)
+        else:
+            rotated = self._rotate_active_table(now)
+            if rotated:
+                run.rotated.append(rotated)
+        if self.retention_months > 0:
+            for name in self.expired_partitions(now):
+                run.rows_archived += self._archive_and_drop(name)
+                run.archived.append(name)
+        run.elapsed_seconds = time.perf_counter() - started
+        return run
+
+    def list_partitions(self) -> list[tuple[str, date]]:
+        with self.engine.connect() as conn:
+            names = inspect(conn).get_table_names()
+        partitions = [(name, month) for name in names if (month := partition_month(name)) is not None]
+        return sorted(partitions, key=lambda item: item[1])
+
+    def expired_partitions(self, now: datetime) -> list[str]:
+        cutoff = add_months(month_start(now), -self.retention_months)
+        return [name for name, month in self.list_partitions() if month < cutoff]
+
+    def _ensure_future_partitions(self, now: datetime) -> list[str]:
+        existing = {name for name, _ in self.list_partitions()}
+        created = []
+        current = month_start(now)
+        with self.engine.begin() as conn:
+            for offset in range(self.premake_months + 1):
+                month = add_months(current, offset)
+                name = partition_name(month)
+                if name in existing:
+                    continue
+                conn.execute(
+                    sa.text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF audit_logs "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                    )
+                )
+                created.append(name)
+        return created
+
+    def _rotate_active_table(self, now: datetime) -> str | None:
+        boundary = datetime.combine(month_start(now), datetime.min.time(), tzinfo=UTC)
+        with self.engine.begin() as conn:
+            has_closed_rows = conn.execute(
+                sa.select(AuditLog.id).where(AuditLog.created_at < boundary).limit(1)
+            ).first()
+            if has_closed_rows is None:
+                return None
+            name = partition_name(add_months(month_start(now), -1))
+            if inspect(conn).has_table(name):
+                # A partition for the closed month exists already: fold the stragglers into it.
+                conn.execute(
+                    sa.text(f"INSERT INTO {name} SELECT * FROM audit_logs WHERE created_at < :boundary").bindparams(
+                        sa.bindparam("boundary", boundary, type_=AuditLog.__table__.c.created_at.type)
+                    )
+                )
+                conn.execute(sa.delete(AuditLog).where(AuditLog.created_at < boundary))
+                return name
+            index_names = [index["name"] for index in inspect(conn).get_indexes("audit_logs")]
+            last_id = conn.execute(sa.select(sa.func.max(AuditLog.id))).scalar_one()
+            conn.execute(sa.text(f"ALTER TABLE audit_logs RENAME TO {name}"))
+            # SQLite index names are schema-global; free them for the new active table.
+            for index_name in index_names:
+                conn.execute(sa.text(f"DROP INDEX IF EXISTS {index_name}"))
+            AuditLog.__table__.create(conn)
+            # Ids continue after the closed month's, so they stay unique across partitions.
+            conn.execute(sa.text("DELETE FROM sqlite_sequence WHERE name = 'audit_logs'"))
+            conn.execute(
+                sa.text("INSERT INTO sqlite_sequence (name, seq) VALUES ('audit_logs', :seq)").bindparams(seq=last_id)
+            )
+        logger.info("Rotated audit_logs into %s", name)
+        return name
+
+    def _archive_and_drop(self, name: str) -> int:
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        target = self.archive_dir / f"{name}.ndjson.gz"
+        partial = target.with_suffix(target.suffix + ".tmp")
+        # Typed `details` so compressed payloads are archived decoded.
+        partition = sa.table(
+            name,
+            *(sa.column(column, _DETAILS_TYPE if column == "details" else None) for column in _ARCHIVE_COLUMNS),
+        )
+        rows = 0
+        with self.engine.begin() as conn:
+            if self.native:
+                conn.execute(sa.text(f"ALTER TABLE audit_logs DETACH PARTITION {name}"))
+            result = conn.execution_options(yield_per=5000).execute(
+                sa.select(partition).order_by(partition.c.created_at, partition.c.id)
+            )
+            with gzip.open(partial, "wt", encoding="utf-8") as handle:
+                for row in result:
+                    record = dict(row._mapping)
+                    created_at = record["created_at"]
+                    record["created_at"] = created_at.isoformat() if isinstance(created_at, datetime) else created_at
+                    handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+                    rows += 1
+            # The archive is complete on disk before the partition disappears.
+            os.replace(partial, target)
+            conn.execute(sa.text(f"DROP TABLE {name}"))
+        logger.info("Archived %d audit rows from %s to %s", rows, name, target)
+        return rows
+
+
+def run_audit_partition_job() -> AuditMaintenanceRun:
+    return AuditPartitionService().run_maintenance()
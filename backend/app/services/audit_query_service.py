@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+
+import sqlalchemy as sa
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, inspect, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.datetimes import as_utc
+from app.db.session import SessionLocal
+from app.models.audit import AuditLogPublic
+from app.models.entities import AuditLog
+from app.services.audit_partition_service import add_months, partition_month
+
+_STREAM_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class AuditQueryFilter:
+    user_id: str | None = None
+    event_type: str | None = None
+    entity_type: str | None = None
+    entity_id: str | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+
+
+class AuditQueryService:
+    """Newest-first audit log reads with keyset pagination over `(created_at, id)`.
+
+    Each filter combination has a matching composite index ending in
+    `(created_at, id)` (ix_audit_user_time, ix_audit_event_time,
+    ix_audit_entity_time), so a page is an index range scan regardless of depth.
+
+    On SQLite, closed months live in separate `audit_logs_pYYYYMM` tables
+    (see `AuditPartitionService`), so reads union the active table with the
+    partitions that can hold rows inside `since`/`until`. PostgreSQL partitions
+    natively and reads `audit_logs` alone.
+    """
+
+    def page(
+        self,
+        db: Session,
+        filters: AuditQueryFilter,
+        cursor: str | None,
+        limit: int,
+    ) -> tuple[list[AuditLogPublic], str | None]:
+        after = self.decode_cursor(cursor) if cursor else None
+        rows = db.execute(self._query(db, filters, after).limit(limit + 1)).all()
+        items = [self.to_public(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = self.encode_cursor(last.created_at, last.id)
+        return items, next_cursor
+
+    def iter_rows(self, db: Session, filters: AuditQueryFilter) -> Iterator[AuditLogPublic]:
+        """Every matching row through a server-side cursor; memory stays at one batch."""
+        stmt = self._query(db, filters).execution_options(stream_results=True, yield_per=_STREAM_BATCH_SIZE)
+        result = db.execute(stmt)
+        for row in result:
+            yield self.to_public(row)
+
+    def stream_ndjson(self, filters: AuditQueryFilter) -> Iterator[bytes]:
+        """NDJSON export for the API; owns its session because it outlives the request scope."""
+        db = SessionLocal()
+        try:
+            for item in self.iter_rows(db, filters):
+                yield item.model_dump_json().encode("utf-8") + b"\n"
+        finally:
+            db.close()
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, log_id: int) -> str:
+        raw = json.dumps([created_at.isoformat(), log_id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[datetime, int]:
+        try:
+            created_at, log_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return datetime.fromisoformat(created_at), int(log_id)
+        except (ValueError, TypeError, binascii.Error, UnicodeError) as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+    @staticmethod
+    def to_public(row) -> AuditLogPublic:
+        return AuditLogPublic(
+            id=row.id,
+            user_id=row.user_id,
+            event_type=row.event_type,
+            entity_type=row.entity_type,
+            entity_id=row.entity_id,
+            details=row.details,
+            created_at=row.created_at,
+        )
+
+    def _query(self, db: Session, filters: AuditQueryFilter, after: tuple[datetime, int] | None = None) -> Select:
+        # Filters and the cursor are applied inside each branch so every table can use its own indexes.
+        branches = [self._select(table, filters, after) for table in self._tables(db, filters)]
+        if len(branches) == 1:
+            (stmt,) = branches
+            columns = stmt.selected_columns
+        else:
+            combined = union_all(*branches).subquery("audit_logs_all")
+            stmt = select(combined)
+            columns = combined.c
+        return stmt.order_by(columns.created_at.desc(), columns.id.desc())
+
+    @staticmethod
+    def _tables(db: Session, filters: AuditQueryFilter) -> list[sa.TableClause]:
+        active = AuditLog.__table__
+        if db.get_bind().dialect.name == "postgresql":
+            return [active]
+        partitions = sorted(
+            (month, name)
+            for name in inspect(db.connection()).get_table_names()
+            if (month := partition_month(name)) is not None
+        )
+        since = as_utc(filters.since) if filters.since is not None else None
+        until = as_utc(filters.until) if filters.until is not None else None
+        tables: list[sa.TableClause] = []
+        previous: date | None = None
+        for month, name in partitions:
+            # A partition holds everything written since the previous rotation, plus rows
+            # from the first days of the next month written before maintenance rotated it.
+            lower = _month_datetime(add_months(previous, 1)) if previous is not None else None
+            upper = _month_datetime(add_months(month, 2))
+            previous = month
+            if until is not None and lower is not None and until <= lower:
+                continue
+            if since is not None and since >= upper:
+                continue
+            tables.append(sa.table(name, *(sa.column(column.name, column.type) for column in active.columns)))
+        tables.append(active)
+        return tables
+
+    @staticmethod
+    def _select(table: sa.TableClause, filters: AuditQueryFilter, after: tuple[datetime, int] | None) -> Select:
+        columns = table.c
+        stmt = select(
+            columns.id,
+            columns.user_id,
+            columns.event_type,
+            columns.entity_type,
+            columns.entity_id,
+            columns.details,
+            columns.created_at,
+        )
+        if filters.user_id is not None:
+            stmt = stmt.where(columns.user_id == filters.user_id)
+        if filters.event_type is not None:
+            stmt = stmt.where(columns.event_type == filters.event_type)
+        if filters.entity_type is not None:
+            stmt = stmt.where(columns.entity_type == filters.entity_type)
+        if filters.entity_id is not None:
+            stmt = stmt.where(columns.entity_id == filters.entity_id)
+        if filters.since is not None:
+            stmt = stmt.where(columns.created_at >= as_utc(filters.since))
+        if filters.until is not None:
+            stmt = stmt.where(columns.created_at < as_utc(filters.until))
+        if after is not None:
+            created_at, log_id = after
+            stmt = stmt.where(
+                or_(columns.created_at < created_at, and_(columns.created_at == created_at, columns.id < log_id))
+            )
+        return stmt
+
+
+def _month_datetime(month: date) -> datetime:
+    return datetime(month.year, month.month, 1, tzinfo=UTC)
@@ -1,12 +1,55 @@
 from __future__ import annotations
 
-import json
 from datetime import UTC, datetime
 from typing import Any
 
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.models.entities import AuditLog
+from app.services.audit_writer import get_audit_writer
+
+_PENDING_KEY = "audit_pending"
+# Strings longer than this are diffed instead of stored whole.
+_INLINE_DIFF_LIMIT = 120
+_PREFIX_BLOCK = 4096
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    # Compare fixed-size slices first so the Python-level loop only walks the last block.
+    limit = min(len(a), len(b))
+    index = 0
+    while index < limit and a[index : index + _PREFIX_BLOCK] == b[index : index + _PREFIX_BLOCK]:
+        index += _PREFIX_BLOCK
+    index = min(index, limit)
+    while index < limit and a[index] == b[index]:
+        index += 1
+    return index
+
+
+def field_diff(before: dict[str, Any], after: dict[str, Any]) -> dict[str, Any]:
+    """Changed fields only, as `{"from": old, "to": new}`.
+
+    Long strings are recorded as the edited span, `[[offset, removed, inserted]]`
+    against the old value, found by trimming the common prefix and suffix in
+    linear time, so a one-word edit to long notes stays a few bytes.
+    """
+    changes: dict[str, Any] = {}
+    for key in sorted(before.keys() | after.keys()):
+        old, new = before.get(key), after.get(key)
+        if old == new:
+            continue
+        if isinstance(old, str) and isinstance(new, str) and max(len(old), len(new)) > _INLINE_DIFF_LIMIT:
+            prefix = _common_prefix_length(old, new)
+            suffix = _common_prefix_length(old[prefix:][::-1], new[prefix:][::-1])
+            changes[key] = {
+                "edits": [[prefix, old[prefix : len(old) - suffix], new[prefix : len(new) - suffix]]],
+                "length": [len(old), len(new)],
+            }
+        else:
+            changes[key] = {"from": old, "to": new}
+    return changes
 
 
 class AuditService:
@@ -19,13 +62,42 @@ class AuditService:
         entity_type: str,
         entity_id: str,
         details: dict[str, Any] | None = None,
+        durable: bool = False,
     ) -> None:
-        entry = AuditLog(
-            user_id=user_id,
-            event_type=event_type,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            details=json.dumps(details or {}, separators=(",", ":"), sort_keys=True),
-            created_at=datetime.now(UTC),
-        )
-        db.add(entry)
+        """Record an audit event that takes effect when `db` commits.
+
+        In buffered mode the row is handed to the background writer after the
+        commit (and discarded on rollback), so the caller's transaction carries
+        no audit INSERT. `durable=True`, AUDIT_WRITE_MODE=durable, or a writer
+        that is not running (scripts, tools) write the row in the caller's
+        transaction instead.
+        """
+        row = {
+            "user_id": user_id,
+            "event_type": event_type,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "details": details or {},
+            "created_at": datetime.now(UTC),
+        }
+        if durable or get_settings().audit_write_mode == "durable" or not get_audit_writer().running:
+            db.add(AuditLog(**row))
+            return
+        db.info.setdefault(_PENDING_KEY, []).append(row)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_pending_events(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    writer = get_audit_writer()
+    writer.enqueue(pending)
+    if not writer.running:
+        # Stopped between staging and commit: write through rather than strand the rows.
+        writer.flush()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_events(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import insert
+
+from app.core.config import get_settings
+from app.db.session import engine
+from app.models.entities import AuditLog
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """Bounded in-process buffer of audit rows drained by one background thread.
+
+    Rows are flushed as a single multi-row INSERT (executemany) once `batch_size`
+    rows are waiting or `flush_interval_seconds` has passed. When the buffer is
+    full, producers wait up to `backpressure_timeout_seconds` for space and the
+    row is dropped after that; both outcomes are counted.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        batch_size: int,
+        flush_interval_seconds: float,
+        backpressure_timeout_seconds: float,
+    ) -> None:
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.backpressure_timeout_seconds = backpressure_timeout_seconds
+        self._buffer: deque[dict[str, Any]] = deque()
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self.enqueued = 0
+        self.written = 0
+        self.flushes = 0
+        self.dropped = 0
+        self.backpressure_waits = 0
+        self.write_errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flush thread and drain whatever is still buffered."""
+        thread = self._thread
+        if thread is None:
+            return
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        thread.join()
+        self._thread = None
+        self.flush()
+
+    def enqueue(self, rows: list[dict[str, Any]]) -> None:
+        with self._condition:
+            for row in rows:
+                if len(self._buffer) >= self.capacity:
+                    self.backpressure_waits += 1
+                    self._condition.notify_all()
+                    self._condition.wait_for(
+                        lambda: len(self._buffer) < self.capacity, timeout=self.backpressure_timeout_seconds
+                    )
+                    if len(self._buffer) >= self.capacity:
+                        self.dropped += 1
+                        logger.warning("Audit buffer full; dropped %s event", row.get("event_type"))
+                        continue
+                self._buffer.append(row)
+                self.enqueued += 1
+            if len(self._buffer) >= self.batch_size:
+                self._condition.notify_all()
+
+    def flush(self) -> int:
+        """Write every buffered row now; returns the number written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._condition:
+                    batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                    self._condition.notify_all()
+                if not batch:
+                    return written
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(insert(AuditLog), batch)
+                except Exception:
+                    self.write_errors += 1
+                    self.dropped += len(batch)
+                    logger.exception("Audit flush failed; dropped %d events", len(batch))
+                    return written
+                written += len(batch)
+                self.written += len(batch)
+                self.flushes += 1
+
+    def snapshot(self) -> dict[str, int | bool]:
+        with self._condition:
+            return {
+                "running": self.running,
+                "buffered": len(self._buffer),
+                "capacity": self.capacity,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "flushes": self.flushes,
+                "dropped": self.dropped,
+                "backpressure_waits": self.backpressure_waits,
+                "write_errors": self.write_errors,
+            }
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.flush_interval_seconds
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopping or len(self._buffer) >= self.batch_size,
+                    timeout=max(deadline - time.monotonic(), 0.0),
+                )
+                if self._stopping:
+                    return
+            self.flush()
+            deadline = time.monotonic() + self.flush_interval_seconds
+
+
+@lru_cache
+def get_audit_writer() -> AuditWriter:
+    settings = get_settings()
+    return AuditWriter(
+        capacity=settings.audit_buffer_capacity,
+        batch_size=settings.audit_flush_batch_size,
+        flush_interval_seconds=settings.audit_flush_interval_seconds,
+        backpressure_timeout_seconds=settings.audit_backpressure_timeout_seconds,
+    )
@@ -1,23 +1,45 @@
 from __future__ import annotations
 
-from fastapi import HTTPException, status
+import logging
+from datetime import UTC, datetime
+
+from fastapi import BackgroundTasks, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.core.security import (
     create_access_token,
-    create_refresh_token,
     decode_token,
     hash_password,
-    verify_password,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
 )
+from app.db.session import SessionLocal
 from app.models.auth import TokenPair, UserCreate
 from app.models.entities import User
 from app.services.audit_service import AuditService
+from app.services.login_throttle_service import get_login_throttle
+from app.services.refresh_token_service import (
+    RefreshTokenReuseError,
+    RefreshTokenRevokedError,
+    RefreshTokenService,
+    get_revocation_index,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class AuthService:
-    def register(self, db: Session, payload: UserCreate) -> User:
+    async def register(self, db: Session, payload: UserCreate) -> User:
+        # Database work stays on the threadpool; only the scrypt wait happens on the event loop.
         email = payload.email.lower().strip()
+        await run_in_threadpool(self._ensure_email_available, db, email)
+        hashed_password = await hash_password_async(payload.password)
+        return await run_in_threadpool(self._create_user, db, email, hashed_password)
+
+    def _ensure_email_available(self, db: Session, email: str) -> None:
         existing = db.query(User).filter(User.email == email).first()
         if existing is not None:
             AuditService().log_event(
@@ -31,10 +53,10 @@ class AuthService:
             db.commit()
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
 
-        user = User(email=email, hashed_password=hash_password(payload.password))
+    def _create_user(self, db: Session, email: str, hashed_password: str) -> User:
+        user = User(email=email, hashed_password=hashed_password)
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        db.flush()
         AuditService().log_event(
             db,
             user_id=user.id,
@@ -46,9 +68,27 @@ class AuthService:
         db.commit()
         return user
 
-    def login(self, db: Session, email: str, password: str) -> TokenPair:
+    async def login(
+        self,
+        db: Session,
+        email: str,
+        password: str,
+        background_tasks: BackgroundTasks | None = None,
+        client_ip: str = "unknown",
+    ) -> TokenPair:
+        user = await run_in_threadpool(self._find_login_user, db, email, client_ip)
+        if not await verify_password_async(password, user.hashed_password):
+            await run_in_threadpool(self._reject_login, db, user, email, client_ip)
+        return await run_in_threadpool(self._complete_login, db, user, email, password, background_tasks)
+
+    def _find_login_user(self, db: Session, email: str, client_ip: str) -> User:
+        # Throttled attempts stop here: no user lookup, no scrypt, no audit row.
+        throttle = get_login_throttle()
+        throttle.ensure_allowed(db, email=email, client_ip=client_ip)
+
         user = db.query(User).filter(User.email == email.lower().strip()).first()
         if user is None:
+            throttle.record_failure(db, email=email, client_ip=client_ip)
             AuditService().log_event(
                 db,
                 user_id=None,
@@ -59,19 +99,31 @@ class AuthService:
             )
             db.commit()
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+        return user
 
-        if not verify_password(password, user.hashed_password):
-            AuditService().log_event(
-                db,
-                user_id=user.id,
-                event_type="auth_login_failed",
-                entity_type="user",
-                entity_id=user.id,
-                details={"reason": "invalid_password", "email": user.email},
-            )
-            db.commit()
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    def _reject_login(self, db: Session, user: User, email: str, client_ip: str) -> None:
+        get_login_throttle().record_failure(db, email=email, client_ip=client_ip)
+        AuditService().log_event(
+            db,
+            user_id=user.id,
+            event_type="auth_login_failed",
+            entity_type="user",
+            entity_id=user.id,
+            details={"reason": "invalid_password", "email": user.email},
+        )
+        db.commit()
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    def _complete_login(
+        self,
+        db: Session,
+        user: User,
+        email: str,
+        password: str,
+        background_tasks: BackgroundTasks | None,
+    ) -> TokenPair:
+        get_login_throttle().record_success(db, email=email)
+        refresh_token, _ = RefreshTokenService().issue(db, user_id=user.id)
         AuditService().log_event(
             db,
             user_id=user.id,
@@ -81,63 +133,59 @@ class AuthService:
             details={"email": user.email},
         )
         db.commit()
+        if background_tasks is not None and needs_rehash(user.hashed_password):
+            # The plaintext is only available now; upgrade after the response is sent.
+            background_tasks.add_task(self.rehash_password, user.id, user.hashed_password, password)
         return TokenPair(
             access_token=create_access_token(subject=user.id),
-            refresh_token=create_refresh_token(subject=user.id),
+            refresh_token=refresh_token,
         )
 
-    def refresh_access_token(self, db: Session, refresh_token: str) -> str:
+    def refresh_access_token(self, db: Session, refresh_token: str) -> TokenPair:
         try:
             payload = decode_token(refresh_token)
         except ValueError as exc:
-            AuditService().log_event(
-                db,
-                user_id=None,
-                event_type="auth_refresh_failed",
-                entity_type="token",
-                entity_id="unknown",
-                details={"reason": "decode_failed"},
-            )
-            db.commit()
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token") from exc
+            raise self._refresh_failed(db, reason="decode_failed", detail="Invalid refresh token") from exc
 
         if payload.get("type") != "refresh":
-            AuditService().log_event(
-                db,
-                user_id=None,
-                event_type="auth_refresh_failed",
-                entity_type="token",
-                entity_id="unknown",
-                details={"reason": "invalid_token_type"},
-            )
-            db.commit()
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
+            raise self._refresh_failed(db, reason="invalid_token_type", detail="Invalid token type")
 
         subject = payload.get("sub")
         if not isinstance(subject, str) or not subject:
-            AuditService().log_event(
-                db,
-                user_id=None,
-                event_type="auth_refresh_failed",
-                entity_type="token",
-                entity_id="unknown",
-                details={"reason": "invalid_subject"},
-            )
-            db.commit()
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject")
+            raise self._refresh_failed(db, reason="invalid_subject", detail="Invalid token subject")
 
-        user = db.query(User).filter(User.id == subject).first()
-        if user is None:
-            AuditService().log_event(
-                db,
-                user_id=None,
-                event_type="auth_refresh_failed",
-                entity_type="user",
-                entity_id=subject,
-                details={"reason": "user_not_found"},
-            )
-            db.commit()
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject")
+        jti = payload.get("jti")
+        if not isinstance(jti, str) or not jti:
+            raise self._refresh_failed(db, reason="missing_jti", detail="Invalid refresh token")
+
+        expires_at = datetime.fromtimestamp(payload["exp"], UTC)
+        service = RefreshTokenService()
+        revocations = get_revocation_index()
+        try:
+            # Revocation is answered from memory; the table is only read for already-revoked jtis.
+            if revocations.is_revoked(jti):
+                service.check_reuse(db, jti)
+                raise self._refresh_failed(db, reason="token_revoked", detail="Invalid refresh token", entity_id=jti)
+
+            user = db.query(User).filter(User.id == subject).first()
+            if user is None:
+                raise self._refresh_failed(
+                    db, reason="user_not_found", detail="Invalid token subject", entity_type="user", entity_id=subject
+                )
+
+            rotated = service.rotate(db, user_id=user.id, jti=jti, expires_at=expires_at)
+        except RefreshTokenRevokedError as exc:
+            # Logged out on another worker before this one synced: not reuse, nothing else to revoke.
+            error = self._refresh_failed(db, reason="token_revoked", detail="Invalid refresh token", entity_id=jti)
+            revocations.add(jti, expires_at)
+            raise error from exc
+        except RefreshTokenReuseError as exc:
+            # A rotated token came back: assume it leaked and end every session of the user.
+            error = self._refresh_failed(db, reason="token_reused", detail="Invalid refresh token", entity_id=jti)
+            for revoked_jti, revoked_expires_at in exc.revoked:
+                revocations.add(revoked_jti, revoked_expires_at)
+            revocations.add(jti, expires_at)
+            raise error from exc
 
         AuditService().log_event(
             db,
@@ -148,7 +196,88 @@ class AuthService:
             details={},
         )
         db.commit()
-        return create_access_token(subject=subject)
+        revocations.add(jti, expires_at)
+        return TokenPair(access_token=create_access_token(subject=subject), refresh_token=rotated)
+
+    def logout(self, db: Session, refresh_token: str, all_sessions: bool = False) -> None:
+        try:
+            payload = decode_token(refresh_token)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token") from exc
+        subject, jti = payload.get("sub"), payload.get("jti")
+        if payload.get("type") != "refresh" or not isinstance(subject, str) or not isinstance(jti, str):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+        expires_at = datetime.fromtimestamp(payload["exp"], UTC)
+        service = RefreshTokenService()
+        service.revoke(db, user_id=subject, jti=jti, expires_at=expires_at)
+        revoked = service.revoke_all(db, user_id=subject) if all_sessions else []
+        AuditService().log_event(
+            db,
+            user_id=subject if self.get_by_id(db, subject) is not None else None,
+            event_type="auth_logout",
+            entity_type="token",
+            entity_id=jti,
+            details={"all_sessions": all_sessions, "revoked": len(revoked) + 1},
+        )
+        db.commit()
+
+        revocations = get_revocation_index()
+        revocations.add(jti, expires_at)
+        for revoked_jti, revoked_expires_at in revoked:
+            revocations.add(revoked_jti, revoked_expires_at)
+
+    @staticmethod
+    def _refresh_failed(
+        db: Session,
+        reason: str,
+        detail: str,
+        entity_type: str = "token",
+        entity_id: str = "unknown",
+        user_id: str | None = None,
+    ) -> HTTPException:
+        AuditService().log_event(
+            db,
+            user_id=user_id,
+            event_type="auth_refresh_failed",
+            entity_type=entity_type,
+            entity_id=entity_id,
+            details={"reason": reason},
+        )
+        db.commit()
+        return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+    def rehash_password(self, user_id: str, previous_hash: str, password: str) -> bool:
+        """Re-derive a hash with the configured scrypt parameters.
+
+        The write only lands if the stored hash is still `previous_hash`, so a
+        concurrent password change is never overwritten.
+        """
+        try:
+            new_hash = hash_password(password)
+        except Exception:
+            logger.warning("Skipping password rehash for user %s", user_id, exc_info=True)
+            return False
+
+        with SessionLocal() as db:
+            result = db.execute(
+                update(User)
+                .where(User.id == user_id, User.hashed_password == previous_hash)
+                .values(hashed_password=new_hash)
+            )
+            if result.rowcount != 1:
+                db.rollback()
+                return False
+            AuditService().log_event(
+                db,
+                user_id=user_id,
+                event_type="auth_password_rehashed",
+                entity_type="user",
+                entity_id=user_id,
+                details={"previous_params": "$".join(previous_hash.split("$", 4)[1:4])},
+            )
+            db.commit()
+        return True
 
     def get_by_id(self, db: Session, user_id: str) -> User | None:
         return db.query(User).filter(User.id == user_id).first()
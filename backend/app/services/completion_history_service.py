@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.datetimes import as_utc
+from app.db.session import SessionLocal
+from app.models.entities import Completion, Habit, HabitType
+from app.models.habit import CompletionPublic
+
+_STREAM_BATCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class CompletionHistoryFilter:
+    user_id: str
+    habit_id: str | None = None
+    habit_type: HabitType | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+
+
+class CompletionHistoryService:
+    """Newest-first completion history with keyset pagination on ix_completion_user_time."""
+
+    def page(
+        self,
+        db: Session,
+        filters: CompletionHistoryFilter,
+        cursor: str | None,
+        limit: int,
+    ) -> tuple[list[CompletionPublic], str | None]:
+        stmt = self._query(filters)
+        if cursor:
+            created_at, completion_id = self.decode_cursor(cursor)
+            stmt = stmt.where(
+                or_(
+                    Completion.created_at < created_at,
+                    and_(Completion.created_at == created_at, Completion.id < completion_id),
+                )
+            )
+        rows = db.execute(stmt.limit(limit + 1)).all()
+        items = [self._to_public(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = self.encode_cursor(last.created_at, last.id)
+        return items, next_cursor
+
+    def stream_ndjson(self, filters: CompletionHistoryFilter) -> Iterator[bytes]:
+        """Yield one JSON line per completion from a server-side cursor.
+
+        Uses its own session because the response body is produced after the
+        request-scoped session has been closed.
+        """
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                self._query(filters).execution_options(stream_results=True, yield_per=_STREAM_BATCH_SIZE)
+            )
+            for row in result:
+                yield self._to_public(row).model_dump_json().encode("utf-8") + b"\n"
+        finally:
+            db.close()
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, completion_id: int) -> str:
+        raw = json.dumps([created_at.isoformat(), completion_id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[datetime, int]:
+        try:
+            created_at, completion_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return datetime.fromisoformat(created_at), int(completion_id)
+        except (ValueError, TypeError, binascii.Error, UnicodeError) as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+    @staticmethod
+    def _query(filters: CompletionHistoryFilter) -> Select:
+        stmt = (
+            select(
+                Completion.id,
+                Completion.habit_id,
+                Completion.user_id,
+                Completion.completed,
+                Completion.created_at,
+                Habit.type.label("habit_type"),
+            )
+            .join(Habit, Habit.id == Completion.habit_id)
+            .where(Completion.user_id == filters.user_id)
+            .order_by(Completion.created_at.desc(), Completion.id.desc())
+        )
+        if filters.habit_id is not None:
+            stmt = stmt.where(Completion.habit_id == filters.habit_id)
+        if filters.habit_type is not None:
+            stmt = stmt.where(Habit.type == filters.habit_type)
+        # Completion timestamps are written in UTC; align client offsets before comparing.
+        if filters.since is not None:
+            stmt = stmt.where(Completion.created_at >= as_utc(filters.since))
+        if filters.until is not None:
+            stmt = stmt.where(Completion.created_at < as_utc(filters.until))
+        return stmt
+
+    @staticmethod
+    def _to_public(row) -> CompletionPublic:
+        return CompletionPublic(
+            id=row.id,
+            habit_id=row.habit_id,
+            user_id=row.user_id,
+            completed=row.completed,
+            created_at=row.created_at,
+            habit_type=row.habit_type,
+        )
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import date, timedelta
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.upsert import insert_for
+from app.models.entities import Completion, CompletionDailyRollup, Habit, HabitType
+
+
+class CompletionRollupService:
+    """Per-user, per-day, per-type completion counts; history reads touch at most days x 3 rows."""
+
+    def increment(self, db: Session, user_id: str, day: date, counts: Mapping[HabitType, int]) -> None:
+        """One upsert adding `counts` in the database, so concurrent completions never lose or collide."""
+        rows = [
+            {"user_id": user_id, "day": day, "habit_type": HabitType(habit_type), "completed_count": count}
+            for habit_type, count in counts.items()
+            if count
+        ]
+        if not rows:
+            return
+        stmt = insert_for(db, CompletionDailyRollup).values(rows)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    CompletionDailyRollup.user_id,
+                    CompletionDailyRollup.day,
+                    CompletionDailyRollup.habit_type,
+                ],
+                set_={"completed_count": CompletionDailyRollup.completed_count + stmt.excluded.completed_count},
+            )
+        )
+
+    def daily_counts(self, db: Session, user_id: str, start: date, end: date) -> list[tuple[date, dict[HabitType, int]]]:
+        """Zero-filled counts for every day in [start, end]."""
+        rows = db.execute(
+            select(CompletionDailyRollup.day, CompletionDailyRollup.habit_type, CompletionDailyRollup.completed_count).where(
+                CompletionDailyRollup.user_id == user_id,
+                CompletionDailyRollup.day >= start,
+                CompletionDailyRollup.day <= end,
+            )
+        ).all()
+        by_day: dict[date, dict[HabitType, int]] = {}
+        for day, habit_type, count in rows:
+            by_day.setdefault(day, {})[HabitType(habit_type)] = count
+
+        days = []
+        day = start
+        while day <= end:
+            days.append((day, by_day.get(day, {})))
+            day += timedelta(days=1)
+        return days
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Recreate every rollup row with one INSERT ... SELECT ... GROUP BY."""
+        # Completions bucket by their UTC date (see `increment` callers); PostgreSQL's DATE()
+        # on a timestamptz would use the session TimeZone instead.
+        if db.get_bind().dialect.name == "postgresql":
+            day_expr = func.date(func.timezone("UTC", Completion.created_at))
+        else:
+            day_expr = func.date(Completion.created_at)
+        source = (
+            select(Completion.user_id, day_expr, Habit.type, func.count())
+            .join(Habit, Habit.id == Completion.habit_id)
+            .where(Completion.completed.is_(True))
+            .group_by(Completion.user_id, day_expr, Habit.type)
+        )
+        db.execute(delete(CompletionDailyRollup))
+        result = db.execute(
+            insert(CompletionDailyRollup).from_select(
+                ["user_id", "day", "habit_type", "completed_count"],
+                source,
+            )
+        )
+        return result.rowcount
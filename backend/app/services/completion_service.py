@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.models.entities import Completion, Habit
+from app.models.habit import HabitCompletionBatchItem, HabitCompletionBatchResult, HabitPublic
+from app.services.completion_policy_service import CompletionPolicyService
+from app.services.completion_rollup_service import CompletionRollupService
+from app.services.progression_service import ProgressionService
+from app.services.streak_service import StreakService
+
+
+class CompletionService:
+    def toggle(self, db: Session, habit: Habit, user_id: str, completed: bool) -> Completion:
+        """Record a completion toggle and keep the habit's derived state in the same transaction."""
+        now = datetime.now(UTC)
+        completion = self._record(habit=habit, user_id=user_id, completed=completed, now=now)
+        db.add(habit)
+        db.add(completion)
+        if completed:
+            StreakService().record_completions(db=db, user_id=user_id, habits=[habit], day=now.date())
+            CompletionRollupService().increment(db=db, user_id=user_id, day=now.date(), counts={habit.type: 1})
+        ProgressionService().apply_completion_delta(
+            db=db,
+            user_id=user_id,
+            habit_type=habit.type,
+            delta=1 if completed else -1,
+        )
+        return completion
+
+    def apply_batch(
+        self,
+        db: Session,
+        user_id: str,
+        items: Sequence[HabitCompletionBatchItem],
+    ) -> list[HabitCompletionBatchResult]:
+        """Apply many toggles with one habit lookup, one bulk insert and one progression write.
+
+        Items are evaluated in order against in-memory habit state, so repeating a habit
+        within one batch sees the effect of the earlier item.
+        """
+        habit_ids = {item.habit_id for item in items}
+        habits = {
+            habit.id: habit
+            for habit in db.query(Habit).filter(Habit.user_id == user_id, Habit.id.in_(habit_ids)).all()
+        }
+
+        now = datetime.now(UTC)
+        completions: list[Completion] = []
+        deltas: Counter = Counter()
+        results: list[HabitCompletionBatchResult] = []
+        for item in items:
+            habit = habits.get(item.habit_id)
+            if habit is None:
+                results.append(HabitCompletionBatchResult(habit_id=item.habit_id, status="not_found", message="Habit not found"))
+                continue
+            if habit.completed == item.completed:
+                results.append(self._result(habit, "unchanged"))
+                continue
+            try:
+                completions.append(self._record(habit=habit, user_id=user_id, completed=item.completed, now=now))
+            except HTTPException as exc:
+                results.append(self._result(habit, "rejected", message=str(exc.detail)))
+                continue
+            deltas[habit.type] += 1 if item.completed else -1
+            results.append(self._result(habit, "applied"))
+
+        if completions:
+            db.add_all(completions)
+            completed_habits = [habits[completion.habit_id] for completion in completions if completion.completed]
+            StreakService().record_completions(db=db, user_id=user_id, habits=completed_habits, day=now.date())
+            CompletionRollupService().increment(
+                db=db,
+                user_id=user_id,
+                day=now.date(),
+                counts=Counter(habit.type for habit in completed_habits),
+            )
+            ProgressionService().apply_completion_deltas(db=db, user_id=user_id, deltas=deltas)
+        return results
+
+    @staticmethod
+    def _record(habit: Habit, user_id: str, completed: bool, now: datetime) -> Completion:
+        if completed:
+            CompletionPolicyService().ensure_can_mark_completed(habit=habit, now=now)
+            habit.last_completed_at = now
+            habit.ever_completed = True
+        habit.completed = completed
+        return Completion(habit_id=habit.id, user_id=user_id, completed=completed, created_at=now)
+
+    @staticmethod
+    def _result(habit: Habit, status: str, message: str | None = None) -> HabitCompletionBatchResult:
+        # Snapshot now: later items in the same batch may toggle this habit again.
+        return HabitCompletionBatchResult(
+            habit_id=habit.id,
+            status=status,
+            message=message,
+            habit=HabitPublic.model_validate(habit),
+        )
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.entities import Habit, HabitSchedule
+from app.services.audit_service import AuditService
+from app.services.completion_policy_service import CompletionPolicyService
+
+
+@dataclass(frozen=True)
+class HabitResetRun:
+    daily_reset: int
+    recurring_reset: int
+    batches: int
+    elapsed_seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.daily_reset + self.recurring_reset) / max(self.elapsed_seconds, 1e-9)
+
+
+class HabitResetService:
+    """Clears `Habit.completed` once the schedule window that produced it has passed."""
+
+    def reset_due_habits(self, db: Session, now: datetime | None = None, batch_size: int = 500) -> HabitResetRun:
+        now = now or datetime.now(UTC)
+        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        cooldown_start = now - timedelta(hours=CompletionPolicyService.recurring_cooldown_hours)
+
+        started = time.perf_counter()
+        daily_reset, daily_batches = self._reset_in_batches(db, HabitSchedule.daily, day_start, batch_size)
+        recurring_reset, recurring_batches = self._reset_in_batches(db, HabitSchedule.recurring, cooldown_start, batch_size)
+        run = HabitResetRun(
+            daily_reset=daily_reset,
+            recurring_reset=recurring_reset,
+            batches=daily_batches + recurring_batches,
+            elapsed_seconds=time.perf_counter() - started,
+        )
+
+        if run.daily_reset or run.recurring_reset:
+            AuditService().log_event(
+                db,
+                user_id=None,
+                event_type="habit_reset_run",
+                entity_type="job",
+                entity_id="habit_reset",
+                details={
+                    "daily_reset": run.daily_reset,
+                    "recurring_reset": run.recurring_reset,
+                    "batches": run.batches,
+                    "elapsed_ms": round(run.elapsed_seconds * 1000, 2),
+                    "rows_per_sec": round(run.rows_per_second, 1),
+                },
+            )
+            db.commit()
+        return run
+
+    @staticmethod
+    def _reset_in_batches(db: Session, schedule: HabitSchedule, cutoff: datetime, batch_size: int) -> tuple[int, int]:
+        due = and_(
+            Habit.schedule == schedule,
+            Habit.completed.is_(True),
+            or_(Habit.last_completed_at.is_(None), Habit.last_completed_at < cutoff),
+        )
+        total = 0
+        batches = 0
+        while True:
+            # Bounded id batches keep each write transaction (and its lock) short.
+            ids = list(db.execute(select(Habit.id).where(due).limit(batch_size)).scalars())
+            if not ids:
+                return total, batches
+            result = db.execute(
+                update(Habit).where(Habit.id.in_(ids), due).values(completed=False).execution_options(synchronize_session=False)
+            )
+            db.commit()
+            # Rows toggled between the SELECT and the UPDATE no longer match `due`; count what changed.
+            total += result.rowcount
+            batches += 1
+
+
+def run_habit_reset_job() -> HabitResetRun:
+    db = SessionLocal()
+    try:
+        return HabitResetService().reset_due_habits(db, batch_size=get_settings().habit_reset_batch_size)
+    finally:
+        db.close()
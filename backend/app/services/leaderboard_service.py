@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.models.entities import Stats
+
+DIMENSIONS = ("total", "chakra", "vitality", "focus")
+_PENDING_KEY = "leaderboard_pending"
+
+
+@dataclass(frozen=True)
+class RankedEntry:
+    rank: int
+    user_id: str
+    xp: int
+
+
+class LeaderboardIndex:
+    """In-memory sorted index per XP dimension.
+
+    Each dimension keeps a list of `(-xp, user_id)` keys in ascending order, so the
+    leader is first and rank-of-user is a bisect. Updates replace one key in place.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._keys: dict[str, list[tuple[int, str]]] = {dimension: [] for dimension in DIMENSIONS}
+        self._scores: dict[str, dict[str, int]] = {dimension: {} for dimension in DIMENSIONS}
+
+    def rebuild(self, db: Session) -> int:
+        keys: dict[str, list[tuple[int, str]]] = {dimension: [] for dimension in DIMENSIONS}
+        scores: dict[str, dict[str, int]] = {dimension: {} for dimension in DIMENSIONS}
+        rows = db.execute(
+            select(Stats.user_id, Stats.chakra_xp, Stats.vitality_xp, Stats.focus_xp).execution_options(yield_per=5000)
+        )
+        for user_id, chakra_xp, vitality_xp, focus_xp in rows:
+            for dimension, xp in self._dimension_values(chakra_xp, vitality_xp, focus_xp).items():
+                keys[dimension].append((-xp, user_id))
+                scores[dimension][user_id] = xp
+        for dimension_keys in keys.values():
+            dimension_keys.sort()
+        with self._lock:
+            self._keys = keys
+            self._scores = scores
+        return len(scores["total"])
+
+    def update(self, user_id: str, chakra_xp: int, vitality_xp: int, focus_xp: int) -> None:
+        with self._lock:
+            for dimension, xp in self._dimension_values(chakra_xp, vitality_xp, focus_xp).items():
+                keys = self._keys[dimension]
+                scores = self._scores[dimension]
+                previous = scores.get(user_id)
+                if previous == xp:
+                    continue
+                if previous is not None:
+                    del keys[bisect_left(keys, (-previous, user_id))]
+                insort(keys, (-xp, user_id))
+                scores[user_id] = xp
+
+    def top(self, dimension: str, limit: int) -> list[RankedEntry]:
+        with self._lock:
+            head = self._keys[dimension][:limit]
+        return [RankedEntry(rank=index + 1, user_id=user_id, xp=-neg_xp) for index, (neg_xp, user_id) in enumerate(head)]
+
+    def rank_of(self, dimension: str, user_id: str) -> RankedEntry | None:
+        with self._lock:
+            xp = self._scores[dimension].get(user_id)
+            if xp is None:
+                return None
+            position = bisect_left(self._keys[dimension], (-xp, user_id))
+        return RankedEntry(rank=position + 1, user_id=user_id, xp=xp)
+
+    def size(self, dimension: str) -> int:
+        return len(self._keys[dimension])
+
+    @staticmethod
+    def _dimension_values(chakra_xp: int, vitality_xp: int, focus_xp: int) -> dict[str, int]:
+        return {
+            "total": chakra_xp + vitality_xp + focus_xp,
+            "chakra": chakra_xp,
+            "vitality": vitality_xp,
+            "focus": focus_xp,
+        }
+
+
+@lru_cache
+def get_leaderboard() -> LeaderboardIndex:
+    return LeaderboardIndex()
+
+
+def stage_leaderboard_update(db: Session, stats: Stats) -> None:
+    """Queue a score change; it reaches the index only if the session commits."""
+    db.info.setdefault(_PENDING_KEY, {})[stats.user_id] = (stats.chakra_xp, stats.vitality_xp, stats.focus_xp)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_updates(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    leaderboard = get_leaderboard()
+    for user_id, (chakra_xp, vitality_xp, focus_xp) in pending.items():
+        leaderboard.update(user_id, chakra_xp, vitality_xp, focus_xp)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_updates(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
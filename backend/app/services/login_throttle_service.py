@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+
+import sqlalchemy as sa
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.datetimes import as_utc
+from app.db.session import SessionLocal
+from app.db.upsert import insert_for
+from app.models.entities import LoginFailure
+
+# Rows updated slightly before the last watermark are re-read so commits that
+# land out of timestamp order on another worker are not missed.
+_SYNC_OVERLAP_SECONDS = 5.0
+
+
+class LoginThrottle:
+    """Failed-login scores per account and per client IP with exponential decay.
+
+    Each key holds `(score, updated_at)`; a failure adds 1 after decaying the old
+    score by half every `half_life_seconds`. `login_failures` carries the same
+    scores across workers. Logins are answered from memory: `sync` pulls rows
+    written by other workers every `LOGIN_THROTTLE_SYNC_SECONDS`, and the table is
+    read on the login path only for keys within one failure of their limit.
+    """
+
+    def __init__(
+        self,
+        account_max_failures: int,
+        ip_max_failures: int,
+        half_life_seconds: float,
+        max_entries: int = 100_000,
+    ) -> None:
+        self.account_max_failures = account_max_failures
+        self.ip_max_failures = ip_max_failures
+        self.half_life_seconds = half_life_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._scores: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._watermark: datetime | None = None
+        self.rejected = 0
+        self.failures = 0
+        self.db_reads = 0
+
+    def ensure_allowed(self, db: Session, email: str, client_ip: str, now: float | None = None) -> None:
+        """Raise 429 with Retry-After when either key is over its threshold."""
+        now = time.time() if now is None else now
+        limits = self._limits(email, client_ip)
+        retry_after = self._retry_after(limits, now)
+        if retry_after is None:
+            near_limit = self._near_limit(limits, now)
+            if near_limit:
+                # Another worker may have recorded the failure that tips this key over.
+                self._sync_from_db(db, near_limit, now)
+                retry_after = self._retry_after(limits, now)
+        if retry_after is not None:
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many failed login attempts. Try again later.",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+    def record_failure(self, db: Session, email: str, client_ip: str, now: float | None = None) -> None:
+        """Bump both keys; the upsert joins the caller's transaction.
+
+        The new score is computed in SQL from the stored row (decayed to `now`,
+        plus one), so failures recorded by different workers add up instead of
+        the last writer's local view replacing them.
+        """
+        now = time.time() if now is None else now
+        updated_at = datetime.fromtimestamp(now, UTC)
+        with self._lock:
+            self.failures += 1
+        keys = list(self._limits(email, client_ip))
+        stmt = insert_for(db, LoginFailure).values(
+            [{"key": key, "score": 1.0, "updated_at": updated_at} for key in keys]
+        )
+        rows = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[LoginFailure.key],
+                set_={
+                    "score": LoginFailure.score * self._decay_factor(db, updated_at) + 1.0,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            ).returning(LoginFailure.key, LoginFailure.score)
+        )
+        with self._lock:
+            for key, score in rows:
+                self._store(key, score, now)
+
+    def record_success(self, db: Session, email: str) -> None:
+        key = self._account_key(email)
+        with self._lock:
+            self._scores.pop(key, None)
+        db.execute(delete(LoginFailure).where(LoginFailure.key == key))
+
+    def sync(self, db: Session, now: float | None = None) -> int:
+        """Merge scores recorded by other workers since the last sync; the first call loads every row."""
+        now = time.time() if now is None else now
+        stmt = select(LoginFailure.key, LoginFailure.score, LoginFailure.updated_at)
+        if self._watermark is not None:
+            stmt = stmt.where(LoginFailure.updated_at >= self._watermark - timedelta(seconds=_SYNC_OVERLAP_SECONDS))
+        watermark = datetime.fromtimestamp(now, UTC)
+        merged = self._merge(db.execute(stmt), now)
+        self._watermark = watermark
+        return merged
+
+    def purge(self, db: Session, now: float | None = None) -> int:
+        """Drop rows that have decayed to noise (below 1/64 of a failure)."""
+        now = time.time() if now is None else now
+        cutoff = datetime.fromtimestamp(now - self.half_life_seconds * 6, UTC)
+        result = db.execute(delete(LoginFailure).where(LoginFailure.updated_at < cutoff))
+        db.commit()
+        return result.rowcount or 0
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "tracked_keys": len(self._scores),
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "db_reads": self.db_reads,
+            }
+
+    def _limits(self, email: str, client_ip: str) -> dict[str, int]:
+        return {self._account_key(email): self.account_max_failures, f"ip:{client_ip}": self.ip_max_failures}
+
+    @staticmethod
+    def _account_key(email: str) -> str:
+        return f"account:{email.lower().strip()}"
+
+    def _retry_after(self, limits: dict[str, int], now: float) -> int | None:
+        retry_after = None
+        with self._lock:
+            for key, limit in limits.items():
+                if limit <= 0:
+                    continue
+                # Back-to-back failures decay slightly between writes, so compare
+                # against the score rounded to whole attempts.
+                threshold = limit - 0.5
+                score = self._decayed(self._scores.get(key), now)
+                if score >= threshold:
+                    # Seconds until the score decays back below the threshold.
+                    wait = math.ceil(self.half_life_seconds * math.log2(score / threshold)) + 1
+                    retry_after = max(retry_after or 0, wait)
+        return retry_after
+
+    def _decay_factor(self, db: Session, now: datetime) -> sa.ColumnElement[float]:
+        """`0.5 ** (seconds since the row's updated_at / half_life)` as a SQL expression."""
+        at = sa.literal(now, LoginFailure.__table__.c.updated_at.type)
+        if db.get_bind().dialect.name == "postgresql":
+            elapsed = sa.func.greatest(sa.extract("epoch", at - LoginFailure.updated_at), 0.0)
+        else:
+            # SQLite: scalar max() clamps clock skew between workers to no decay.
+            elapsed = sa.func.max((sa.func.julianday(at) - sa.func.julianday(LoginFailure.updated_at)) * 86400.0, 0.0)
+        return sa.func.power(0.5, elapsed / self.half_life_seconds)
+
+    def _near_limit(self, limits: dict[str, int], now: float) -> list[str]:
+        """Keys one more failure would block; only these are worth a read on the login path."""
+        with self._lock:
+            return [
+                key
+                for key, limit in limits.items()
+                if limit > 0 and self._decayed(self._scores.get(key), now) + 1.0 >= limit - 0.5
+            ]
+
+    def _sync_from_db(self, db: Session, keys: list[str], now: float) -> None:
+        with self._lock:
+            self.db_reads += 1
+        rows = db.execute(
+            select(LoginFailure.key, LoginFailure.score, LoginFailure.updated_at).where(LoginFailure.key.in_(keys))
+        )
+        self._merge(rows, now)
+
+    def _merge(self, rows: Iterable[tuple[str, float, datetime]], now: float) -> int:
+        merged = 0
+        with self._lock:
+            for key, score, updated_at in rows:
+                stored = self._decayed((score, as_utc(updated_at).timestamp()), now)
+                if stored > self._decayed(self._scores.get(key), now):
+                    self._store(key, stored, now)
+                    merged += 1
+        return merged
+
+    def _decayed(self, entry: tuple[float, float] | None, now: float) -> float:
+        if entry is None:
+            return 0.0
+        score, updated_at = entry
+        return score * 0.5 ** (max(now - updated_at, 0.0) / self.half_life_seconds)
+
+    def _store(self, key: str, score: float, now: float) -> None:
+        self._scores[key] = (score, now)
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.max_entries:
+            self._scores.popitem(last=False)
+
+
+@lru_cache
+def get_login_throttle() -> LoginThrottle:
+    settings = get_settings()
+    return LoginThrottle(
+        account_max_failures=settings.login_throttle_account_max_failures,
+        ip_max_failures=settings.login_throttle_ip_max_failures,
+        half_life_seconds=settings.login_throttle_half_life_seconds,
+    )
+
+
+def run_login_failure_sync_job() -> int:
+    db = SessionLocal()
+    try:
+        return get_login_throttle().sync(db)
+    finally:
+        db.close()
+
+
+def run_login_failure_purge_job() -> int:
+    db = SessionLocal()
+    try:
+        return get_login_throttle().purge(db)
+    finally:
+        db.close()
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.entities import User
+
+# Rows updated slightly before the last watermark are re-read so commits that
+# land out of timestamp order on another worker are not missed.
+_SYNC_OVERLAP_SECONDS = 5.0
+_EXISTS_CHUNK = 500
+
+
+class PrincipalCache:
+    """TTL + LRU cache of verified principals keyed by access-token `jti`.
+
+    Entries are detached `User` snapshots; callers re-attach them with
+    `Session.merge(load=False)`, which costs no SELECT.
+
+    ORM flushes in this process evict a user's entries immediately. Changes
+    made elsewhere (other workers, bulk `UPDATE`/`DELETE` statements) are
+    picked up by `sync`, which runs every `PRINCIPAL_CACHE_SYNC_SECONDS`, so
+    that interval bounds how long a stale principal can be served.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        self._by_subject: dict[str, set[str]] = {}
+        self._watermark = datetime.now(UTC)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, db: Session, jti: str, subject: str) -> User | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(jti)
+            if entry is None or entry[0] <= now or entry[1].id != subject:
+                if entry is not None:
+                    self._remove(jti)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(jti)
+            self.hits += 1
+            snapshot = entry[1]
+        return db.merge(snapshot, load=False)
+
+    def put(self, jti: str, user: User, token_expires_at: float | None = None) -> None:
+        if not self.enabled:
+            return
+        ttl = self.ttl_seconds
+        if token_expires_at is not None:
+            ttl = min(ttl, token_expires_at - time.time())
+        if ttl <= 0:
+            return
+        snapshot = User(
+            id=user.id,
+            email=user.email,
+            hashed_password=user.hashed_password,
+            is_admin=user.is_admin,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+        make_transient_to_detached(snapshot)
+        with self._lock:
+            if jti in self._entries:
+                self._remove(jti)
+            self._entries[jti] = (time.monotonic() + ttl, snapshot)
+            self._by_subject.setdefault(user.id, set()).add(jti)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_subject(self, subject: str) -> None:
+        with self._lock:
+            for jti in self._by_subject.pop(subject, set()):
+                self._entries.pop(jti, None)
+                self.invalidations += 1
+
+    def sync(self, db: Session) -> int:
+        """Evict users updated or deleted since the last sync; returns the number of users evicted."""
+        now = datetime.now(UTC)
+        since = self._watermark - timedelta(seconds=_SYNC_OVERLAP_SECONDS)
+        changed = set(db.scalars(select(User.id).where(User.updated_at >= since)))
+        with self._lock:
+            cached = list(self._by_subject)
+        # Deleted rows leave no `updated_at` behind, so check the cached subjects still exist.
+        existing: set[str] = set()
+        for start in range(0, len(cached), _EXISTS_CHUNK):
+            chunk = cached[start : start + _EXISTS_CHUNK]
+            existing.update(db.scalars(select(User.id).where(User.id.in_(chunk))))
+        stale = (changed & set(cached)) | (set(cached) - existing)
+        for subject in stale:
+            self.invalidate_subject(subject)
+        self._watermark = now
+        return len(stale)
+
+    def snapshot(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, jti: str) -> None:
+        _, user = self._entries.pop(jti)
+        jtis = self._by_subject.get(user.id)
+        if jtis is not None:
+            jtis.discard(jti)
+            if not jtis:
+                del self._by_subject[user.id]
+
+
+@lru_cache
+def get_principal_cache() -> PrincipalCache:
+    settings = get_settings()
+    return PrincipalCache(
+        max_entries=settings.principal_cache_max_entries,
+        ttl_seconds=settings.principal_cache_ttl_seconds,
+    )
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_deleted_user(_mapper, _connection, target: User) -> None:
+    get_principal_cache().invalidate_subject(target.id)
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_updated_user(_mapper, _connection, target: User) -> None:
+    # Entries are full snapshots of the row, so any changed column makes them stale.
+    get_principal_cache().invalidate_subject(target.id)
+
+
+def run_principal_cache_sync_job() -> int:
+    db = SessionLocal()
+    try:
+        return get_principal_cache().sync(db)
+    finally:
+        db.close()
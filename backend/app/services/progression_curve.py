@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_right
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.core.config import get_settings
+from app.models.entities import HabitType
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AuraTier:
+    level: int
+    label: str
+    min_xp: int
+
+
+@dataclass(frozen=True)
+class ProgressionCurve:
+    version: str
+    xp_weights: Mapping[HabitType, int]
+    tiers: tuple[AuraTier, ...]
+    _thresholds: tuple[int, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.tiers:
+            raise ValueError("Progression curve needs at least one tier.")
+        thresholds = tuple(tier.min_xp for tier in self.tiers)
+        if thresholds[0] != 0:
+            raise ValueError("The first progression tier must start at 0 XP.")
+        if any(later <= earlier for earlier, later in zip(thresholds, thresholds[1:])):
+            raise ValueError("Progression tier thresholds must be strictly increasing.")
+        missing = set(HabitType) - set(self.xp_weights)
+        if missing:
+            raise ValueError(f"Missing XP weights for: {sorted(item.value for item in missing)}")
+        object.__setattr__(self, "_thresholds", thresholds)
+
+    def tier_for(self, total_xp: int) -> AuraTier:
+        # Precompiled thresholds: O(log n) in the number of tiers.
+        return self.tiers[max(0, bisect_right(self._thresholds, total_xp) - 1)]
+
+    def xp_for(self, habit_type: HabitType) -> int:
+        return self.xp_weights[HabitType(habit_type)]
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> ProgressionCurve:
+        weights = {HabitType(key): int(value) for key, value in data["xp_weights"].items()}
+        tiers = tuple(
+            AuraTier(level=index, label=str(tier["label"]), min_xp=int(tier["min_xp"]))
+            for index, tier in enumerate(sorted(data["tiers"], key=lambda item: int(item["min_xp"])))
+        )
+        return cls(version=str(data["version"]), xp_weights=weights, tiers=tiers)
+
+
+DEFAULT_CURVE = ProgressionCurve(
+    version="v1",
+    xp_weights={HabitType.chakra: 120, HabitType.vitality: 120, HabitType.focus: 120},
+    tiers=(
+        AuraTier(level=0, label="Dormant", min_xp=0),
+        AuraTier(level=1, label="Stirring", min_xp=240),
+        AuraTier(level=2, label="Radiant", min_xp=600),
+        AuraTier(level=3, label="Transcendent", min_xp=1200),
+    ),
+)
+
+
+class _CurveCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._curve = DEFAULT_CURVE
+        self._override: ProgressionCurve | None = None
+        self._source: tuple[str, float] | None = None
+        self._checked_path = ""
+        self._next_check = 0.0
+
+    def get(self) -> ProgressionCurve:
+        if self._override is not None:
+            return self._override
+        settings = get_settings()
+        if not settings.progression_curve_path:
+            return DEFAULT_CURVE
+        now = time.monotonic()
+        if now < self._next_check and self._checked_path == settings.progression_curve_path:
+            return self._curve
+        with self._lock:
+            self._checked_path = settings.progression_curve_path
+            self._next_check = now + settings.progression_curve_reload_seconds
+            self._reload_if_changed(settings.progression_curve_path)
+        return self._curve
+
+    def set_override(self, curve: ProgressionCurve | None) -> None:
+        self._override = curve
+
+    def _reload_if_changed(self, path: str) -> None:
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            logger.warning("Progression curve file %s is unreadable; keeping version %s", path, self._curve.version)
+            return
+        if self._source == (path, mtime):
+            return
+        try:
+            curve = ProgressionCurve.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+        except (ValueError, KeyError, TypeError) as exc:
+            logger.warning("Rejected progression curve %s: %s", path, exc)
+            return
+        self._curve = curve
+        self._source = (path, mtime)
+
+
+_cache = _CurveCache()
+
+
+def get_progression_curve() -> ProgressionCurve:
+    """Active curve; re-reads PROGRESSION_CURVE_PATH at most every PROGRESSION_CURVE_RELOAD_SECONDS."""
+    return _cache.get()
+
+
+def set_progression_curve(curve: ProgressionCurve | None) -> None:
+    """Hot-swap the in-process curve; `None` falls back to the configured file or the default."""
+    _cache.set_override(curve)
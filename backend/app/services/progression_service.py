@@ -1,56 +1,141 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from datetime import UTC, datetime
 
+from sqlalchemy import case, func, update
 from sqlalchemy.orm import Session
 
+from app.db.upsert import insert_for
 from app.models.entities import AvatarState, Completion, Habit, HabitType, Stats
 from app.services.audit_service import AuditService
+from app.services.leaderboard_service import stage_leaderboard_update
+from app.services.progression_curve import ProgressionCurve, get_progression_curve
+
+_XP_FIELDS = {
+    HabitType.chakra: "chakra_xp",
+    HabitType.vitality: "vitality_xp",
+    HabitType.focus: "focus_xp",
+}
 
 
 class ProgressionService:
-    xp_per_completion = 120
+    def __init__(self, curve: ProgressionCurve | None = None) -> None:
+        self.curve = curve or get_progression_curve()
+
+    def apply_completion_delta(
+        self,
+        db: Session,
+        user_id: str,
+        habit_type: HabitType,
+        delta: int,
+    ) -> tuple[Stats, AvatarState]:
+        """Apply a signed completion delta (+1 complete, -1 uncomplete) to the persisted counters.
+
+        Cost is independent of the user's completion history; `recompute_user_progression`
+        remains the reconciliation path when counters are suspected to have drifted.
+        """
+        return self.apply_completion_deltas(db=db, user_id=user_id, deltas={HabitType(habit_type): delta})
+
+    def apply_completion_deltas(
+        self,
+        db: Session,
+        user_id: str,
+        deltas: Mapping[HabitType, int],
+    ) -> tuple[Stats, AvatarState]:
+        """Apply several per-type deltas with a single stats/avatar write.
+
+        The counters are bumped by one atomic `UPDATE ... SET xp = xp + delta`, so
+        concurrent toggles from several devices all land; the row lock it takes
+        also serializes the avatar write that follows.
+        """
+        db.execute(
+            insert_for(db, Stats)
+            .values(user_id=user_id, chakra_xp=0, vitality_xp=0, focus_xp=0)
+            .on_conflict_do_nothing(index_elements=[Stats.user_id])
+        )
+        stats = db.get(Stats, user_id)
+        previous_xp = self._xp_tuple(stats)
+        values = {}
+        for habit_type, delta in deltas.items():
+            habit_type = HabitType(habit_type)
+            if delta:
+                column = getattr(Stats, _XP_FIELDS[habit_type])
+                incremented = column + delta * self.curve.xp_for(habit_type)
+                values[column.key] = case((incremented < 0, 0), else_=incremented)
+        if values:
+            db.execute(update(Stats).where(Stats.user_id == user_id).values(**values))
+            stats = db.get(Stats, user_id, populate_existing=True)
+        return self._persist(db, user_id, stats, previous_xp)
+
+    def get_user_progression(self, db: Session, user_id: str) -> tuple[Stats, AvatarState]:
+        """Read persisted progression without writing; users with no rows get unsaved defaults."""
+        stats = db.get(Stats, user_id)
+        if stats is None:
+            stats = Stats(user_id=user_id, chakra_xp=0, vitality_xp=0, focus_xp=0, updated_at=datetime.now(UTC))
+        avatar = db.get(AvatarState, user_id)
+        if avatar is None:
+            aura_level, aura_label = self._derive_aura(0)
+            avatar = AvatarState(
+                user_id=user_id,
+                aura_level=aura_level,
+                aura_label=aura_label,
+                avatar_type="neutral",
+                updated_at=datetime.now(UTC),
+            )
+        return stats, avatar
 
     def recompute_user_progression(self, db: Session, user_id: str) -> tuple[Stats, AvatarState]:
+        """Rebuild the per-type counters from the full completion history."""
+        counts = self.net_completion_counts(db, [user_id]).get(user_id, {})
+        xp_values, _, _ = self.progression_values(counts)
+
+        stats = self._get_or_create_stats(db, user_id)
+        previous_xp = self._xp_tuple(stats)
+        for field, value in xp_values.items():
+            setattr(stats, field, value)
+        return self._persist(db, user_id, stats, previous_xp)
+
+    @staticmethod
+    def net_completion_counts(db: Session, user_ids: Sequence[str]) -> dict[str, dict[HabitType, int]]:
+        """Net completions (completed minus uncompleted) per user and habit type in one GROUP BY."""
+        net_expr = func.sum(case((Completion.completed.is_(True), 1), else_=-1))
         rows = (
-            db.query(Habit.type)
-            .join(Completion, Completion.habit_id == Habit.id)
+            db.query(Completion.user_id, Habit.type, net_expr)
+            .join(Habit, Completion.habit_id == Habit.id)
             .filter(
-                Completion.user_id == user_id,
-                Completion.completed.is_(True),
-                Habit.user_id == user_id,
+                Completion.user_id.in_(user_ids),
+                Habit.user_id == Completion.user_id,
             )
+            .group_by(Completion.user_id, Habit.type)
             .all()
         )
+        counts: dict[str, dict[HabitType, int]] = {}
+        for user_id, habit_type, net in rows:
+            counts.setdefault(user_id, {})[HabitType(habit_type)] = max(0, int(net or 0))
+        return counts
 
-        chakra_count = 0
-        vitality_count = 0
-        focus_count = 0
-        for row in rows:
-            if row[0] == HabitType.chakra:
-                chakra_count += 1
-            elif row[0] == HabitType.vitality:
-                vitality_count += 1
-            elif row[0] == HabitType.focus:
-                focus_count += 1
-
-        chakra_xp = chakra_count * self.xp_per_completion
-        vitality_xp = vitality_count * self.xp_per_completion
-        focus_xp = focus_count * self.xp_per_completion
-        total_xp = chakra_xp + vitality_xp + focus_xp
-
-        stats = db.query(Stats).filter(Stats.user_id == user_id).first()
-        if stats is None:
-            stats = Stats(user_id=user_id)
-        previous_stats = (stats.chakra_xp, stats.vitality_xp, stats.focus_xp)
+    def progression_values(self, counts: dict[HabitType, int]) -> tuple[dict[str, int], int, str]:
+        """Map net completion counts to Stats column values and the derived aura."""
+        xp_values = {
+            field: counts.get(habit_type, 0) * self.curve.xp_for(habit_type) for habit_type, field in _XP_FIELDS.items()
+        }
+        aura_level, aura_label = self._derive_aura(sum(xp_values.values()))
+        return xp_values, aura_level, aura_label
 
-        stats.chakra_xp = chakra_xp
-        stats.vitality_xp = vitality_xp
-        stats.focus_xp = focus_xp
+    def _persist(
+        self,
+        db: Session,
+        user_id: str,
+        stats: Stats,
+        previous_xp: tuple[int, int, int],
+    ) -> tuple[Stats, AvatarState]:
+        chakra_xp, vitality_xp, focus_xp = self._xp_tuple(stats)
+        total_xp = chakra_xp + vitality_xp + focus_xp
         stats.updated_at = datetime.now(UTC)
 
         aura_level, aura_label = self._derive_aura(total_xp)
-        avatar = db.query(AvatarState).filter(AvatarState.user_id == user_id).first()
+        avatar = db.get(AvatarState, user_id)
         if avatar is None:
             avatar = AvatarState(user_id=user_id)
         previous_avatar = (avatar.aura_level, avatar.aura_label)
@@ -61,7 +146,8 @@ class ProgressionService:
 
         db.add(stats)
         db.add(avatar)
-        if previous_stats != (chakra_xp, vitality_xp, focus_xp) or previous_avatar != (aura_level, aura_label):
+        stage_leaderboard_update(db, stats)
+        if previous_xp != (chakra_xp, vitality_xp, focus_xp) or previous_avatar != (aura_level, aura_label):
             AuditService().log_event(
                 db,
                 user_id=user_id,
@@ -75,17 +161,23 @@ class ProgressionService:
                     "aura_level": aura_level,
                     "aura_label": aura_label,
                     "total_xp": total_xp,
+                    "curve_version": self.curve.version,
                 },
             )
 
         return stats, avatar
 
     @staticmethod
-    def _derive_aura(total_xp: int) -> tuple[int, str]:
-        if total_xp >= 1200:
-            return 3, "Transcendent"
-        if total_xp >= 600:
-            return 2, "Radiant"
-        if total_xp >= 240:
-            return 1, "Stirring"
-        return 0, "Dormant"
+    def _get_or_create_stats(db: Session, user_id: str) -> Stats:
+        stats = db.get(Stats, user_id)
+        if stats is None:
+            stats = Stats(user_id=user_id, chakra_xp=0, vitality_xp=0, focus_xp=0)
+        return stats
+
+    @staticmethod
+    def _xp_tuple(stats: Stats) -> tuple[int, int, int]:
+        return stats.chakra_xp, stats.vitality_xp, stats.focus_xp
+
+    def _derive_aura(self, total_xp: int) -> tuple[int, str]:
+        tier = self.curve.tier_for(total_xp)
+        return tier.level, tier.label
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import Any
+
+from app.core.config import get_settings
+from app.services.audit_writer import get_audit_writer
+
+# Keys beyond the cap (random paths, address sprays) are folded into one row.
+_OVERFLOW_KEY = ("*", "*", "*")
+
+
+class BlockedRequestAudit:
+    """In-memory tally of rate-limited requests, written as audit summaries.
+
+    `record` runs on the request path and only bumps a counter per
+    `(client, method, path)`; `flush` turns each key into one
+    `rate_limit_blocked` row carrying the count and first/last time seen.
+    With `sample_rate > 0` a fraction of raw events is kept as well.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, max_keys: int = 10_000) -> None:
+        self.sample_rate = sample_rate
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._counts: dict[tuple[str, str, str], list[float]] = {}
+        self._samples: list[dict[str, Any]] = []
+        self.recorded = 0
+        self.sampled = 0
+        self.overflowed = 0
+        self.rows_written = 0
+
+    def record(self, client: str, method: str, path: str, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        key = (client, method, path)
+        with self._lock:
+            self.recorded += 1
+            entry = self._counts.get(key)
+            if entry is None:
+                if len(self._counts) >= self.max_keys:
+                    self.overflowed += 1
+                    key = _OVERFLOW_KEY
+                    entry = self._counts.get(key)
+                if entry is None:
+                    entry = self._counts[key] = [0, now, now]
+            entry[0] += 1
+            entry[2] = now
+            if self.sample_rate > 0 and len(self._samples) < self.max_keys and random.random() < self.sample_rate:
+                self.sampled += 1
+                self._samples.append(
+                    self._row(client, {"path": path, "method": method, "sample_rate": self.sample_rate}, now)
+                )
+
+    def flush(self) -> int:
+        """Hand the tallies to the audit writer; returns the number of rows."""
+        with self._lock:
+            counts, self._counts = self._counts, {}
+            samples, self._samples = self._samples, []
+        rows = samples + [
+            self._row(
+                client,
+                {
+                    "path": path,
+                    "method": method,
+                    "count": int(count),
+                    "first_seen": datetime.fromtimestamp(first_seen, UTC).isoformat(),
+                    "last_seen": datetime.fromtimestamp(last_seen, UTC).isoformat(),
+                },
+                last_seen,
+            )
+            for (client, method, path), (count, first_seen, last_seen) in counts.items()
+        ]
+        if not rows:
+            return 0
+        writer = get_audit_writer()
+        writer.enqueue(rows)
+        if not writer.running:
+            writer.flush()
+        with self._lock:
+            self.rows_written += len(rows)
+        return len(rows)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "pending_keys": len(self._counts),
+                "pending_samples": len(self._samples),
+                "recorded": self.recorded,
+                "sampled": self.sampled,
+                "overflowed": self.overflowed,
+                "rows_written": self.rows_written,
+            }
+
+    @staticmethod
+    def _row(client: str, details: dict[str, Any], at: float) -> dict[str, Any]:
+        return {
+            "user_id": None,
+            "event_type": "rate_limit_blocked",
+            "entity_type": "request",
+            "entity_id": client,
+            "details": details,
+            "created_at": datetime.fromtimestamp(at, UTC),
+        }
+
+
+@lru_cache
+def get_blocked_request_audit() -> BlockedRequestAudit:
+    settings = get_settings()
+    return BlockedRequestAudit(
+        sample_rate=settings.rate_limit_audit_sample_rate,
+        max_keys=settings.rate_limit_audit_max_keys,
+    )
+
+
+def run_rate_limit_audit_job() -> int:
+    return get_blocked_request_audit().flush()
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from uuid import uuid4
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.datetimes import as_utc
+from app.core.security import create_refresh_token
+from app.db.session import SessionLocal
+from app.models.entities import RefreshToken
+
+# Rows revoked slightly before the last watermark are re-read so commits that
+# land out of timestamp order on another worker are not missed.
+_SYNC_OVERLAP_SECONDS = 5.0
+
+
+class RevocationIndex:
+    """In-memory set of revoked, not-yet-expired refresh-token jtis.
+
+    Only revocations inside the refresh lifetime are kept, so the set stays
+    small; expired tokens are already rejected by the JWT `exp` check.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._revoked: dict[str, float] = {}
+        self._watermark: datetime | None = None
+        self.lookups = 0
+        self.hits = 0
+
+    def rebuild(self, db: Session) -> int:
+        now = datetime.now(UTC)
+        rows = db.execute(
+            select(RefreshToken.jti, RefreshToken.expires_at).where(
+                RefreshToken.revoked_at.is_not(None), RefreshToken.expires_at > now
+            )
+        )
+        revoked = {jti: as_utc(expires_at).timestamp() for jti, expires_at in rows}
+        with self._lock:
+            self._revoked = revoked
+            self._watermark = now
+        return len(revoked)
+
+    def sync(self, db: Session) -> int:
+        """Pull revocations committed by other workers since the last sync."""
+        if self._watermark is None:
+            return self.rebuild(db)
+        now = datetime.now(UTC)
+        since = self._watermark - timedelta(seconds=_SYNC_OVERLAP_SECONDS)
+        rows = list(
+            db.execute(select(RefreshToken.jti, RefreshToken.expires_at).where(RefreshToken.revoked_at >= since))
+        )
+        with self._lock:
+            for jti, expires_at in rows:
+                self._revoked[jti] = as_utc(expires_at).timestamp()
+            self._watermark = now
+        return len(rows)
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        with self._lock:
+            self._revoked[jti] = as_utc(expires_at).timestamp()
+
+    def is_revoked(self, jti: str) -> bool:
+        with self._lock:
+            self.lookups += 1
+            revoked = jti in self._revoked
+            if revoked:
+                self.hits += 1
+            return revoked
+
+    def prune(self, now: float | None = None) -> int:
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [jti for jti, expires_at in self._revoked.items() if expires_at <= now]
+            for jti in expired:
+                del self._revoked[jti]
+        return len(expired)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {"revoked_jtis": len(self._revoked), "lookups": self.lookups, "revoked_hits": self.hits}
+
+
+@lru_cache
+def get_revocation_index() -> RevocationIndex:
+    return RevocationIndex()
+
+
+class RefreshTokenReuseError(Exception):
+    """An already-rotated refresh token was presented again."""
+
+    def __init__(self, jti: str, revoked: list[tuple[str, datetime]]) -> None:
+        super().__init__(jti)
+        self.revoked = revoked
+
+
+class RefreshTokenRevokedError(Exception):
+    """A refresh token revoked by logout (never rotated) was presented."""
+
+
+class RefreshTokenService:
+    def issue(self, db: Session, user_id: str, jti: str | None = None) -> tuple[str, RefreshToken]:
+        """Mint a refresh token and stage its row; the caller commits."""
+        settings = get_settings()
+        now = datetime.now(UTC)
+        record = RefreshToken(
+            jti=jti or str(uuid4()),
+            user_id=user_id,
+            issued_at=now,
+            expires_at=now + timedelta(minutes=settings.jwt_refresh_token_expire_minutes),
+        )
+        db.add(record)
+        return create_refresh_token(subject=user_id, jti=record.jti), record
+
+    def rotate(self, db: Session, user_id: str, jti: str, expires_at: datetime) -> str:
+        """Revoke `jti` and issue its successor in the caller's transaction.
+
+        The conditional UPDATE makes rotation single-use even when two workers
+        race on the same token. Reuse of a rotated token revokes every live
+        refresh token of the user and raises `RefreshTokenReuseError`; a token
+        that was only logged out raises `RefreshTokenRevokedError` and revokes
+        nothing else. This worker's index may simply not have synced the logout yet.
+        """
+        successor_jti = str(uuid4())
+        now = datetime.now(UTC)
+        result = db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.jti == jti, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now, replaced_by=successor_jti)
+        )
+        if result.rowcount != 1:
+            record = db.get(RefreshToken, jti, populate_existing=True)
+            if record is not None:
+                if record.replaced_by is None:
+                    raise RefreshTokenRevokedError(jti)
+                raise RefreshTokenReuseError(jti, self.revoke_all(db, user_id))
+            # Issued before rotation was tracked: record it as spent.
+            db.add(
+                RefreshToken(
+                    jti=jti,
+                    user_id=user_id,
+                    issued_at=now,
+                    expires_at=expires_at,
+                    revoked_at=now,
+                    replaced_by=successor_jti,
+                )
+            )
+        token, _ = self.issue(db, user_id, jti=successor_jti)
+        return token
+
+    def check_reuse(self, db: Session, jti: str) -> None:
+        """Raise `RefreshTokenReuseError` if a revoked `jti` had been rotated.
+
+        Only called on the rejection path, so legitimate refreshes never pay for it.
+        """
+        record = db.get(RefreshToken, jti)
+        if record is not None and record.replaced_by is not None:
+            raise RefreshTokenReuseError(jti, self.revoke_all(db, record.user_id))
+
+    def revoke(self, db: Session, user_id: str, jti: str, expires_at: datetime) -> None:
+        now = datetime.now(UTC)
+        result = db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.jti == jti, RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        if result.rowcount == 0 and db.get(RefreshToken, jti) is None:
+            db.add(RefreshToken(jti=jti, user_id=user_id, issued_at=now, expires_at=expires_at, revoked_at=now))
+
+    def revoke_all(self, db: Session, user_id: str) -> list[tuple[str, datetime]]:
+        now = datetime.now(UTC)
+        live = list(
+            db.execute(
+                select(RefreshToken.jti, RefreshToken.expires_at).where(
+                    RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None)
+                )
+            )
+        )
+        if live:
+            db.execute(
+                update(RefreshToken)
+                .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=now)
+            )
+        return [(jti, expires_at) for jti, expires_at in live]
+
+    def purge_expired(self, db: Session, now: datetime | None = None) -> int:
+        now = now or datetime.now(UTC)
+        result = db.execute(delete(RefreshToken).where(RefreshToken.expires_at <= now))
+        db.commit()
+        get_revocation_index().prune(now.timestamp())
+        return result.rowcount or 0
+
+
+def run_refresh_token_sync_job() -> int:
+    db = SessionLocal()
+    try:
+        return get_revocation_index().sync(db)
+    finally:
+        db.close()
+
+
+def run_refresh_token_purge_job() -> int:
+    db = SessionLocal()
+    try:
+        return RefreshTokenService().purge_expired(db)
+    finally:
+        db.close()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.db.upsert import insert_for
+from app.models.entities import Habit, HabitStreak, UserStreak
+
+
+def advance_streak(current: int, best: int, last_day: date | None, day: date) -> tuple[int, int, date | None]:
+    """Fold one completion day into a (current, best, last_day) streak state.
+
+    Repeat completions on the same day are no-ops; a gap of more than one day restarts
+    the run. The backfill tool replays history through this same function.
+    """
+    if last_day is not None and day <= last_day:
+        return current, best, last_day
+    if last_day is not None and day == last_day + timedelta(days=1):
+        current += 1
+    else:
+        current = 1
+    return current, max(best, current), day
+
+
+def effective_current(current: int, last_day: date | None, today: date) -> int:
+    # A streak whose last day is before yesterday is already broken, even if no write has reset it.
+    if last_day is None or last_day < today - timedelta(days=1):
+        return 0
+    return current
+
+
+class StreakService:
+    def record_completions(self, db: Session, user_id: str, habits: Iterable[Habit], day: date) -> None:
+        """Advance the per-habit and per-user streaks for completions made on `day`.
+
+        Missing rows are created with INSERT ... ON CONFLICT DO NOTHING and the rows
+        are then read back `FOR UPDATE`, so two devices completing at once neither
+        collide on the first insert nor advance from the same stale state.
+        """
+        habits_by_id = {habit.id: habit for habit in habits}
+        if not habits_by_id:
+            return
+
+        db.execute(
+            insert_for(db, HabitStreak)
+            .values(
+                [
+                    {"habit_id": habit_id, "user_id": user_id, "current_streak": 0, "best_streak": 0}
+                    for habit_id in habits_by_id
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[HabitStreak.habit_id])
+        )
+        db.execute(
+            insert_for(db, UserStreak)
+            .values(user_id=user_id, current_streak=0, best_streak=0)
+            .on_conflict_do_nothing(index_elements=[UserStreak.user_id])
+        )
+
+        habit_streaks = (
+            db.query(HabitStreak)
+            .filter(HabitStreak.habit_id.in_(habits_by_id))
+            .with_for_update()
+            .populate_existing()
+            .all()
+        )
+        for habit_streak in habit_streaks:
+            self._advance(habit_streak, day)
+
+        user_streak = (
+            db.query(UserStreak).filter(UserStreak.user_id == user_id).with_for_update().populate_existing().one()
+        )
+        self._advance(user_streak, day)
+
+    def get_user_streak(self, db: Session, user_id: str, today: date) -> tuple[int, int]:
+        user_streak = db.get(UserStreak, user_id)
+        if user_streak is None:
+            return 0, 0
+        return effective_current(user_streak.current_streak, user_streak.last_completed_day, today), user_streak.best_streak
+
+    def list_habit_streaks(self, db: Session, user_id: str, today: date) -> list[tuple[str, int, int]]:
+        rows = db.query(HabitStreak).filter(HabitStreak.user_id == user_id).all()
+        return [
+            (row.habit_id, effective_current(row.current_streak, row.last_completed_day, today), row.best_streak)
+            for row in rows
+        ]
+
+    @staticmethod
+    def _advance(row: HabitStreak | UserStreak, day: date) -> None:
+        row.current_streak, row.best_streak, row.last_completed_day = advance_streak(
+            row.current_streak,
+            row.best_streak,
+            row.last_completed_day,
+            day,
+        )
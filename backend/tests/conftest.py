@@ -10,12 +10,21 @@ BACKEND_ROOT = Path(__file__).resolve().parents[1]
 ALEMBIC_INI_PATH = BACKEND_ROOT / "alembic.ini"
 
 os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DB_PATH.as_posix()}"
+# The suite shares one client address; keep the global limiter out of the way of functional tests.
+os.environ.setdefault("RATE_LIMIT_REQUESTS", "100000")
+# Same routes as the built-in policies, with budgets the suite's many logins cannot hit.
+os.environ.setdefault("RATE_LIMIT_POLICIES_PATH", str(Path(__file__).resolve().parent / "rate_limit_policies.json"))
+
+
+def _remove_test_db() -> None:
+    # WAL mode leaves -wal/-shm sidecars next to the database file.
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{TEST_DB_PATH}{suffix}").unlink(missing_ok=True)
 
 
 @pytest.fixture(scope="session", autouse=True)
 def migrated_test_db() -> None:
-    if TEST_DB_PATH.exists():
-        TEST_DB_PATH.unlink()
+    _remove_test_db()
 
     alembic_cfg = Config(str(ALEMBIC_INI_PATH))
     alembic_cfg.set_main_option("script_location", str(BACKEND_ROOT / "alembic"))
@@ -23,3 +32,8 @@ def migrated_test_db() -> None:
 
     command.upgrade(alembic_cfg, "head")
     yield
+
+    from app.db.session import engine
+
+    engine.dispose()
+    _remove_test_db()
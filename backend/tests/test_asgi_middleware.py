@@ -0,0 +1,77 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.rate_limit import RateLimitMiddleware, get_policy_rate_limiter
+from app.core.security_headers import SecurityHeadersMiddleware
+from app.main import app
+
+
+def _stream(_):
+    async def chunks():
+        for index in range(3):
+            yield f"chunk-{index}\n".encode()
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+def _framed(_):
+    return PlainTextResponse("ok", headers={"X-Frame-Options": "SAMEORIGIN", "X-Custom": "kept"})
+
+
+_inner = Starlette(
+    routes=[Route("/stream", _stream), Route("/framed", _framed)],
+    middleware=[Middleware(SecurityHeadersMiddleware), Middleware(RateLimitMiddleware)],
+)
+
+
+def test_app_stack_has_no_base_http_middleware() -> None:
+    assert not any(issubclass(item.cls, BaseHTTPMiddleware) for item in app.user_middleware)
+
+
+def test_streaming_responses_pass_through_with_headers() -> None:
+    with TestClient(_inner) as client:
+        with client.stream("GET", "/stream") as response:
+            assert [line for line in response.iter_lines() if line] == ["chunk-0", "chunk-1", "chunk-2"]
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["referrer-policy"] == "no-referrer"
+
+
+def test_security_headers_replace_route_values() -> None:
+    with TestClient(_inner) as client:
+        response = client.get("/framed")
+    assert response.headers.get_list("x-frame-options") == ["DENY"]
+    assert response.headers["x-custom"] == "kept"
+
+
+def test_rejections_short_circuit_before_the_app(monkeypatch) -> None:
+    monkeypatch.setattr(get_policy_rate_limiter().limiters["default"], "limit", 0)
+    with TestClient(_inner) as client:
+        response = client.get("/stream")
+    assert response.status_code == 429
+    assert response.json()["code"] == "rate_limited"
+    assert response.headers["x-frame-options"] == "DENY"
+
+
+def test_blocking_backends_are_checked_off_the_event_loop(monkeypatch) -> None:
+    limiter = get_policy_rate_limiter()
+    original = limiter.check
+    loops = []
+
+    def check(*args, **kwargs):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(limiter, "blocking", True)
+    monkeypatch.setattr(limiter, "check", check)
+    with TestClient(_inner) as client:
+        assert client.get("/framed").status_code == 200
+    assert loops == [None]
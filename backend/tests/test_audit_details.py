@@ -0,0 +1,109 @@
+import json
+import random
+import string
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.db.session import SessionLocal
+from app.db.types import decode_json_details, encode_json_details
+from app.main import app
+from app.models.entities import AuditLog
+from app.services.audit_service import field_diff
+from app.services.audit_writer import get_audit_writer
+
+
+def _auth_headers(client: TestClient, email: str) -> dict[str, str]:
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert register.status_code == 201
+
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert login.status_code == 200
+    token = login.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _apply_edits(old: str, edits: list) -> str:
+    rebuilt = old
+    for offset, removed, inserted in reversed(edits):
+        assert rebuilt[offset : offset + len(removed)] == removed
+        rebuilt = rebuilt[:offset] + inserted + rebuilt[offset + len(removed) :]
+    return rebuilt
+
+
+def test_field_diff_records_only_edited_spans() -> None:
+    old = "a" * 500 + " original " + "b" * 500
+    new = "a" * 500 + " revised " + "b" * 500
+    diff = field_diff(
+        {"notes": old, "status": "active", "title": "Same"},
+        {"notes": new, "status": "done", "title": "Same"},
+    )
+
+    assert set(diff) == {"notes", "status"}
+    assert diff["status"] == {"from": "active", "to": "done"}
+    assert _apply_edits(old, diff["notes"]["edits"]) == new
+
+
+def test_field_diff_is_linear_on_repetitive_text() -> None:
+    old = "ab" * 200_000
+    new = "ab" * 100_000 + "X" + "ab" * 100_000
+    diff = field_diff({"notes": old}, {"notes": new})
+    assert diff["notes"]["edits"] == [[200_000, "", "X"]]
+    assert _apply_edits(old, diff["notes"]["edits"]) == new
+    # Repeated spans next to the edit are never double-counted by prefix and suffix.
+    assert field_diff({"notes": "a" * 200}, {"notes": "a" * 201})["notes"]["edits"] == [[200, "", "a"]]
+
+
+def test_details_encoding_compresses_large_payloads_and_reads_legacy_json() -> None:
+    payload = {"notes": "lorem ipsum " * 200}
+    encoded = encode_json_details(payload)
+    assert encoded.startswith("z:")
+    assert len(encoded) < len(json.dumps(payload)) / 10
+    assert decode_json_details(encoded) == payload
+    assert decode_json_details('{"reason":"user_not_found"}') == {"reason": "user_not_found"}
+    assert decode_json_details("") == {}
+
+
+def test_quest_edit_audit_is_an_order_of_magnitude_smaller() -> None:
+    rng = random.Random(7)
+    notes = "".join(rng.choice(string.ascii_letters + " ") for _ in range(2000))
+    edited = notes[:1000] + "CHANGED" + notes[1007:]
+
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "audit-details@example.com")
+        quest = client.post("/api/v1/quests", headers=headers, json={"title": "Long notes", "notes": notes}).json()
+        update = client.patch(f"/api/v1/quests/{quest['id']}", headers=headers, json={"notes": edited})
+        assert update.status_code == 200
+        get_audit_writer().flush()
+
+    legacy_size = len(
+        json.dumps(
+            {
+                "title": "Long notes",
+                "status": "active",
+                "notes": edited,
+                "previous": {"title": "Long notes", "status": "active", "notes": notes},
+            },
+            separators=(",", ":"),
+            sort_keys=True,
+        )
+    )
+    with SessionLocal() as db:
+        stored = db.execute(
+            text("SELECT details FROM audit_logs WHERE event_type = 'quest_updated' AND entity_id = :quest_id"),
+            {"quest_id": str(quest["id"])},
+        ).scalar_one()
+        assert len(stored) * 10 <= legacy_size
+
+        entry = (
+            db.query(AuditLog)
+            .filter(AuditLog.event_type == "quest_updated", AuditLog.entity_id == str(quest["id"]))
+            .one()
+        )
+        assert _apply_edits(notes, entry.details["changes"]["notes"]["edits"]) == edited
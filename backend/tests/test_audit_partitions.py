@@ -0,0 +1,90 @@
+import gzip
+import json
+from datetime import UTC, datetime
+
+from sqlalchemy import create_engine, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.db import models  # noqa: F401
+from app.db.base import Base
+from app.models.entities import AuditLog
+from app.services.audit_partition_service import AuditPartitionService
+from app.services.audit_query_service import AuditQueryFilter, AuditQueryService
+
+
+def _insert_events(engine, created_at: datetime, count: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            insert(AuditLog),
+            [
+                {
+                    "user_id": None,
+                    "event_type": "partition_test",
+                    "entity_type": "test",
+                    "entity_id": str(index),
+                    "details": "{}",
+                    "created_at": created_at,
+                }
+                for index in range(count)
+            ],
+        )
+
+
+def test_sqlite_rotation_and_archive_then_drop(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{(tmp_path / 'audit.db').as_posix()}")
+    Base.metadata.create_all(bind=engine)
+    service = AuditPartitionService(engine=engine, archive_dir=tmp_path / "archive", retention_months=2)
+
+    _insert_events(engine, datetime(2026, 7, 20, tzinfo=UTC), 3)
+    assert service.run_maintenance(now=datetime(2026, 8, 1, 0, 5, tzinfo=UTC)).rotated == ["audit_logs_p202607"]
+    _insert_events(engine, datetime(2026, 8, 10, tzinfo=UTC), 2)
+    assert service.run_maintenance(now=datetime(2026, 9, 1, 0, 5, tzinfo=UTC)).rotated == ["audit_logs_p202608"]
+    _insert_events(engine, datetime(2026, 10, 2, tzinfo=UTC), 1)
+
+    run = service.run_maintenance(now=datetime(2026, 10, 18, tzinfo=UTC))
+    # September had no rows, so there is nothing to rotate; July is past the two-month retention.
+    assert run.rotated == []
+    assert run.archived == ["audit_logs_p202607"]
+    assert run.rows_archived == 3
+
+    tables = set(inspect(engine).get_table_names())
+    assert "audit_logs_p202607" not in tables
+    assert "audit_logs_p202608" in tables
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(AuditLog)).scalar_one() == 1
+    assert {index["name"] for index in inspect(engine).get_indexes("audit_logs")} >= {"ix_audit_user_time"}
+
+    with gzip.open(tmp_path / "archive" / "audit_logs_p202607.ndjson.gz", "rt", encoding="utf-8") as handle:
+        archived = [json.loads(line) for line in handle]
+    assert [row["entity_id"] for row in archived] == ["0", "1", "2"]
+    assert archived[0]["event_type"] == "partition_test"
+
+
+def test_sqlite_queries_read_across_partitions(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{(tmp_path / 'audit.db').as_posix()}")
+    Base.metadata.create_all(bind=engine)
+    service = AuditPartitionService(engine=engine, archive_dir=tmp_path / "archive", retention_months=0)
+    _insert_events(engine, datetime(2026, 7, 20, tzinfo=UTC), 3)
+    service.run_maintenance(now=datetime(2026, 8, 1, 0, 5, tzinfo=UTC))
+    _insert_events(engine, datetime(2026, 8, 10, tzinfo=UTC), 2)
+    service.run_maintenance(now=datetime(2026, 9, 1, 0, 5, tzinfo=UTC))
+    _insert_events(engine, datetime(2026, 10, 2, tzinfo=UTC), 1)
+
+    queries = AuditQueryService()
+    with Session(engine) as db:
+        months = []
+        items, cursor = queries.page(db, AuditQueryFilter(event_type="partition_test"), cursor=None, limit=4)
+        months += [item.created_at.month for item in items]
+        items, cursor = queries.page(db, AuditQueryFilter(event_type="partition_test"), cursor=cursor, limit=4)
+        months += [item.created_at.month for item in items]
+        assert months == [10, 8, 8, 7, 7, 7] and cursor is None
+        # Rotation recreates audit_logs without restarting its ids.
+        ids = [item.id for item in queries.iter_rows(db, AuditQueryFilter())]
+        assert ids == [6, 5, 4, 3, 2, 1]
+
+        august = AuditQueryFilter(since=datetime(2026, 8, 1, tzinfo=UTC), until=datetime(2026, 9, 1, tzinfo=UTC))
+        assert len(list(queries.iter_rows(db, august))) == 2
+        # August's partition may still hold September stragglers; July's cannot, so it is left out.
+        recent = AuditQueryFilter(since=datetime(2026, 9, 15, tzinfo=UTC))
+        assert [table.name for table in queries._tables(db, recent)] == ["audit_logs_p202608", "audit_logs"]
+        assert len(list(queries.iter_rows(db, recent))) == 1
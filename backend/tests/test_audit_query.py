@@ -0,0 +1,83 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.entities import User
+from app.services.audit_writer import get_audit_writer
+
+
+def _auth_headers(client: TestClient, email: str) -> dict[str, str]:
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert register.status_code == 201
+
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert login.status_code == 200
+    token = login.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _set_admin(email: str, is_admin: bool) -> None:
+    with SessionLocal() as db:
+        db.query(User).filter(User.email == email).one().is_admin = is_admin
+        db.commit()
+
+
+def test_audit_query_requires_admin() -> None:
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "audit-reader@example.com")
+        response = client.get("/api/v1/audit/logs", headers=headers)
+        assert response.status_code == 403
+        assert response.json()["code"] == "forbidden"
+
+        _set_admin("audit-reader@example.com", True)
+        assert client.get("/api/v1/audit/logs", headers=headers).status_code == 200
+        # Revocation applies to tokens already issued, cached principals included.
+        _set_admin("audit-reader@example.com", False)
+        assert client.get("/api/v1/audit/logs", headers=headers).status_code == 403
+
+
+def test_audit_query_pages_with_keyset_cursor_and_exports_ndjson() -> None:
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "audit-admin@example.com")
+        _set_admin("audit-admin@example.com", True)
+        user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+        for _ in range(2):
+            relogin = client.post(
+                "/api/v1/auth/login",
+                json={"email": "audit-admin@example.com", "password": "StrongPass123"},
+            )
+            assert relogin.status_code == 200
+        get_audit_writer().flush()
+
+        params = {"user_id": user_id, "event_type": "auth_login_success", "limit": 2}
+        first = client.get("/api/v1/audit/logs", headers=headers, params=params)
+        assert first.status_code == 200
+        first_page = first.json()
+        assert len(first_page["items"]) == 2
+        assert first_page["next_cursor"]
+        assert first_page["items"][0]["details"] == {"email": "audit-admin@example.com"}
+
+        second = client.get(
+            "/api/v1/audit/logs",
+            headers=headers,
+            params={**params, "cursor": first_page["next_cursor"]},
+        ).json()
+        assert len(second["items"]) == 1
+        assert second["next_cursor"] is None
+        ids = [item["id"] for item in first_page["items"] + second["items"]]
+        assert ids == sorted(ids, reverse=True)
+
+        export = client.get("/api/v1/audit/logs", headers=headers, params={**params, "format": "ndjson"})
+        assert export.headers["content-type"].startswith("application/x-ndjson")
+        assert [json.loads(line)["id"] for line in export.text.splitlines()] == ids
+
+        bad_cursor = client.get("/api/v1/audit/logs", headers=headers, params={"cursor": "not-a-cursor"})
+        assert bad_cursor.status_code == 400
@@ -0,0 +1,72 @@
+from datetime import UTC, datetime
+
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.entities import AuditLog
+from app.services.audit_service import AuditService
+from app.services.audit_writer import AuditWriter, get_audit_writer
+
+
+def _row(entity_id: str) -> dict:
+    return {
+        "user_id": None,
+        "event_type": "writer_test",
+        "entity_type": "test",
+        "entity_id": entity_id,
+        "details": "{}",
+        "created_at": datetime.now(UTC),
+    }
+
+
+def _count(entity_id: str) -> int:
+    with SessionLocal() as db:
+        return db.query(AuditLog).filter(AuditLog.entity_id == entity_id).count()
+
+
+def test_writer_batches_and_counts_drops_when_full() -> None:
+    writer = AuditWriter(capacity=3, batch_size=2, flush_interval_seconds=60, backpressure_timeout_seconds=0)
+    writer.enqueue([_row("writer-batch") for _ in range(5)])
+
+    snapshot = writer.snapshot()
+    assert snapshot["buffered"] == 3
+    assert snapshot["dropped"] == 2
+    assert snapshot["backpressure_waits"] == 2
+
+    assert writer.flush() == 3
+    assert writer.snapshot()["flushes"] == 2
+    assert _count("writer-batch") == 3
+
+
+def test_buffered_events_follow_the_session_outcome() -> None:
+    with TestClient(app):
+        writer = get_audit_writer()
+        assert writer.running
+
+        with SessionLocal() as db:
+            AuditService().log_event(
+                db, user_id=None, event_type="writer_test", entity_type="test", entity_id="writer-rollback"
+            )
+            db.rollback()
+        with SessionLocal() as db:
+            AuditService().log_event(
+                db, user_id=None, event_type="writer_test", entity_type="test", entity_id="writer-commit"
+            )
+            db.commit()
+        with SessionLocal() as db:
+            AuditService().log_event(
+                db,
+                user_id=None,
+                event_type="writer_test",
+                entity_type="test",
+                entity_id="writer-durable",
+                durable=True,
+            )
+            db.commit()
+        # Durable rows are part of the caller's transaction.
+        assert _count("writer-durable") == 1
+
+    # Lifespan shutdown drains the buffer.
+    assert _count("writer-commit") == 1
+    assert _count("writer-rollback") == 0
@@ -115,3 +115,33 @@ def test_refresh_fails_if_user_deleted() -> None:
             json={"refresh_token": refresh_token},
         )
         assert refresh_response.status_code == 401
+
+
+def test_login_rehashes_outdated_scrypt_parameters(monkeypatch) -> None:
+    from app.core.config import get_settings
+    from app.core.security import needs_rehash
+
+    with TestClient(app) as client:
+        register = client.post(
+            "/api/v1/auth/register",
+            json={"email": "rehash@example.com", "password": "StrongPass123"},
+        )
+        assert register.status_code == 201
+
+        monkeypatch.setattr(get_settings(), "password_scrypt_n", 2**12)
+        login = client.post(
+            "/api/v1/auth/login",
+            json={"email": "rehash@example.com", "password": "StrongPass123"},
+        )
+        assert login.status_code == 200
+
+        with SessionLocal() as db:
+            stored = db.query(User).filter(User.email == "rehash@example.com").one().hashed_password
+        assert stored.startswith("scrypt$4096$8$1$")
+        assert not needs_rehash(stored)
+
+        relogin = client.post(
+            "/api/v1/auth/login",
+            json={"email": "rehash@example.com", "password": "StrongPass123"},
+        )
+        assert relogin.status_code == 200
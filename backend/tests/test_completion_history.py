@@ -0,0 +1,82 @@
+import json
+from datetime import UTC, datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def _auth_headers(client: TestClient, email: str) -> dict[str, str]:
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert register.status_code == 201
+
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert login.status_code == 200
+    token = login.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_completion_history_keyset_pages_filters_and_streams() -> None:
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "history-owner@example.com")
+        other_headers = _auth_headers(client, "history-other@example.com")
+
+        habit_ids = []
+        for index, habit_type in enumerate(["CHAKRA", "FOCUS", "FOCUS", "VITALITY", "CHAKRA"]):
+            create = client.post(
+                "/api/v1/habits",
+                headers=headers,
+                json={"title": f"History {index}", "description": "Log", "type": habit_type, "schedule": "ONE_OFF"},
+            )
+            habit_ids.append(create.json()["id"])
+        batch = client.post(
+            "/api/v1/habits/completions:batch",
+            headers=headers,
+            json={"items": [{"habit_id": habit_id, "completed": True} for habit_id in habit_ids]},
+        )
+        assert batch.status_code == 200
+
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            page = client.get("/api/v1/habits/completions", headers=headers, params=params)
+            assert page.status_code == 200
+            body = page.json()
+            seen.extend(item["id"] for item in body["items"])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        assert len(seen) == 5
+        assert seen == sorted(seen, reverse=True)
+
+        focus = client.get("/api/v1/habits/completions", headers=headers, params={"type": "FOCUS"})
+        assert {item["habit_type"] for item in focus.json()["items"]} == {"FOCUS"}
+        assert len(focus.json()["items"]) == 2
+
+        single = client.get("/api/v1/habits/completions", headers=headers, params={"habit_id": habit_ids[0]})
+        assert [item["habit_id"] for item in single.json()["items"]] == [habit_ids[0]]
+
+        future = (datetime.now(UTC) + timedelta(hours=1)).isoformat()
+        empty = client.get("/api/v1/habits/completions", headers=headers, params={"since": future})
+        assert empty.json()["items"] == []
+
+        stream = client.get("/api/v1/habits/completions", headers=headers, params={"format": "ndjson"})
+        assert stream.status_code == 200
+        assert stream.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in stream.text.splitlines()]
+        assert [line["id"] for line in lines] == seen
+
+        foreign = client.get("/api/v1/habits/completions", headers=other_headers)
+        assert foreign.json()["items"] == []
+
+        bad_cursor = client.get("/api/v1/habits/completions", headers=headers, params={"cursor": "not-a-cursor"})
+        assert bad_cursor.status_code == 400
@@ -131,3 +131,28 @@ def test_recurring_habit_blocks_completion_during_cooldown() -> None:
             json={"completed": True},
         )
         assert second_complete.status_code == 409
+
+
+def test_policy_uses_denormalized_completion_state() -> None:
+    from datetime import UTC, datetime, timedelta
+
+    import pytest
+    from fastapi import HTTPException
+
+    from app.models.entities import Habit, HabitSchedule
+    from app.services.completion_policy_service import CompletionPolicyService
+
+    policy = CompletionPolicyService()
+    now = datetime(2026, 5, 10, 12, 0, tzinfo=UTC)
+
+    daily = Habit(schedule=HabitSchedule.daily, ever_completed=True, last_completed_at=now - timedelta(days=1))
+    policy.ensure_can_mark_completed(habit=daily, now=now)
+    daily.last_completed_at = (now - timedelta(hours=1)).replace(tzinfo=None)
+    with pytest.raises(HTTPException):
+        policy.ensure_can_mark_completed(habit=daily, now=now)
+
+    recurring = Habit(schedule=HabitSchedule.recurring, ever_completed=True, last_completed_at=now - timedelta(hours=7))
+    policy.ensure_can_mark_completed(habit=recurring, now=now)
+
+    one_off = Habit(schedule=HabitSchedule.one_off, ever_completed=False, last_completed_at=None)
+    policy.ensure_can_mark_completed(habit=one_off, now=now)
@@ -0,0 +1,129 @@
+from datetime import UTC, datetime
+
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.entities import CompletionDailyRollup, User
+from app.services.completion_rollup_service import CompletionRollupService
+
+
+def _auth_headers(client: TestClient, email: str) -> dict[str, str]:
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert register.status_code == 201
+
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert login.status_code == 200
+    token = login.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_weekly_and_heatmap_read_from_rollups() -> None:
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "rollup-user@example.com")
+        habit_ids = []
+        for habit_type in ("CHAKRA", "CHAKRA", "VITALITY"):
+            create = client.post(
+                "/api/v1/habits",
+                headers=headers,
+                json={"title": "Rollup", "description": "Count me", "type": habit_type, "schedule": "DAILY"},
+            )
+            habit_ids.append(create.json()["id"])
+
+        single = client.patch(f"/api/v1/habits/{habit_ids[0]}/completion", headers=headers, json={"completed": True})
+        assert single.status_code == 200
+        batch = client.post(
+            "/api/v1/habits/completions:batch",
+            headers=headers,
+            json={"items": [{"habit_id": habit_id, "completed": True} for habit_id in habit_ids[1:]]},
+        )
+        assert batch.status_code == 200
+
+        weekly = client.get("/api/v1/progression/weekly", headers=headers)
+        assert weekly.status_code == 200
+        days = weekly.json()["days"]
+        assert len(days) == 7
+        today = days[-1]
+        assert today["day"] == datetime.now(UTC).date().isoformat()
+        assert (today["chakra"], today["vitality"], today["focus"], today["total"]) == (2, 1, 0, 3)
+        assert all(day["total"] == 0 for day in days[:-1])
+
+        heatmap = client.get("/api/v1/progression/heatmap", headers=headers)
+        assert len(heatmap.json()["days"]) == 365
+        assert heatmap.json()["days"][-1]["total"] == 3
+
+        too_long = client.get("/api/v1/progression/heatmap", headers=headers, params={"days": 1000})
+        assert too_long.status_code == 422
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "rollup-user@example.com").one()
+
+        def snapshot() -> set[tuple]:
+            return {
+                (row.day, row.habit_type, row.completed_count)
+                for row in db.query(CompletionDailyRollup).filter(CompletionDailyRollup.user_id == user.id)
+            }
+
+        incremental = snapshot()
+        CompletionRollupService.rebuild(db)
+        db.commit()
+        db.expire_all()
+        assert snapshot() == incremental
+    finally:
+        db.close()
+
+
+def test_concurrent_increments_for_a_new_day_all_land() -> None:
+    import threading
+    from datetime import date
+
+    from app.models.entities import HabitType
+
+    with TestClient(app) as client:
+        _auth_headers(client, "rollup-race@example.com")
+    db = SessionLocal()
+    try:
+        user_id = db.query(User).filter(User.email == "rollup-race@example.com").one().id
+    finally:
+        db.close()
+
+    day = date(2026, 1, 15)
+    start = threading.Barrier(4)
+    errors: list[Exception] = []
+
+    def worker() -> None:
+        session = SessionLocal()
+        try:
+            start.wait()
+            for _ in range(10):
+                CompletionRollupService().increment(session, user_id, day, {HabitType.focus: 1, HabitType.chakra: 2})
+                session.commit()
+        except Exception as exc:  # pragma: no cover - surfaced by the assertion below
+            errors.append(exc)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    db = SessionLocal()
+    try:
+        counts = dict(
+            db.query(CompletionDailyRollup.habit_type, CompletionDailyRollup.completed_count).filter(
+                CompletionDailyRollup.user_id == user_id, CompletionDailyRollup.day == day
+            )
+        )
+        assert counts == {HabitType.focus: 40, HabitType.chakra: 80}
+    finally:
+        db.close()
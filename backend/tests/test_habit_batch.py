@@ -0,0 +1,81 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def _auth_headers(client: TestClient, email: str) -> dict[str, str]:
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert register.status_code == 201
+
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert login.status_code == 200
+    token = login.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _create_habit(client: TestClient, headers: dict[str, str], habit_type: str, schedule: str) -> str:
+    response = client.post(
+        "/api/v1/habits",
+        headers=headers,
+        json={"title": "Morning", "description": "Routine", "type": habit_type, "schedule": schedule},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_batch_completion_applies_items_and_reports_per_item_status() -> None:
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "batch-owner@example.com")
+        other_headers = _auth_headers(client, "batch-other@example.com")
+        chakra_id = _create_habit(client, headers, "CHAKRA", "DAILY")
+        focus_id = _create_habit(client, headers, "FOCUS", "ONE_OFF")
+        foreign_id = _create_habit(client, other_headers, "FOCUS", "DAILY")
+
+        response = client.post(
+            "/api/v1/habits/completions:batch",
+            headers=headers,
+            json={
+                "items": [
+                    {"habit_id": chakra_id, "completed": True},
+                    {"habit_id": focus_id, "completed": True},
+                    {"habit_id": focus_id, "completed": False},
+                    {"habit_id": focus_id, "completed": True},
+                    {"habit_id": chakra_id, "completed": True},
+                    {"habit_id": foreign_id, "completed": True},
+                ]
+            },
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [item["status"] for item in results] == [
+            "applied",
+            "applied",
+            "applied",
+            "rejected",
+            "unchanged",
+            "not_found",
+        ]
+        assert results[0]["habit"]["completed"] is True
+        assert results[2]["habit"]["completed"] is False
+        assert "One-off" in results[3]["message"]
+
+        progression = client.get("/api/v1/progression/me", headers=headers)
+        assert progression.json()["stats"]["chakra_xp"] == 120
+        assert progression.json()["stats"]["focus_xp"] == 0
+
+        habits = {habit["id"]: habit for habit in client.get("/api/v1/habits", headers=headers).json()}
+        assert habits[chakra_id]["completed"] is True
+        assert habits[focus_id]["completed"] is False
+
+
+def test_batch_completion_validates_payload_size() -> None:
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "batch-limits@example.com")
+        empty = client.post("/api/v1/habits/completions:batch", headers=headers, json={"items": []})
+        assert empty.status_code == 422
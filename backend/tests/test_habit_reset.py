@@ -0,0 +1,106 @@
+from datetime import UTC, datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.entities import AuditLog, Habit, HabitSchedule
+from app.services.habit_reset_service import HabitResetService
+
+
+def _auth_headers(client: TestClient, email: str) -> dict[str, str]:
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert register.status_code == 201
+
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert login.status_code == 200
+    token = login.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_bulk_reset_clears_expired_daily_and_recurring_flags() -> None:
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "reset-user@example.com")
+        habit_ids = {}
+        for schedule in ("DAILY", "RECURRING", "ONE_OFF"):
+            create = client.post(
+                "/api/v1/habits",
+                headers=headers,
+                json={"title": schedule, "description": "Reset", "type": "FOCUS", "schedule": schedule},
+            )
+            habit_ids[schedule] = create.json()["id"]
+            complete = client.patch(
+                f"/api/v1/habits/{habit_ids[schedule]}/completion",
+                headers=headers,
+                json={"completed": True},
+            )
+            assert complete.status_code == 200
+
+    db = SessionLocal()
+    try:
+        service = HabitResetService()
+        same_time = service.reset_due_habits(db, now=datetime.now(UTC), batch_size=2)
+        db.expire_all()
+        assert db.get(Habit, habit_ids["RECURRING"]).completed is True
+
+        next_day = datetime.now(UTC) + timedelta(days=1, hours=1)
+        run = service.reset_due_habits(db, now=next_day, batch_size=2)
+        db.expire_all()
+        assert db.get(Habit, habit_ids["DAILY"]).completed is False
+        assert db.get(Habit, habit_ids["RECURRING"]).completed is False
+        assert db.get(Habit, habit_ids["ONE_OFF"]).completed is True
+        assert run.daily_reset >= 1
+        assert run.recurring_reset >= 1
+        assert run.batches >= 2
+        assert same_time.recurring_reset == 0
+        assert db.query(AuditLog).filter(AuditLog.event_type == "habit_reset_run").count() >= 1
+    finally:
+        db.close()
+
+
+def test_reset_counts_only_rows_it_changed(monkeypatch) -> None:
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "reset-race@example.com")
+        habit_ids = []
+        for title in ("First", "Second"):
+            create = client.post(
+                "/api/v1/habits",
+                headers=headers,
+                json={"title": title, "description": "Reset", "type": "FOCUS", "schedule": "DAILY"},
+            )
+            habit_ids.append(create.json()["id"])
+            client.patch(f"/api/v1/habits/{habit_ids[-1]}/completion", headers=headers, json={"completed": True})
+
+    cutoff = datetime.now(UTC) + timedelta(days=1)
+    db = SessionLocal()
+    try:
+        due = db.query(Habit).filter(
+            Habit.schedule == HabitSchedule.daily,
+            Habit.completed.is_(True),
+        ).count()
+        execute = db.execute
+        raced = False
+
+        def execute_with_concurrent_toggle(statement, *args, **kwargs):
+            nonlocal raced
+            result = execute(statement, *args, **kwargs)
+            if not raced:
+                # Another request un-completes a habit after the batch SELECT, before the UPDATE.
+                raced = True
+                with SessionLocal() as other:
+                    other.get(Habit, habit_ids[0]).completed = False
+                    other.commit()
+            return result
+
+        monkeypatch.setattr(db, "execute", execute_with_concurrent_toggle)
+        total, batches = HabitResetService._reset_in_batches(db, HabitSchedule.daily, cutoff, batch_size=1000)
+        assert batches == 1
+        assert total == due - 1
+    finally:
+        db.close()
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import security
+from app.core.hash_pool import HashingExecutor, HashPoolSaturatedError
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.entities import User
+
+
+def _auth_headers(client: TestClient, email: str) -> dict[str, str]:
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert register.status_code == 201
+
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert login.status_code == 200
+    token = login.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_hash_pool_rejects_when_saturated_and_tracks_metrics() -> None:
+    executor = HashingExecutor(backend="thread", workers=1, max_queue=0)
+    release = threading.Event()
+    blocker = threading.Thread(target=executor.run, args=(release.wait,))
+    blocker.start()
+    try:
+        while executor.snapshot()["in_flight"] == 0:
+            pass
+        with pytest.raises(HashPoolSaturatedError):
+            executor.run(sum, [1, 2])
+    finally:
+        release.set()
+        blocker.join()
+
+    assert executor.run(sum, [1, 2]) == 3
+    snapshot = executor.snapshot()
+    assert snapshot["rejected"] == 1
+    assert snapshot["completed"] == 2
+    assert snapshot["hash_ms_max"] >= snapshot["hash_ms_avg"] > 0
+    executor.shutdown()
+
+
+def test_run_async_leaves_the_event_loop_free_and_holds_the_slot() -> None:
+    executor = HashingExecutor(backend="thread", workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario() -> list[str]:
+        order: list[str] = []
+        pending = asyncio.ensure_future(executor.run_async(release.wait))
+        await asyncio.sleep(0)
+        # The loop keeps running other work while the pool is busy.
+        order.append("loop")
+        with pytest.raises(HashPoolSaturatedError):
+            await executor.run_async(sum, [1, 2])
+        release.set()
+        assert await pending is True
+        order.append("hashed")
+        assert await executor.run_async(sum, [1, 2]) == 3
+        return order
+
+    try:
+        assert asyncio.run(scenario()) == ["loop", "hashed"]
+        snapshot = executor.snapshot()
+        assert snapshot["in_flight"] == 0 and snapshot["completed"] == 2 and snapshot["rejected"] == 1
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_process_backend_matches_thread_backend() -> None:
+    args = (b"StrongPass123", b"0" * 16, 2**10, 8, 1, 32)
+    process_pool = HashingExecutor(backend="process", workers=1, max_queue=1)
+    thread_pool = HashingExecutor(backend="thread", workers=1, max_queue=1)
+    try:
+        assert process_pool.run(security._scrypt, *args) == thread_pool.run(security._scrypt, *args)
+    finally:
+        process_pool.shutdown()
+        thread_pool.shutdown()
+
+
+def test_saturated_pool_returns_503(monkeypatch) -> None:
+    saturated = HashingExecutor(backend="thread", workers=1, max_queue=0)
+    saturated._slots.acquire()
+    monkeypatch.setattr(security, "get_hash_executor", lambda: saturated)
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/v1/auth/register",
+            json={"email": "busy-pool@example.com", "password": "StrongPass123"},
+        )
+        assert response.status_code == 503
+        assert response.json()["code"] == "service_unavailable"
+        assert response.headers["retry-after"] == "1"
+    saturated.shutdown()
+
+
+def test_health_metrics_exposes_hash_pool() -> None:
+    with TestClient(app) as client:
+        assert client.get("/api/v1/health/metrics").status_code == 403
+        headers = _auth_headers(client, "metrics-reader@example.com")
+        assert client.get("/api/v1/health/metrics", headers=headers).status_code == 403
+
+        with SessionLocal() as db:
+            db.query(User).filter(User.email == "metrics-reader@example.com").one().is_admin = True
+            db.commit()
+        response = client.get("/api/v1/health/metrics", headers=headers)
+    assert response.status_code == 200
+    assert {"queue_wait_ms_avg", "hash_ms_avg", "rejected"} <= set(response.json()["hash_pool"])
@@ -0,0 +1,83 @@
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.services.leaderboard_service import LeaderboardIndex, get_leaderboard
+
+
+def _auth_headers(client: TestClient, email: str) -> dict[str, str]:
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert register.status_code == 201
+
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert login.status_code == 200
+    token = login.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _complete_new_habit(client: TestClient, headers: dict[str, str], habit_type: str) -> None:
+    create = client.post(
+        "/api/v1/habits",
+        headers=headers,
+        json={"title": "Rank Habit", "description": "Climb", "type": habit_type, "schedule": "ONE_OFF"},
+    )
+    assert create.status_code == 201
+    complete = client.patch(
+        f"/api/v1/habits/{create.json()['id']}/completion",
+        headers=headers,
+        json={"completed": True},
+    )
+    assert complete.status_code == 200
+
+
+def test_leaderboard_index_ranks_and_updates() -> None:
+    index = LeaderboardIndex()
+    index.update("a", 100, 0, 0)
+    index.update("b", 0, 300, 0)
+    index.update("c", 50, 50, 50)
+    assert [entry.user_id for entry in index.top("total", 3)] == ["b", "c", "a"]
+    assert index.rank_of("chakra", "a").rank == 1
+
+    index.update("a", 500, 0, 0)
+    assert index.rank_of("total", "a").rank == 1
+    assert index.rank_of("total", "b").rank == 2
+    assert index.size("total") == 3
+    assert index.rank_of("total", "missing") is None
+
+
+def test_leaderboard_endpoints_follow_committed_progression() -> None:
+    with TestClient(app) as client:
+        headers_low = _auth_headers(client, "rank-low@example.com")
+        headers_high = _auth_headers(client, "rank-high@example.com")
+
+        _complete_new_habit(client, headers_low, "FOCUS")
+        for _ in range(3):
+            _complete_new_habit(client, headers_high, "FOCUS")
+
+        me_high = client.get("/api/v1/leaderboard/me", params={"dimension": "focus"}, headers=headers_high)
+        me_low = client.get("/api/v1/leaderboard/me", params={"dimension": "focus"}, headers=headers_low)
+        assert me_high.status_code == 200
+        assert me_high.json()["xp"] == 360
+        assert me_high.json()["rank"] < me_low.json()["rank"]
+
+        top = client.get("/api/v1/leaderboard", params={"dimension": "focus", "limit": 1}, headers=headers_low)
+        assert top.status_code == 200
+        assert top.json()["entries"][0]["xp"] >= 360
+
+        invalid = client.get("/api/v1/leaderboard", params={"dimension": "karma"}, headers=headers_low)
+        assert invalid.status_code == 422
+
+    leader_id = top.json()["entries"][0]["user_id"]
+    before = get_leaderboard().rank_of("focus", leader_id)
+    db = SessionLocal()
+    try:
+        assert get_leaderboard().rebuild(db) >= 2
+    finally:
+        db.close()
+    assert get_leaderboard().rank_of("focus", leader_id) == before
@@ -0,0 +1,115 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.entities import AuditLog, LoginFailure
+from app.services import auth_service
+from app.services.audit_writer import get_audit_writer
+from app.services.login_throttle_service import LoginThrottle
+
+
+def test_throttle_blocks_after_threshold_and_decays() -> None:
+    throttle = LoginThrottle(account_max_failures=3, ip_max_failures=100, half_life_seconds=60)
+    now = time.time()
+    with SessionLocal() as db:
+        for _ in range(3):
+            throttle.ensure_allowed(db, "decay@example.com", "10.0.0.1", now=now)
+            throttle.record_failure(db, "decay@example.com", "10.0.0.1", now=now)
+        db.commit()
+
+        with pytest.raises(HTTPException) as blocked:
+            throttle.ensure_allowed(db, "decay@example.com", "10.0.0.1", now=now)
+        assert blocked.value.status_code == 429
+        assert int(blocked.value.headers["Retry-After"]) >= 1
+
+        # One half-life later the score is 1.5, below the limit again.
+        throttle.ensure_allowed(db, "decay@example.com", "10.0.0.1", now=now + 60)
+
+
+def test_throttle_state_is_shared_through_the_database() -> None:
+    worker_a = LoginThrottle(account_max_failures=2, ip_max_failures=100, half_life_seconds=300)
+    worker_b = LoginThrottle(account_max_failures=2, ip_max_failures=100, half_life_seconds=300)
+    with SessionLocal() as db:
+        worker_a.record_failure(db, "shared@example.com", "10.0.0.2")
+        worker_a.record_failure(db, "shared@example.com", "10.0.0.2")
+        db.commit()
+
+    with SessionLocal() as db:
+        # Far from the limit in memory: answered without a read until the next sync.
+        worker_b.ensure_allowed(db, "shared@example.com", "10.0.0.3")
+        assert worker_b.snapshot()["db_reads"] == 0
+        assert worker_b.sync(db) >= 1
+        with pytest.raises(HTTPException):
+            worker_b.ensure_allowed(db, "shared@example.com", "10.0.0.3")
+
+
+def test_failures_from_different_workers_add_up() -> None:
+    worker_a = LoginThrottle(account_max_failures=5, ip_max_failures=100, half_life_seconds=300)
+    worker_b = LoginThrottle(account_max_failures=5, ip_max_failures=100, half_life_seconds=300)
+    now = time.time()
+    with SessionLocal() as db:
+        for offset in range(4):
+            worker_a.record_failure(db, "v@x.com", "10.0.0.6", now=now + offset)
+        db.commit()
+        # Worker B has never seen the key; its failure must add to A's, not replace them.
+        worker_b.record_failure(db, "v@x.com", "10.0.0.7", now=now + 4)
+        db.commit()
+
+        score = db.query(LoginFailure.score).filter(LoginFailure.key == "account:v@x.com").scalar()
+        assert 4.9 < score <= 5.0
+        with pytest.raises(HTTPException):
+            worker_b.ensure_allowed(db, "v@x.com", "10.0.0.7", now=now + 4)
+
+
+def test_throttle_reads_the_database_when_near_the_limit() -> None:
+    worker_a = LoginThrottle(account_max_failures=2, ip_max_failures=100, half_life_seconds=300)
+    worker_b = LoginThrottle(account_max_failures=2, ip_max_failures=100, half_life_seconds=300)
+    with SessionLocal() as db:
+        worker_b.record_failure(db, "near-limit@example.com", "10.0.0.4")
+        worker_a.record_failure(db, "near-limit@example.com", "10.0.0.5")
+        worker_a.record_failure(db, "near-limit@example.com", "10.0.0.5")
+        db.commit()
+
+    with SessionLocal() as db, pytest.raises(HTTPException):
+        worker_b.ensure_allowed(db, "near-limit@example.com", "10.0.0.4")
+    assert worker_b.snapshot()["db_reads"] == 1
+
+
+def test_login_rejects_before_hashing_once_throttled(monkeypatch) -> None:
+    with TestClient(app) as client:
+        register = client.post(
+            "/api/v1/auth/register",
+            json={"email": "stuffing@example.com", "password": "StrongPass123"},
+        )
+        assert register.status_code == 201
+
+        for _ in range(5):
+            response = client.post(
+                "/api/v1/auth/login",
+                json={"email": "stuffing@example.com", "password": "WrongPass123"},
+            )
+            assert response.status_code == 401
+
+        def fail_if_called(*_args, **_kwargs):
+            raise AssertionError("scrypt must not run for throttled attempts")
+
+        monkeypatch.setattr(auth_service, "verify_password_async", fail_if_called)
+        get_audit_writer().flush()
+        with SessionLocal() as db:
+            audit_rows = db.query(AuditLog).count()
+
+        throttled = client.post(
+            "/api/v1/auth/login",
+            json={"email": "stuffing@example.com", "password": "StrongPass123"},
+        )
+        assert throttled.status_code == 429
+        assert throttled.json()["code"] == "rate_limited"
+        assert int(throttled.headers["retry-after"]) > 0
+
+        get_audit_writer().flush()
+        with SessionLocal() as db:
+            assert db.query(AuditLog).count() == audit_rows
@@ -0,0 +1,99 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, update
+
+from app.db.session import SessionLocal
+from app import main as main_module
+from app.main import app
+from app.models.entities import User
+from app.services.principal_cache import PrincipalCache, get_principal_cache
+
+
+def _auth_headers(client: TestClient, email: str) -> dict[str, str]:
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert register.status_code == 201
+
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert login.status_code == 200
+    token = login.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_repeated_requests_hit_principal_cache() -> None:
+    cache = get_principal_cache()
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "principal-cache@example.com")
+        before = cache.snapshot()
+        assert client.get("/api/v1/profile/me", headers=headers).status_code == 200
+        assert client.get("/api/v1/habits", headers=headers).status_code == 200
+        after = cache.snapshot()
+        assert after["misses"] == before["misses"] + 1
+        assert after["hits"] == before["hits"] + 1
+
+        with SessionLocal() as db:
+            db.query(User).filter(User.email == "principal-cache@example.com").one().is_admin = True
+            db.commit()
+        metrics = client.get("/api/v1/health/metrics", headers=headers).json()
+        assert metrics["principal_cache"]["hits"] >= 1
+
+
+def test_deleted_user_is_evicted_from_principal_cache() -> None:
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "principal-cache-delete@example.com")
+        me = client.get("/api/v1/profile/me", headers=headers)
+        assert me.status_code == 200
+
+        with SessionLocal() as db:
+            user = db.query(User).filter(User.email == "principal-cache-delete@example.com").one()
+            db.delete(user)
+            db.commit()
+
+        response = client.get("/api/v1/profile/me", headers=headers)
+        assert response.status_code == 401
+
+
+def test_sync_evicts_users_changed_by_bulk_statements(monkeypatch) -> None:
+    # Sync by hand only, so the cached principals are still there to observe first.
+    monkeypatch.setattr(main_module.settings, "principal_cache_sync_seconds", 0)
+    cache = get_principal_cache()
+    with TestClient(app) as client:
+        changed = _auth_headers(client, "principal-cache-bulk-update@example.com")
+        deleted = _auth_headers(client, "principal-cache-bulk-delete@example.com")
+        assert client.get("/api/v1/profile/me", headers=changed).status_code == 200
+        assert client.get("/api/v1/profile/me", headers=deleted).status_code == 200
+
+        # Statements bypass the mapper events, as changes made by another worker would.
+        with SessionLocal() as db:
+            db.execute(
+                update(User)
+                .where(User.email == "principal-cache-bulk-update@example.com")
+                .values(email="principal-cache-bulk-renamed@example.com")
+            )
+            db.execute(delete(User).where(User.email == "principal-cache-bulk-delete@example.com"))
+            db.commit()
+        assert client.get("/api/v1/profile/me", headers=deleted).status_code == 200
+
+        with SessionLocal() as db:
+            assert cache.sync(db) >= 2
+        assert client.get("/api/v1/profile/me", headers=deleted).status_code == 401
+        me = client.get("/api/v1/profile/me", headers=changed)
+        assert me.status_code == 200
+        assert me.json()["email"] == "principal-cache-bulk-renamed@example.com"
+
+
+def test_cache_is_bounded_and_evicts_least_recently_used() -> None:
+    cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+    users = [User(id=f"user-{index}", email=f"lru-{index}@example.com", hashed_password="x") for index in range(3)]
+    for index, user in enumerate(users):
+        cache.put(jti=f"jti-{index}", user=user)
+
+    snapshot = cache.snapshot()
+    assert snapshot["size"] == 2
+    assert snapshot["evictions"] == 1
+    cache.invalidate_subject("user-2")
+    assert cache.snapshot()["size"] == 1
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from app.core.config import get_settings
+from app.models.entities import HabitType
+from app.services.progression_curve import (
+    DEFAULT_CURVE,
+    ProgressionCurve,
+    get_progression_curve,
+    set_progression_curve,
+)
+from app.services.progression_service import ProgressionService
+
+
+def _deep_curve(version: str = "deep", levels: int = 150) -> ProgressionCurve:
+    return ProgressionCurve.from_dict(
+        {
+            "version": version,
+            "xp_weights": {"CHAKRA": 100, "VITALITY": 50, "FOCUS": 25},
+            "tiers": [{"label": f"Level {i}", "min_xp": i * 100} for i in range(levels)],
+        }
+    )
+
+
+def test_default_curve_matches_original_thresholds() -> None:
+    assert DEFAULT_CURVE.tier_for(0).label == "Dormant"
+    assert DEFAULT_CURVE.tier_for(239).level == 0
+    assert DEFAULT_CURVE.tier_for(240).label == "Stirring"
+    assert DEFAULT_CURVE.tier_for(600).label == "Radiant"
+    assert DEFAULT_CURVE.tier_for(10**9).label == "Transcendent"
+
+
+def test_deep_curve_level_lookup_and_weights() -> None:
+    curve = _deep_curve()
+    assert curve.tier_for(0).level == 0
+    assert curve.tier_for(199).level == 1
+    assert curve.tier_for(14_900).level == 149
+    assert curve.tier_for(10**9).level == 149
+    assert curve.xp_for(HabitType.focus) == 25
+
+    xp_values, level, _ = ProgressionService(curve=curve).progression_values(
+        {HabitType.chakra: 3, HabitType.vitality: 2, HabitType.focus: 4}
+    )
+    assert xp_values == {"chakra_xp": 300, "vitality_xp": 100, "focus_xp": 100}
+    assert level == 5
+
+
+def test_curve_rejects_unordered_or_incomplete_tables() -> None:
+    with pytest.raises(ValueError):
+        ProgressionCurve.from_dict(
+            {"version": "bad", "xp_weights": {"CHAKRA": 1}, "tiers": [{"label": "a", "min_xp": 0}]}
+        )
+    with pytest.raises(ValueError):
+        ProgressionCurve.from_dict(
+            {
+                "version": "bad",
+                "xp_weights": {"CHAKRA": 1, "VITALITY": 1, "FOCUS": 1},
+                "tiers": [{"label": "a", "min_xp": 10}],
+            }
+        )
+
+
+def test_curve_hot_swap_from_override_and_file(tmp_path, monkeypatch) -> None:
+    try:
+        set_progression_curve(_deep_curve(version="override"))
+        assert get_progression_curve().version == "override"
+        assert ProgressionService().curve.version == "override"
+    finally:
+        set_progression_curve(None)
+
+    curve_file = tmp_path / "curve.json"
+    curve_file.write_text(
+        json.dumps(
+            {
+                "version": "from-file",
+                "xp_weights": {"CHAKRA": 10, "VITALITY": 10, "FOCUS": 10},
+                "tiers": [{"label": "Seed", "min_xp": 0}, {"label": "Sprout", "min_xp": 10}],
+            }
+        ),
+        encoding="utf-8",
+    )
+    settings = get_settings()
+    monkeypatch.setattr(settings, "progression_curve_path", str(curve_file))
+    monkeypatch.setattr(settings, "progression_curve_reload_seconds", 0.0)
+    assert get_progression_curve().version == "from-file"
+    assert get_progression_curve().tier_for(15).label == "Sprout"
+
+    monkeypatch.setattr(settings, "progression_curve_path", "")
+    assert get_progression_curve() is DEFAULT_CURVE
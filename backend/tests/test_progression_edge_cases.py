@@ -63,3 +63,120 @@ def test_progression_reaches_transcendent_at_high_xp() -> None:
         assert payload["stats"]["chakra_xp"] == 1200
         assert payload["avatar"]["aura_level"] == 3
         assert payload["avatar"]["aura_label"] == "Transcendent"
+
+
+def test_uncheck_reverts_xp_and_matches_full_recompute() -> None:
+    from app.db.session import SessionLocal
+    from app.models.entities import User
+    from app.services.progression_service import ProgressionService
+
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "edge-delta@example.com")
+        habit_ids = []
+        for habit_type in ("CHAKRA", "FOCUS", "FOCUS"):
+            create_habit = client.post(
+                "/api/v1/habits",
+                headers=headers,
+                json={
+                    "title": f"Delta {habit_type}",
+                    "description": "Incremental XP",
+                    "type": habit_type,
+                    "schedule": "ONE_OFF",
+                },
+            )
+            assert create_habit.status_code == 201
+            habit_ids.append(create_habit.json()["id"])
+
+        for habit_id in habit_ids:
+            complete = client.patch(
+                f"/api/v1/habits/{habit_id}/completion",
+                headers=headers,
+                json={"completed": True},
+            )
+            assert complete.status_code == 200
+
+        uncheck = client.patch(
+            f"/api/v1/habits/{habit_ids[1]}/completion",
+            headers=headers,
+            json={"completed": False},
+        )
+        assert uncheck.status_code == 200
+
+        progression = client.get("/api/v1/progression/me", headers=headers)
+        assert progression.status_code == 200
+        stats = progression.json()["stats"]
+        assert stats["chakra_xp"] == 120
+        assert stats["focus_xp"] == 120
+        assert progression.json()["avatar"]["aura_label"] == "Stirring"
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "edge-delta@example.com").one()
+        recomputed, avatar = ProgressionService().recompute_user_progression(db=db, user_id=user.id)
+        assert (recomputed.chakra_xp, recomputed.vitality_xp, recomputed.focus_xp) == (120, 0, 120)
+        assert avatar.aura_level == 1
+        db.rollback()
+    finally:
+        db.close()
+
+
+def test_progression_and_profile_reads_do_not_write() -> None:
+    from app.db.session import SessionLocal
+    from app.models.entities import AuditLog, AvatarState, Stats, User
+    from app.services.audit_writer import get_audit_writer
+
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "edge-readonly@example.com")
+        get_audit_writer().flush()
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.email == "edge-readonly@example.com").one()
+            audit_before = db.query(AuditLog).filter(AuditLog.user_id == user.id).count()
+        finally:
+            db.close()
+
+        progression = client.get("/api/v1/progression/me", headers=headers)
+        assert progression.status_code == 200
+        assert progression.json()["avatar"]["avatar_type"] == "neutral"
+        profile = client.get("/api/v1/profile/me", headers=headers)
+        assert profile.status_code == 200
+        assert profile.json()["total_habits"] == 0
+        assert profile.json()["aura_label"] == "Dormant"
+
+    db = SessionLocal()
+    try:
+        assert db.get(Stats, user.id) is None
+        assert db.get(AvatarState, user.id) is None
+        assert db.query(AuditLog).filter(AuditLog.user_id == user.id).count() == audit_before
+    finally:
+        db.close()
+
+
+def test_concurrent_deltas_are_not_lost() -> None:
+    from app.db.session import SessionLocal
+    from app.models.entities import HabitType, Stats, User
+    from app.services.progression_service import ProgressionService
+
+    with TestClient(app) as client:
+        _auth_headers(client, "edge-concurrent@example.com")
+
+    first, second = SessionLocal(), SessionLocal()
+    try:
+        user = first.query(User).filter(User.email == "edge-concurrent@example.com").one()
+        ProgressionService().apply_completion_delta(db=first, user_id=user.id, habit_type=HabitType.focus, delta=1)
+        first.commit()
+        # `first` has read the row when another device's toggle commits.
+        held = first.get(Stats, user.id)
+        ProgressionService().apply_completion_delta(db=second, user_id=user.id, habit_type=HabitType.focus, delta=1)
+        second.commit()
+        ProgressionService().apply_completion_delta(db=first, user_id=user.id, habit_type=HabitType.focus, delta=1)
+        first.commit()
+
+        assert held.focus_xp == 360
+        assert second.get(Stats, user.id, populate_existing=True).focus_xp == 360
+        ProgressionService().apply_completion_delta(db=second, user_id=user.id, habit_type=HabitType.focus, delta=-5)
+        second.commit()
+        assert second.get(Stats, user.id).focus_xp == 0
+    finally:
+        first.close()
+        second.close()
@@ -0,0 +1,58 @@
+from fastapi.testclient import TestClient
+
+from app.core.rate_limit import SlidingWindowLimiter, get_policy_rate_limiter
+from app.core.rate_limit_backends import MemoryBackend
+from app.main import app
+
+
+def test_sliding_window_weights_previous_window() -> None:
+    limiter = SlidingWindowLimiter(limit=10, window_seconds=60)
+    for second in range(10):
+        assert limiter.hit("10.0.0.1", now=60.0 + second) is None
+    retry_after = limiter.hit("10.0.0.1", now=70.0)
+    assert retry_after is not None and retry_after > 0
+
+    # A quarter into the next window, 7.5 of the previous 10 still count.
+    for _ in range(3):
+        assert limiter.hit("10.0.0.1", now=135.0) is None
+    assert limiter.hit("10.0.0.1", now=135.0) is not None
+    # Past two windows the key starts from scratch.
+    assert limiter.hit("10.0.0.1", now=250.0) is None
+
+
+def test_idle_keys_are_swept_and_key_count_is_capped() -> None:
+    limiter = SlidingWindowLimiter(limit=5, window_seconds=10, max_keys=100, sweep_interval_seconds=10)
+    for index in range(1000):
+        limiter.hit(f"10.0.{index // 256}.{index % 256}", now=100.0)
+    snapshot = limiter.snapshot()
+    assert snapshot["tracked_keys"] == 100
+    assert snapshot["evicted"] == 900
+
+    limiter.hit("10.9.9.9", now=135.0)
+    snapshot = limiter.snapshot()
+    assert snapshot["tracked_keys"] == 1
+    assert snapshot["swept"] == 100
+
+
+def test_sweep_stops_at_the_first_live_key() -> None:
+    backend = MemoryBackend(max_keys=1000, sweep_interval_seconds=3600)
+    for index in range(50):
+        backend.hit(f"idle-{index}", now=100.0, index=10, elapsed=0.0, limit=5)
+    for index in range(50):
+        backend.hit(f"live-{index}", now=125.0, index=12, elapsed=0.5, limit=5)
+    # An idle key that rolls again moves behind the live ones.
+    backend.hit("idle-0", now=125.0, index=12, elapsed=0.5, limit=5)
+
+    assert backend.sweep(index=13) == 49
+    assert backend.snapshot()["tracked_keys"] == 51
+    assert backend.sweep(index=13) == 0
+
+
+def test_blocked_request_returns_429_with_error_schema(monkeypatch) -> None:
+    monkeypatch.setattr(get_policy_rate_limiter().limiters["default"], "limit", 0)
+    with TestClient(app) as client:
+        response = client.get("/api/v1/habits")
+    assert response.status_code == 429
+    assert response.json() == {"code": "rate_limited", "message": "Too many requests"}
+    assert int(response.headers["retry-after"]) >= 1
+    assert response.headers["x-content-type-options"] == "nosniff"
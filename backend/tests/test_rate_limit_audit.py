@@ -0,0 +1,68 @@
+from fastapi.testclient import TestClient
+
+from app.core.rate_limit import get_policy_rate_limiter
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.entities import AuditLog
+from app.services.audit_writer import get_audit_writer
+from app.services.rate_limit_audit import BlockedRequestAudit, get_blocked_request_audit
+
+
+def _blocked_rows(client: str) -> list[AuditLog]:
+    get_audit_writer().flush()
+    db = SessionLocal()
+    try:
+        return (
+            db.query(AuditLog)
+            .filter(AuditLog.event_type == "rate_limit_blocked", AuditLog.entity_id == client)
+            .order_by(AuditLog.id)
+            .all()
+        )
+    finally:
+        db.close()
+
+
+def test_blocked_requests_are_aggregated_per_client_and_path() -> None:
+    audit = BlockedRequestAudit(max_keys=2)
+    for second in range(50):
+        audit.record("198.51.100.7", "GET", "/api/v1/health", now=1_000.0 + second)
+    audit.record("198.51.100.7", "POST", "/api/v1/auth/login", now=1_100.0)
+    audit.record("198.51.100.8", "GET", "/api/v1/health", now=1_100.0)
+    assert audit.snapshot()["overflowed"] == 1
+
+    assert audit.flush() == 3
+    rows = _blocked_rows("198.51.100.7")
+    assert [row.details["count"] for row in rows] == [50, 1]
+    assert rows[0].details["path"] == "/api/v1/health"
+    assert rows[0].details["first_seen"].startswith("1970-01-01T00:16:40")
+    assert rows[0].details["last_seen"].startswith("1970-01-01T00:17:29")
+    assert _blocked_rows("*")[0].details["count"] == 1
+    assert audit.flush() == 0
+
+
+def test_raw_events_are_sampled_alongside_summaries() -> None:
+    audit = BlockedRequestAudit(sample_rate=1.0)
+    for _ in range(3):
+        audit.record("198.51.100.9", "GET", "/api/v1/quests")
+    audit.flush()
+    rows = _blocked_rows("198.51.100.9")
+    assert sum("sample_rate" in row.details for row in rows) == 3
+    assert [row.details["count"] for row in rows if "count" in row.details] == [3]
+
+
+def test_rejection_writes_nothing_until_flush(monkeypatch) -> None:
+    monkeypatch.setattr(get_policy_rate_limiter().limiters["default"], "limit", 0)
+    audit = get_blocked_request_audit()
+    monkeypatch.setattr(audit, "sample_rate", 0.0)
+    audit.flush()
+    existing = len(_blocked_rows("testclient"))
+    with TestClient(app) as client:
+        for _ in range(20):
+            assert client.get("/api/v1/habits").status_code == 429
+        assert len(_blocked_rows("testclient")) == existing
+        assert audit.snapshot()["pending_keys"] == 1
+
+    # Lifespan shutdown flushes the tally.
+    rows = _blocked_rows("testclient")
+    assert len(rows) == existing + 1
+    assert rows[-1].details["count"] == 20
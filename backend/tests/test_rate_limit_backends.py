@@ -0,0 +1,166 @@
+import hashlib
+import multiprocessing
+import socketserver
+import threading
+
+from app.core.rate_limit import SlidingWindowLimiter
+from app.core.rate_limit_backends import RedisBackend, SharedMemoryBackend
+
+
+class _RespStandIn(socketserver.ThreadingTCPServer):
+    """In-memory server for the handful of Redis commands the backend sends."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _RespHandler)
+        self.store: dict[bytes, int] = {}
+        self.ttls: dict[bytes, int] = {}
+        self.scripts: set[bytes] = set()
+        self.commands: list[bytes] = []
+        self.lock = threading.Lock()
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        while True:
+            header = self.rfile.readline()
+            if not header:
+                return
+            parts = []
+            for _ in range(int(header[1:-2])):
+                length = int(self.rfile.readline()[1:-2])
+                parts.append(self.rfile.read(length + 2)[:-2])
+            self.wfile.write(self._execute(parts[0].upper(), parts[1:]))
+
+    def _execute(self, command: bytes, args: list[bytes]) -> bytes:
+        store = self.server.store
+        with self.server.lock:
+            self.server.commands.append(command)
+            if command == b"EVAL":
+                self.server.scripts.add(hashlib.sha1(args[0]).hexdigest().encode())
+                return self._hit_script(args[2:])
+            if command == b"EVALSHA":
+                if args[0] not in self.server.scripts:
+                    return b"-NOSCRIPT No matching script.\r\n"
+                return self._hit_script(args[2:])
+            if command in {b"INCR", b"DECR"}:
+                store[args[0]] = store.get(args[0], 0) + (1 if command == b"INCR" else -1)
+                return b":%d\r\n" % store[args[0]]
+            if command == b"EXPIRE":
+                self.server.ttls[args[0]] = int(args[1])
+                return b":1\r\n"
+            if command == b"GET":
+                value = store.get(args[0])
+                if value is None:
+                    return b"$-1\r\n"
+                data = str(value).encode()
+                return b"$%d\r\n%s\r\n" % (len(data), data)
+            return b"-ERR unknown command\r\n"
+
+    def _hit_script(self, args: list[bytes]) -> bytes:
+        # What the backend's Lua script does, run under the server lock as Redis runs scripts.
+        current_key, previous_key, limit, elapsed, ttl = args
+        store = self.server.store
+        current, previous = store.get(current_key, 0), store.get(previous_key, 0)
+        allowed = previous * (1 - float(elapsed)) + current < int(limit)
+        if allowed:
+            current = store[current_key] = current + 1
+            self.server.ttls[current_key] = int(ttl)
+        return b"*3\r\n:%d\r\n:%d\r\n:%d\r\n" % (previous, current, allowed)
+
+
+def _hammer(path: str, hits: int, results) -> None:
+    limiter = SlidingWindowLimiter(limit=150, window_seconds=60, backend=SharedMemoryBackend(path, max_keys=64))
+    results.put(sum(limiter.hit("10.0.0.1", now=65.0) is None for _ in range(hits)))
+
+
+def test_shared_memory_backend_enforces_one_limit_across_processes(tmp_path) -> None:
+    path = str(tmp_path / "rate-limit.bin")
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_hammer, args=(path, 100, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+    assert sum(results.get(timeout=5) for _ in workers) == 150
+
+    # A fresh worker attaching to the same table sees the spent budget.
+    limiter = SlidingWindowLimiter(limit=150, window_seconds=60, backend=SharedMemoryBackend(path, max_keys=64))
+    assert limiter.hit("10.0.0.1", now=66.0) is not None
+    assert limiter.hit("10.0.0.2", now=66.0) is None
+
+
+def test_shared_memory_backend_rolls_windows_and_reuses_stale_slots(tmp_path) -> None:
+    backend = SharedMemoryBackend(str(tmp_path / "rate-limit.bin"), max_keys=4)
+    limiter = SlidingWindowLimiter(limit=10, window_seconds=60, backend=backend)
+    for _ in range(10):
+        assert limiter.hit("10.0.0.1", now=60.0) is None
+    assert limiter.hit("10.0.0.1", now=60.0) is not None
+    # Same weighting as the in-process engine: 7.5 of the previous 10 remain.
+    for _ in range(3):
+        assert limiter.hit("10.0.0.1", now=135.0) is None
+    assert limiter.hit("10.0.0.1", now=135.0) is not None
+
+    for index in range(4):
+        limiter.hit(f"10.0.1.{index}", now=135.0)
+    assert backend.snapshot()["evicted"] >= 1
+    backend.close()
+
+
+def test_redis_backend_against_resp_stand_in() -> None:
+    server = _RespStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address
+        backend = RedisBackend(f"redis://{host}:{port}/0", window_seconds=60, breaker_seconds=60)
+        limiter = SlidingWindowLimiter(limit=5, window_seconds=60, backend=backend)
+        assert [limiter.hit("10.0.0.1", now=60.0) is None for _ in range(7)] == [True] * 5 + [False] * 2
+        # Rejected requests are never counted.
+        assert server.store[b"rl:10.0.0.1:1"] == 5
+        assert server.ttls[b"rl:10.0.0.1:1"] == 121
+        # The script is sent once; later calls reference it by hash.
+        assert server.commands[:3] == [b"EVALSHA", b"EVAL", b"EVALSHA"]
+        assert limiter.hit("10.0.0.1", now=170.0) is None
+    finally:
+        server.shutdown()
+        server.server_close()
+    backend.close()
+
+    # Unreachable server: fail open, count the error, then stop trying until the breaker closes.
+    assert limiter.hit("10.0.0.1", now=171.0) is None
+    assert limiter.hit("10.0.0.1", now=172.0) is None
+    snapshot = limiter.snapshot()
+    assert snapshot["errors"] == 1
+    assert snapshot["short_circuited"] == 1
+    assert snapshot["breaker_open"] == 1
+
+
+def test_redis_backend_counts_atomically_under_concurrency() -> None:
+    server = _RespStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address
+        backend = RedisBackend(f"redis://{host}:{port}/0", window_seconds=60)
+        limiter = SlidingWindowLimiter(limit=100, window_seconds=60, backend=backend)
+        allowed = []
+
+        def worker() -> None:
+            allowed.append(sum(limiter.hit("10.0.0.9", now=60.0) is None for _ in range(50)))
+
+        workers = [threading.Thread(target=worker) for _ in range(8)]
+        for item in workers:
+            item.start()
+        for item in workers:
+            item.join()
+        assert sum(allowed) == 100
+        assert server.store[b"rl:10.0.0.9:1"] == 100
+        assert 1 <= backend.snapshot()["idle_connections"] <= 8
+        backend.close()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from app.core.rate_limit import PolicyRateLimiter
+from app.core.rate_limit_policies import DEFAULT_POLICIES, PolicyMatcher, RateLimitPolicy, load_policies
+from app.core.security import create_access_token, create_refresh_token
+
+_DEFAULT = RateLimitPolicy(name="default", path="*", limit=1000)
+
+
+def test_matcher_prefers_the_most_specific_pattern() -> None:
+    matcher = PolicyMatcher(
+        [
+            RateLimitPolicy(name="any_habit", path="/habits/*", limit=100),
+            RateLimitPolicy(name="toggle", path="/habits/{habit_id}/completion", methods=("PATCH",), limit=10),
+            RateLimitPolicy(name="batch", path="/habits/completions", methods=("POST",), limit=5),
+        ],
+        prefix="/api/v1",
+    )
+
+    def name(method: str, path: str) -> str | None:
+        policy = matcher.match(method, path)
+        return policy.name if policy else None
+
+    assert name("POST", "/api/v1/habits/completions") == "batch"
+    assert name("PATCH", "/api/v1/habits/abc123/completion") == "toggle"
+    assert name("PATCH", "/api/v1/habits/completions/completion") == "toggle"
+    assert name("GET", "/api/v1/habits/abc123/completion") == "any_habit"
+    assert name("GET", "/api/v1/habits/completions/") == "any_habit"
+    assert name("GET", "/api/v1/habits") == "any_habit"
+    assert name("GET", "/api/v1/quests") is None
+    assert name("POST", "/habits/completions") is None
+
+
+def test_default_policies_split_expensive_and_cheap_routes() -> None:
+    limiter = PolicyRateLimiter(DEFAULT_POLICIES, default=_DEFAULT, prefix="/api/v1")
+    for _ in range(10):
+        assert limiter.check("POST", "/api/v1/auth/login", "203.0.113.5", now=60.0)[1] is None
+    policy, retry_after = limiter.check("POST", "/api/v1/auth/login", "203.0.113.5", now=60.0)
+    assert policy.name == "auth_login" and retry_after is not None
+
+    # Exempt: never counted, however often it is polled.
+    for _ in range(5000):
+        policy, retry_after = limiter.check("GET", "/api/v1/health", "203.0.113.5", now=60.0)
+        assert policy.name == "health" and retry_after is None
+    assert "health" not in limiter.snapshot()
+    # Other routes still run on the global budget.
+    assert limiter.check("GET", "/api/v1/quests", "203.0.113.5", now=60.0)[0].name == "default"
+
+
+def test_user_keyed_policy_counts_per_verified_subject() -> None:
+    limiter = PolicyRateLimiter(
+        (RateLimitPolicy(name="audit", path="/audit/*", methods=("GET",), limit=2, key="user"),),
+        default=_DEFAULT,
+    )
+    alice = f"Bearer {create_access_token('user-alice')}"
+    bob = f"Bearer {create_access_token('user-bob')}"
+
+    def blocked(authorization: str | None) -> bool:
+        return limiter.check("GET", "/audit/logs", "203.0.113.9", authorization, now=60.0)[1] is not None
+
+    assert [blocked(alice) for _ in range(3)] == [False, False, True]
+    # Same address, different user: separate budget.
+    assert [blocked(bob) for _ in range(2)] == [False, False]
+    # Forged, refresh and missing tokens are all counted against the address.
+    assert blocked("Bearer not-a-token") is False
+    assert blocked(f"Bearer {create_refresh_token('user-alice')}") is False
+    assert blocked(None) is True
+
+
+def test_policy_file_replaces_defaults(tmp_path) -> None:
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps([{"name": "login", "path": "/auth/login", "methods": ["post"], "limit": 3}]))
+    (policy,) = load_policies(str(path))
+    assert policy.methods == ("POST",) and policy.limit == 3 and policy.key == "ip"
+
+    path.write_text(json.dumps([{"name": "a", "path": "/a", "limit": 1}, {"name": "a", "path": "/b", "limit": 1}]))
+    with pytest.raises(ValueError):
+        load_policies(str(path))
+    with pytest.raises(ValueError):
+        RateLimitPolicy(name="bad", path="/a", key="session")
@@ -0,0 +1,101 @@
+import json
+import sys
+
+import pytest
+from sqlalchemy import create_engine, delete, select, update
+from sqlalchemy.orm import Session
+
+from app.db import models  # noqa: F401
+from app.db.base import Base
+from app.models.entities import AvatarState, Completion, Habit, HabitType, Stats, User
+from app.services.progression_service import ProgressionService
+from tools import rebuild_progression
+
+# (habit type, completed) per completion row; an uncomplete cancels the previous completion.
+_HISTORIES = [
+    [(HabitType.chakra, True), (HabitType.focus, True), (HabitType.focus, True)],
+    [(HabitType.vitality, True), (HabitType.vitality, False), (HabitType.chakra, True)],
+    [(HabitType.focus, True)],
+]
+
+
+def _progression(db: Session) -> dict[str, tuple[int, int, int, int]]:
+    rows = db.execute(
+        select(Stats.user_id, Stats.chakra_xp, Stats.vitality_xp, Stats.focus_xp, AvatarState.aura_level).join(
+            AvatarState, AvatarState.user_id == Stats.user_id
+        )
+    ).all()
+    return {user_id: tuple(values) for user_id, *values in rows}
+
+
+def _seed(engine) -> tuple[list[str], dict[str, tuple[int, int, int, int]]]:
+    """Users whose counters come from the live per-completion path, which the rebuild must reproduce."""
+    service = ProgressionService()
+    with Session(engine) as db:
+        for index, history in enumerate(_HISTORIES):
+            user = User(email=f"rebuild-{index}@example.com", hashed_password="x")
+            db.add(user)
+            db.flush()
+            habits = {}
+            for habit_type, completed in history:
+                if habit_type not in habits:
+                    habits[habit_type] = Habit(user_id=user.id, title=habit_type.value, description="Rebuild", type=habit_type)
+                    db.add(habits[habit_type])
+                    db.flush()
+                db.add(Completion(habit_id=habits[habit_type].id, user_id=user.id, completed=completed))
+                service.apply_completion_delta(db=db, user_id=user.id, habit_type=habit_type, delta=1 if completed else -1)
+        db.commit()
+        return sorted(db.execute(select(User.id)).scalars()), _progression(db)
+
+
+def _run(monkeypatch, *args: str) -> int:
+    monkeypatch.setattr(sys, "argv", ["rebuild_progression.py", *args])
+    # main() points the module-level engine at the temp database; undo that after the test.
+    monkeypatch.setattr(rebuild_progression, "_engine", None)
+    return rebuild_progression.main()
+
+
+def test_rebuild_resumes_from_checkpoint_and_matches_live_counters(tmp_path, monkeypatch) -> None:
+    database_url = f"sqlite:///{(tmp_path / 'progression.db').as_posix()}"
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    user_ids, expected = _seed(engine)
+    assert len(expected) == 3
+
+    # Drift the counters: zeroed stats for everyone, and one user missing both rows entirely.
+    with engine.begin() as conn:
+        conn.execute(update(Stats).values(chakra_xp=0, vitality_xp=0, focus_xp=0))
+        conn.execute(delete(Stats).where(Stats.user_id == user_ids[0]))
+        conn.execute(delete(AvatarState).where(AvatarState.user_id == user_ids[0]))
+
+    rebuild_chunk = rebuild_progression._rebuild_chunk
+    calls = []
+
+    def crash_on_second_chunk(chunk: list[str]):
+        calls.append(chunk)
+        if len(calls) == 2:
+            raise RuntimeError("killed")
+        return rebuild_chunk(chunk)
+
+    checkpoint = tmp_path / "rebuild.json"
+    monkeypatch.setattr(rebuild_progression, "_rebuild_chunk", crash_on_second_chunk)
+    with pytest.raises(RuntimeError):
+        _run(monkeypatch, "--database-url", database_url, "--chunk-size", "2", "--checkpoint", str(checkpoint))
+
+    # Keyset chunks in id order; only the committed first chunk is checkpointed.
+    assert calls == [user_ids[:2], user_ids[2:]]
+    assert json.loads(checkpoint.read_text(encoding="utf-8"))["last_user_id"] == user_ids[1]
+    with Session(engine) as db:
+        partial = _progression(db)
+    assert {user_id: partial[user_id] for user_id in user_ids[:2]} == {user_id: expected[user_id] for user_id in user_ids[:2]}
+    assert partial[user_ids[2]][:3] == (0, 0, 0)
+
+    resumed = []
+    monkeypatch.setattr(rebuild_progression, "_rebuild_chunk", lambda chunk: resumed.append(chunk) or rebuild_chunk(chunk))
+    assert _run(monkeypatch, "--database-url", database_url, "--chunk-size", "2", "--checkpoint", str(checkpoint), "--resume") == 0
+
+    assert resumed == [user_ids[2:]]
+    assert json.loads(checkpoint.read_text(encoding="utf-8"))["users"] == 3
+    with Session(engine) as db:
+        assert _progression(db) == expected
+    engine.dispose()
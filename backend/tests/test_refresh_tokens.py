@@ -0,0 +1,106 @@
+from datetime import UTC, datetime
+
+from fastapi.testclient import TestClient
+
+from app.core.security import create_refresh_token, decode_token
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.entities import User
+from app.services.refresh_token_service import RefreshTokenService, RevocationIndex
+
+
+def _login(client: TestClient, email: str) -> dict[str, str]:
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert register.status_code == 201
+
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert login.status_code == 200
+    return login.json()
+
+
+def _refresh(client: TestClient, refresh_token: str):
+    return client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def test_refresh_rotates_and_reuse_revokes_the_family() -> None:
+    with TestClient(app) as client:
+        tokens = _login(client, "rotate@example.com")
+
+        first = _refresh(client, tokens["refresh_token"])
+        assert first.status_code == 200
+        rotated = first.json()["refresh_token"]
+        assert rotated and rotated != tokens["refresh_token"]
+
+        # The spent token is rejected, and presenting it also kills its successor.
+        assert _refresh(client, tokens["refresh_token"]).status_code == 401
+        assert _refresh(client, rotated).status_code == 401
+
+
+def test_logout_revokes_refresh_token() -> None:
+    with TestClient(app) as client:
+        tokens = _login(client, "logout@example.com")
+        second_session = client.post(
+            "/api/v1/auth/login",
+            json={"email": "logout@example.com", "password": "StrongPass123"},
+        ).json()
+
+        logout = client.post("/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]})
+        assert logout.status_code == 204
+        assert _refresh(client, tokens["refresh_token"]).status_code == 401
+        assert _refresh(client, second_session["refresh_token"]).status_code == 200
+
+
+def test_logout_on_another_worker_is_not_treated_as_reuse() -> None:
+    with TestClient(app) as client:
+        tokens = _login(client, "logout-elsewhere@example.com")
+        second_session = client.post(
+            "/api/v1/auth/login",
+            json={"email": "logout-elsewhere@example.com", "password": "StrongPass123"},
+        ).json()
+
+        # Revoked in the table only, as a logout on a worker this one has not synced with yet.
+        payload = decode_token(tokens["refresh_token"])
+        with SessionLocal() as db:
+            RefreshTokenService().revoke(db, payload["sub"], payload["jti"], expires_at=datetime.now(UTC))
+            db.commit()
+
+        assert _refresh(client, tokens["refresh_token"]).status_code == 401
+        assert _refresh(client, second_session["refresh_token"]).status_code == 200
+
+
+def test_logout_all_sessions_and_cross_worker_sync() -> None:
+    with TestClient(app) as client:
+        tokens = _login(client, "logout-all@example.com")
+        other = client.post(
+            "/api/v1/auth/login",
+            json={"email": "logout-all@example.com", "password": "StrongPass123"},
+        ).json()
+
+        logout = client.post(
+            "/api/v1/auth/logout",
+            json={"refresh_token": tokens["refresh_token"], "all_sessions": True},
+        )
+        assert logout.status_code == 204
+        assert _refresh(client, other["refresh_token"]).status_code == 401
+
+    other_worker = RevocationIndex()
+    with SessionLocal() as db:
+        other_worker.rebuild(db)
+    assert other_worker.is_revoked(decode_token(other["refresh_token"])["jti"])
+
+
+def test_untracked_refresh_token_is_accepted_once() -> None:
+    with TestClient(app) as client:
+        _login(client, "legacy-refresh@example.com")
+        with SessionLocal() as db:
+            user_id = db.query(User).filter(User.email == "legacy-refresh@example.com").one().id
+        legacy = create_refresh_token(subject=user_id)
+
+        assert _refresh(client, legacy).status_code == 200
+        assert _refresh(client, legacy).status_code == 401
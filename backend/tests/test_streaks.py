@@ -0,0 +1,115 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.streak_service import advance_streak, effective_current
+
+
+def _auth_headers(client: TestClient, email: str) -> dict[str, str]:
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert register.status_code == 201
+
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": "StrongPass123"},
+    )
+    assert login.status_code == 200
+    token = login.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_advance_streak_counts_consecutive_days() -> None:
+    state = (0, 0, None)
+    for day in (date(2026, 3, 1), date(2026, 3, 2), date(2026, 3, 2), date(2026, 3, 3)):
+        state = advance_streak(*state, day)
+    assert state == (3, 3, date(2026, 3, 3))
+
+    state = advance_streak(*state, date(2026, 3, 6))
+    assert state == (1, 3, date(2026, 3, 6))
+
+    assert effective_current(1, date(2026, 3, 6), today=date(2026, 3, 7)) == 1
+    assert effective_current(1, date(2026, 3, 6), today=date(2026, 3, 8)) == 0
+
+
+def test_streaks_exposed_in_progression_and_profile() -> None:
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "streak-user@example.com")
+        habit_ids = []
+        for habit_type in ("CHAKRA", "FOCUS"):
+            create = client.post(
+                "/api/v1/habits",
+                headers=headers,
+                json={"title": "Streak", "description": "Keep going", "type": habit_type, "schedule": "DAILY"},
+            )
+            habit_ids.append(create.json()["id"])
+
+        first = client.patch(f"/api/v1/habits/{habit_ids[0]}/completion", headers=headers, json={"completed": True})
+        assert first.status_code == 200
+        batch = client.post(
+            "/api/v1/habits/completions:batch",
+            headers=headers,
+            json={"items": [{"habit_id": habit_ids[1], "completed": True}]},
+        )
+        assert batch.json()["results"][0]["status"] == "applied"
+
+        progression = client.get("/api/v1/progression/me", headers=headers).json()
+        assert progression["streak"] == {"current_streak": 1, "best_streak": 1}
+        assert {item["habit_id"] for item in progression["habit_streaks"]} == set(habit_ids)
+
+        profile = client.get("/api/v1/profile/me", headers=headers).json()
+        assert profile["current_streak"] == 1
+        assert profile["best_streak"] == 1
+
+
+def test_concurrent_first_completions_do_not_collide() -> None:
+    import threading
+
+    from app.db.session import SessionLocal
+    from app.models.entities import Habit, HabitStreak, User, UserStreak
+    from app.services.streak_service import StreakService
+
+    with TestClient(app) as client:
+        headers = _auth_headers(client, "streak-race@example.com")
+        create = client.post(
+            "/api/v1/habits",
+            headers=headers,
+            json={"title": "Race", "description": "Two devices", "type": "FOCUS", "schedule": "DAILY"},
+        )
+        habit_id = create.json()["id"]
+
+    start = threading.Barrier(4)
+    errors: list[Exception] = []
+
+    def worker(offset: int) -> None:
+        session = SessionLocal()
+        try:
+            user = session.query(User).filter(User.email == "streak-race@example.com").one()
+            habit = session.get(Habit, habit_id)
+            start.wait()
+            StreakService().record_completions(session, user.id, [habit], date(2026, 5, 1 + offset % 2))
+            session.commit()
+        except Exception as exc:  # pragma: no cover - surfaced by the assertion below
+            errors.append(exc)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    db = SessionLocal()
+    try:
+        habit_streak = db.get(HabitStreak, habit_id)
+        user_streak = db.get(UserStreak, habit_streak.user_id)
+        # Each worker advanced from the state the previous one committed.
+        assert habit_streak.last_completed_day == user_streak.last_completed_day == date(2026, 5, 2)
+        assert habit_streak.best_streak >= 1
+    finally:
+        db.close()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_root))
+
+from app.db.session import SessionLocal
+from app.models.entities import User
+from app.services.audit_service import AuditService
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Grant, revoke or list the admin role (users.is_admin).")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--grant", metavar="EMAIL")
+    action.add_argument("--revoke", metavar="EMAIL")
+    action.add_argument("--list", action="store_true")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.list:
+            for user_id, email in db.query(User.id, User.email).filter(User.is_admin.is_(True)).order_by(User.email):
+                print(f"{user_id} {email}")
+            return 0
+
+        email = (args.grant or args.revoke).lower().strip()
+        user = db.query(User).filter(User.email == email).first()
+        if user is None:
+            print(f"No user with email {email}", file=sys.stderr)
+            return 1
+        user.is_admin = args.grant is not None
+        # Written with the change itself; the running app notices through users.updated_at.
+        AuditService().log_event(
+            db,
+            user_id=user.id,
+            event_type="admin_granted" if user.is_admin else "admin_revoked",
+            entity_type="user",
+            entity_id=user.id,
+            details={"email": user.email},
+            durable=True,
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    print(f"{'Granted' if args.grant else 'Revoked'} admin for {email}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_root))
+
+from sqlalchemy import create_engine
+
+from app.core.config import get_settings
+from app.services.audit_partition_service import AuditPartitionService
+
+
+def main() -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Rotate/create audit_logs partitions and archive expired ones.")
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--archive-dir", default=settings.audit_archive_dir)
+    parser.add_argument("--retention-months", type=int, default=settings.audit_retention_months)
+    parser.add_argument("--now", default=None, help="ISO timestamp to run as (for backfills and drills).")
+    parser.add_argument("--list", action="store_true", help="Only print the existing partitions.")
+    args = parser.parse_args()
+
+    service = AuditPartitionService(
+        engine=create_engine(args.database_url),
+        archive_dir=args.archive_dir,
+        retention_months=args.retention_months,
+    )
+    if args.list:
+        for name, month in service.list_partitions():
+            print(f"{name} {month:%Y-%m}")
+        return 0
+
+    now = datetime.fromisoformat(args.now) if args.now else datetime.now(UTC)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=UTC)
+    run = service.run_maintenance(now=now)
+    print(
+        f"Audit partition maintenance complete: created={run.created} rotated={run.rotated} "
+        f"archived={run.archived} rows_archived={run.rows_archived} elapsed_s={run.elapsed_seconds:.2f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.services.audit_query_service import AuditQueryFilter, AuditQueryService
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Query audit_logs newest-first; prints NDJSON to stdout.")
+    parser.add_argument("--database-url", default=get_settings().database_url)
+    parser.add_argument("--user-id")
+    parser.add_argument("--event-type")
+    parser.add_argument("--entity-type")
+    parser.add_argument("--entity-id")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Inclusive ISO timestamp.")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Exclusive ISO timestamp.")
+    parser.add_argument("--limit", type=int, default=100, help="Page size; ignored with --all.")
+    parser.add_argument("--cursor", help="next_cursor printed by a previous page.")
+    parser.add_argument("--all", action="store_true", help="Stream every matching row with constant memory.")
+    args = parser.parse_args()
+
+    filters = AuditQueryFilter(
+        user_id=args.user_id,
+        event_type=args.event_type,
+        entity_type=args.entity_type,
+        entity_id=args.entity_id,
+        since=args.since,
+        until=args.until,
+    )
+    service = AuditQueryService()
+    engine = create_engine(args.database_url)
+    out = sys.stdout
+
+    with Session(engine) as db:
+        if args.all:
+            for item in service.iter_rows(db, filters):
+                out.write(item.model_dump_json() + "\n")
+            return 0
+
+        items, next_cursor = service.page(db=db, filters=filters, cursor=args.cursor, limit=args.limit)
+        for item in items:
+            out.write(item.model_dump_json() + "\n")
+    if next_cursor:
+        print(f"next_cursor={next_cursor}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
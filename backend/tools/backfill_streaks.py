@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_root))
+
+from sqlalchemy import create_engine, delete, insert, select
+
+from app.core.config import get_settings
+from app.models.entities import Completion, HabitStreak, UserStreak
+from app.services.streak_service import advance_streak
+
+
+def _as_day(value: datetime | str) -> date:
+    # SQLite may hand back the raw stored string when selecting a bare column.
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.date()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Recompute habit_streaks and user_streaks from completions.")
+    parser.add_argument("--database-url", default=get_settings().database_url)
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per bulk insert.")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    started = time.perf_counter()
+    rows_read = 0
+    habit_rows: list[dict] = []
+    user_rows: list[dict] = []
+
+    with engine.begin() as conn:
+        conn.execute(delete(HabitStreak))
+        conn.execute(delete(UserStreak))
+
+        def flush(final: bool = False) -> None:
+            if habit_rows and (final or len(habit_rows) >= args.batch_size):
+                conn.execute(insert(HabitStreak), habit_rows)
+                habit_rows.clear()
+            if user_rows and (final or len(user_rows) >= args.batch_size):
+                conn.execute(insert(UserStreak), user_rows)
+                user_rows.clear()
+
+        # One ordered pass over ix_completion_user_time; only the current user's state is held in memory.
+        stmt = (
+            select(Completion.user_id, Completion.habit_id, Completion.created_at)
+            .where(Completion.completed.is_(True))
+            .order_by(Completion.user_id, Completion.created_at)
+            .execution_options(stream_results=True, yield_per=args.batch_size)
+        )
+        read_conn = engine.connect()
+        try:
+            current_user: str | None = None
+            user_state: tuple[int, int, date | None] = (0, 0, None)
+            habit_state: dict[str, tuple[int, int, date | None]] = {}
+
+            def emit_user() -> None:
+                if current_user is None:
+                    return
+                for habit_id, (current, best, last_day) in habit_state.items():
+                    habit_rows.append(
+                        {
+                            "habit_id": habit_id,
+                            "user_id": current_user,
+                            "current_streak": current,
+                            "best_streak": best,
+                            "last_completed_day": last_day,
+                        }
+                    )
+                current, best, last_day = user_state
+                user_rows.append(
+                    {"user_id": current_user, "current_streak": current, "best_streak": best, "last_completed_day": last_day}
+                )
+                flush()
+
+            for user_id, habit_id, created_at in read_conn.execute(stmt):
+                rows_read += 1
+                if user_id != current_user:
+                    emit_user()
+                    current_user = user_id
+                    user_state = (0, 0, None)
+                    habit_state = {}
+                day = _as_day(created_at)
+                user_state = advance_streak(*user_state, day)
+                habit_state[habit_id] = advance_streak(*habit_state.get(habit_id, (0, 0, None)), day)
+            emit_user()
+            flush(final=True)
+        finally:
+            read_conn.close()
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(f"Streak backfill complete: completion_rows={rows_read} elapsed_s={elapsed:.2f} rows_per_sec={rows_read / elapsed:,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_root))
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db import models  # noqa: F401
+from app.models.entities import Completion, Habit, HabitSchedule, HabitType, User
+from app.services.completion_policy_service import CompletionPolicyService
+
+
+def _legacy_check(db: Session, habit: Habit, user_id: str, now: datetime) -> None:
+    """The pre-denormalization daily check: a range scan over the habit's completions."""
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    db.query(Completion).filter(
+        Completion.user_id == user_id,
+        Completion.habit_id == habit.id,
+        Completion.completed.is_(True),
+        Completion.created_at >= day_start,
+    ).first()
+
+
+def _current_check(db: Session, habit_id: str, now: datetime) -> None:
+    habit = db.get(Habit, habit_id, populate_existing=True)
+    try:
+        CompletionPolicyService().ensure_can_mark_completed(habit=habit, now=now)
+    except HTTPException:
+        pass
+
+
+def _time_us(fn, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Completion policy check latency vs completion history size.")
+    parser.add_argument("--sizes", default="100,10000,200000")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp, 'bench.db').as_posix()}")
+        Base.metadata.create_all(bind=engine)
+        now = datetime.now(UTC)
+
+        print(f"{'history_rows':>12} {'legacy_us':>10} {'denormalized_us':>16}")
+        for size in (int(value) for value in args.sizes.split(",")):
+            with Session(engine) as db:
+                user = User(email=f"bench-{size}@example.com", hashed_password="x")
+                db.add(user)
+                db.flush()
+                habit = Habit(
+                    user_id=user.id,
+                    title="Bench",
+                    description="Bench",
+                    type=HabitType.focus,
+                    schedule=HabitSchedule.daily,
+                    completed=False,
+                    ever_completed=True,
+                    last_completed_at=now - timedelta(days=1),
+                )
+                db.add(habit)
+                db.flush()
+                # History spread backwards from yesterday, so every row is older than today.
+                rows = [
+                    {
+                        "habit_id": habit.id,
+                        "user_id": user.id,
+                        "completed": True,
+                        "created_at": now - timedelta(days=1, minutes=index),
+                    }
+                    for index in range(size)
+                ]
+                db.execute(insert(Completion), rows)
+                db.commit()
+
+                legacy = _time_us(lambda: _legacy_check(db, habit, user.id, now), args.iterations)
+                current = _time_us(lambda: _current_check(db, habit.id, now), args.iterations)
+            print(f"{size:>12} {legacy:>10.1f} {current:>16.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+# Keep the limiter from rejecting the benchmark's own traffic.
+os.environ.setdefault("RATE_LIMIT_REQUESTS", "100000000")
+
+backend_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_root))
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.rate_limit import RateLimitMiddleware, get_policy_rate_limiter
+from app.core.security_headers import SecurityHeadersMiddleware
+from app.main import app
+
+
+class _LegacySecurityHeaders(BaseHTTPMiddleware):
+    """The previous implementation, for comparison."""
+
+    async def dispatch(self, request: Request, call_next: Callable):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["Referrer-Policy"] = "no-referrer"
+        response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
+        response.headers["Cross-Origin-Resource-Policy"] = "cross-origin"
+        return response
+
+
+class _LegacyRateLimit(BaseHTTPMiddleware):
+    """The previous wrapper around the same policy limiter, for comparison."""
+
+    async def dispatch(self, request: Request, call_next: Callable):
+        client_host = request.client.host if request.client else "unknown"
+        _, retry_after = get_policy_rate_limiter().check(
+            request.method, request.url.path, client_host, authorization=request.headers.get("authorization")
+        )
+        if retry_after is not None:
+            return JSONResponse(status_code=429, content={"code": "rate_limited", "message": "Too many requests"})
+        return await call_next(request)
+
+
+_REPLACEMENTS = {SecurityHeadersMiddleware: _LegacySecurityHeaders, RateLimitMiddleware: _LegacyRateLimit}
+
+
+def _stack(variant: str):
+    """`app.main`'s middleware stack with the two middlewares as they were, as they are, or removed."""
+    original = list(app.user_middleware)
+    try:
+        if variant == "legacy":
+            app.user_middleware = [
+                Middleware(_REPLACEMENTS.get(item.cls, item.cls), *item.args, **item.kwargs) for item in original
+            ]
+        elif variant == "none":
+            app.user_middleware = [item for item in original if item.cls not in _REPLACEMENTS]
+        return app.build_middleware_stack()
+    finally:
+        app.user_middleware = original
+
+
+async def _request(stack, path: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"accept", b"application/json")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+        "app": app,
+    }
+    status_code = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await stack(scope, receive, send)
+    return status_code
+
+
+async def _measure(stack, path: str, requests: int, rounds: int) -> float:
+    """Median microseconds per request over `rounds` runs of `requests` sequential requests."""
+    for _ in range(min(requests, 200)):
+        await _request(stack, path)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(requests):
+            await _request(stack, path)
+        samples.append((time.perf_counter() - started) / requests * 1_000_000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-request cost of the app.main middleware stack.")
+    parser.add_argument("--path", default="/api/v1/health")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    async def run() -> dict[str, float]:
+        return {
+            variant: await _measure(_stack(variant), args.path, args.requests, args.rounds)
+            for variant in ("none", "legacy", "asgi")
+        }
+
+    results = asyncio.run(run())
+    baseline = results["none"]
+    print(f"{'stack':>8} {'us/request':>11} {'overhead_us':>12}")
+    for variant, micros in results.items():
+        print(f"{variant:>8} {micros:>11.1f} {micros - baseline:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_root))
+
+from app.core.rate_limit import SlidingWindowLimiter
+from app.core.rate_limit_backends import MemoryBackend, RedisBackend, SharedMemoryBackend
+
+
+class _LegacyLimiter:
+    """The previous engine: one deque of timestamps per address, never evicted."""
+
+    def __init__(self, limit: int, window_seconds: float) -> None:
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._bucket: dict[str, deque[float]] = defaultdict(deque)
+
+    def hit(self, key: str, now: float) -> int | None:
+        bucket = self._bucket[key]
+        while bucket and now - bucket[0] > self.window_seconds:
+            bucket.popleft()
+        if len(bucket) >= self.limit:
+            return 1
+        bucket.append(now)
+        return None
+
+
+def _address(index: int) -> str:
+    return f"10.{(index >> 16) & 0xFF}.{(index >> 8) & 0xFF}.{index & 0xFF}:{index >> 24}"
+
+
+def _run(name: str, limiter, clients: int, checkpoints: int, requests_per_second: float) -> None:
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    step = max(clients // checkpoints, 1)
+    for index in range(clients):
+        limiter.hit(_address(index), now=index / requests_per_second)
+        if (index + 1) % step == 0:
+            used = (tracemalloc.get_traced_memory()[0] - baseline) / 2**20
+            if isinstance(limiter, _LegacyLimiter):
+                tracked = len(limiter._bucket)
+            else:
+                tracked = limiter.snapshot().get("tracked_keys", "-")
+            print(f"{name:>8} {index + 1:>10} {tracked:>10} {used:>10.1f}")
+    tracemalloc.stop()
+
+    # Latency untraced: the most recent addresses, which are still tracked.
+    latency_requests = min(clients, 100_000)
+    started = time.perf_counter()
+    for index in range(clients - latency_requests, clients):
+        limiter.hit(_address(index), now=clients / requests_per_second)
+    elapsed = time.perf_counter() - started
+    print(f"{name:>8} {elapsed / latency_requests * 1_000_000:>10.2f} us/request\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rate limiter memory as distinct client addresses grow.")
+    parser.add_argument("--clients", type=int, default=1_000_000, help="Distinct addresses, one request each.")
+    parser.add_argument("--max-keys", type=int, default=100_000)
+    parser.add_argument("--window-seconds", type=float, default=60.0)
+    parser.add_argument("--requests-per-second", type=float, default=5000.0, help="Simulated arrival rate.")
+    parser.add_argument("--checkpoints", type=int, default=10)
+    parser.add_argument("--backend", choices=["memory", "shared", "redis"], default="memory")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--legacy", action="store_true", help="Also run the unbounded per-address deque engine.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.backend == "shared":
+            # The counter table lives in the mmap-ed file, outside the Python heap.
+            backend = SharedMemoryBackend(str(Path(tmp, "rate-limit.bin")), max_keys=args.max_keys)
+        elif args.backend == "redis":
+            backend = RedisBackend(args.redis_url, window_seconds=args.window_seconds)
+        else:
+            backend = MemoryBackend(max_keys=args.max_keys)
+        print(f"{'engine':>8} {'clients':>10} {'tracked':>10} {'memory_mb':>10}")
+        _run(
+            args.backend,
+            SlidingWindowLimiter(limit=120, window_seconds=args.window_seconds, backend=backend),
+            args.clients,
+            args.checkpoints,
+            args.requests_per_second,
+        )
+        backend.close()
+    if args.legacy:
+        _run(
+            "legacy",
+            _LegacyLimiter(limit=120, window_seconds=args.window_seconds),
+            args.clients,
+            args.checkpoints,
+            args.requests_per_second,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
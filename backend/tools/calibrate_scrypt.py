@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import argparse
+import secrets
+import statistics
+import sys
+import time
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_root))
+
+from app.core.security import _scrypt, scrypt_memory_bytes
+
+
+def _median_ms(n: int, r: int, p: int, samples: int) -> float:
+    password = secrets.token_bytes(16)
+    salt = secrets.token_bytes(16)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        _scrypt(password, salt, n, r, p, 32)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Pick scrypt parameters that fit a target per-hash latency and memory budget on this machine."
+    )
+    parser.add_argument("--target-ms", type=float, default=100.0, help="Upper bound for one hash (median).")
+    parser.add_argument("--max-memory-mb", type=float, default=64.0, help="Upper bound for one hash's working set.")
+    parser.add_argument("--r", type=int, default=8, help="Block size; 8 is the standard choice.")
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    budget = int(args.max_memory_mb * 1024 * 1024)
+    best: tuple[int, int, float] | None = None
+
+    print(f"{'n':>9} {'p':>3} {'memory_mb':>10} {'median_ms':>10}")
+    n = 2**10
+    while scrypt_memory_bytes(n, args.r, 1) <= budget:
+        elapsed = _median_ms(n, args.r, 1, args.samples)
+        print(f"{n:>9} {1:>3} {scrypt_memory_bytes(n, args.r, 1) / 2**20:>10.1f} {elapsed:>10.1f}")
+        if elapsed > args.target_ms:
+            break
+        best = (n, 1, elapsed)
+        n *= 2
+
+    if best is None:
+        print("No parameters fit the target; raise --target-ms or --max-memory-mb.")
+        return 1
+
+    # Memory-bound before latency-bound: spend the remaining time on parallelism,
+    # which adds CPU cost without growing the working set.
+    n, p, elapsed = best
+    if scrypt_memory_bytes(n * 2, args.r, 1) > budget:
+        while True:
+            candidate = _median_ms(n, args.r, p + 1, args.samples)
+            print(f"{n:>9} {p + 1:>3} {scrypt_memory_bytes(n, args.r, p + 1) / 2**20:>10.1f} {candidate:>10.1f}")
+            if candidate > args.target_ms:
+                break
+            p, elapsed = p + 1, candidate
+
+    print(f"\nSelected n={n} r={args.r} p={p} (~{elapsed:.1f} ms per hash). Add to the environment:")
+    print(f"PASSWORD_SCRYPT_N={n}")
+    print(f"PASSWORD_SCRYPT_R={args.r}")
+    print(f"PASSWORD_SCRYPT_P={p}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
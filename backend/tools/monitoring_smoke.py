@@ -21,6 +21,7 @@ if smoke_db.exists():
 os.environ.setdefault("DATABASE_URL", f"sqlite:///{smoke_db.as_posix()}")
 
 from fastapi.testclient import TestClient
+from sqlalchemy import select
 
 from app.db.base import Base
 from app.db.session import SessionLocal
@@ -42,13 +43,13 @@ def main() -> int:
             print("Expected 401 for bad login")
             return 1
 
-        # Trigger rate-limit block event.
+        # Trigger rate-limit block event (health is exempt; quests use the global limit).
         for _ in range(5):
-            client.get("/api/v1/health")
+            client.get("/api/v1/quests")
 
     db = SessionLocal()
     try:
-        event_types = {row.event_type for row in db.query(AuditLog).all()}
+        event_types = set(db.execute(select(AuditLog.event_type).distinct()).scalars())
     finally:
         db.close()
 
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_root))
+
+from app.db.session import SessionLocal
+from app.services.completion_rollup_service import CompletionRollupService
+
+
+def main() -> int:
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        rows = CompletionRollupService.rebuild(db)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Completion rollups rebuilt: rollup_rows={rows} elapsed_s={time.perf_counter() - started:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
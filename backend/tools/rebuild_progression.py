@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_root))
+
+from sqlalchemy import Engine, create_engine, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.entities import AvatarState, Completion, Stats, User
+from app.services.progression_service import ProgressionService
+
+_engine: Engine | None = None
+
+
+def _init_worker(database_url: str) -> None:
+    global _engine
+    _engine = create_engine(database_url)
+
+
+def _iter_user_chunks(engine: Engine, after: str | None, chunk_size: int):
+    """Keyset-walk user ids so each chunk is an index range scan, never an OFFSET."""
+    while True:
+        with engine.connect() as conn:
+            stmt = select(User.id).order_by(User.id).limit(chunk_size)
+            if after is not None:
+                stmt = stmt.where(User.id > after)
+            user_ids = list(conn.execute(stmt).scalars())
+        if not user_ids:
+            return
+        yield user_ids
+        after = user_ids[-1]
+
+
+def _rebuild_chunk(user_ids: list[str]) -> tuple[str, int, int]:
+    assert _engine is not None
+    service = ProgressionService()
+    now = datetime.now(UTC)
+
+    with Session(_engine) as db, db.begin():
+        counts = service.net_completion_counts(db, user_ids)
+        completion_rows = db.execute(
+            select(func.count(Completion.id)).where(Completion.user_id.in_(user_ids))
+        ).scalar_one()
+
+        existing_stats = set(db.execute(select(Stats.user_id).where(Stats.user_id.in_(user_ids))).scalars())
+        existing_avatars = set(
+            db.execute(select(AvatarState.user_id).where(AvatarState.user_id.in_(user_ids))).scalars()
+        )
+
+        stats_updates, stats_inserts, avatar_updates, avatar_inserts = [], [], [], []
+        for user_id in user_ids:
+            xp_values, aura_level, aura_label = service.progression_values(counts.get(user_id, {}))
+            stats_row = {"user_id": user_id, **xp_values, "updated_at": now}
+            avatar_row = {"user_id": user_id, "aura_level": aura_level, "aura_label": aura_label, "updated_at": now}
+            (stats_updates if user_id in existing_stats else stats_inserts).append(stats_row)
+            if user_id in existing_avatars:
+                avatar_updates.append(avatar_row)
+            else:
+                avatar_inserts.append({**avatar_row, "avatar_type": "neutral"})
+
+        # Bulk UPDATE by primary key and multi-row INSERT: one executemany per statement.
+        if stats_updates:
+            db.execute(update(Stats), stats_updates)
+        if stats_inserts:
+            db.execute(insert(Stats), stats_inserts)
+        if avatar_updates:
+            db.execute(update(AvatarState), avatar_updates)
+        if avatar_inserts:
+            db.execute(insert(AvatarState), avatar_inserts)
+
+    return user_ids[-1], len(user_ids), int(completion_rows)
+
+
+def _load_checkpoint(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_checkpoint(path: Path, state: dict) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(state, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rebuild stats and avatar_states for every user from completions.")
+    parser.add_argument("--database-url", default=get_settings().database_url)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=0, help="Process pool size; 0 runs chunks inline.")
+    parser.add_argument("--checkpoint", type=Path, default=None, help="File recording the last rebuilt user id.")
+    parser.add_argument("--resume", action="store_true", help="Continue after the user id stored in --checkpoint.")
+    args = parser.parse_args()
+
+    if args.resume and args.checkpoint is None:
+        print("--resume requires --checkpoint")
+        return 1
+
+    state = _load_checkpoint(args.checkpoint) if args.resume else {}
+    after = state.get("last_user_id")
+    total_users = int(state.get("users", 0))
+    total_rows = int(state.get("completion_rows", 0))
+    if after is not None:
+        print(f"Resuming after user_id={after} ({total_users} users already rebuilt)")
+
+    _init_worker(args.database_url)
+    assert _engine is not None
+    chunks = _iter_user_chunks(_engine, after, args.chunk_size)
+    started = time.perf_counter()
+    run_users = 0
+    run_rows = 0
+
+    def record(result: tuple[str, int, int]) -> None:
+        nonlocal total_users, total_rows, run_users, run_rows
+        last_user_id, users, rows = result
+        run_users += users
+        run_rows += rows
+        total_users += users
+        total_rows += rows
+        if args.checkpoint is not None:
+            _write_checkpoint(
+                args.checkpoint,
+                {"last_user_id": last_user_id, "users": total_users, "completion_rows": total_rows},
+            )
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        print(f"users={total_users} completion_rows={total_rows} rows_per_sec={run_rows / elapsed:,.0f}")
+
+    if args.workers > 0:
+        # Results are consumed in submission order so the checkpoint only ever advances
+        # past chunks that have fully committed; in-flight work is bounded to 2x workers.
+        with ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=_init_worker,
+            initargs=(args.database_url,),
+        ) as pool:
+            pending: deque[Future] = deque()
+            for user_ids in chunks:
+                pending.append(pool.submit(_rebuild_chunk, user_ids))
+                if len(pending) >= args.workers * 2:
+                    record(pending.popleft().result())
+            while pending:
+                record(pending.popleft().result())
+    else:
+        for user_ids in chunks:
+            record(_rebuild_chunk(user_ids))
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(
+        f"Progression rebuild complete: users={run_users} completion_rows={run_rows} "
+        f"elapsed_s={elapsed:.2f} rows_per_sec={run_rows / elapsed:,.0f} users_per_sec={run_users / elapsed:,.0f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_root))
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.services.habit_reset_service import HabitResetService
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Reset completed flags for DAILY/RECURRING habits whose window has passed.")
+    parser.add_argument("--batch-size", type=int, default=get_settings().habit_reset_batch_size)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        run = HabitResetService().reset_due_habits(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(
+        f"Habit reset complete: daily_reset={run.daily_reset} recurring_reset={run.recurring_reset} "
+        f"batches={run.batches} elapsed_s={run.elapsed_seconds:.3f} rows_per_sec={run.rows_per_second:,.0f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())